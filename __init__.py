@@ -2,6 +2,3 @@ import logging
 
 __appname__ = "FrameExtractor"
 __version__ = "0.1.1"
-
-from FrameExtractor import utils
-
@@ -1,13 +1,27 @@
-import os, argparse, sys, io, contextlib
+import os, sys, time
+
+# Startup probe (see `bench startup`): wall clock time the process was spawned at
+_PROBE = os.environ.get("FRAME_EXTRACTOR_STARTUP_PROBE")
+_marks = [("interpreter", time.time())]
+
+def _mark(phase):
+    if _PROBE:
+        _marks.append((phase, time.time()))
+
+import argparse, io, contextlib
 from loguru import logger
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from PyQt6.QtWidgets import QApplication
 from FrameExtractor import __appname__
 from FrameExtractor import __version__
-from FrameExtractor.app import MainWindow
-from FrameExtractor.utils import newIcon
+from FrameExtractor import cli
+from FrameExtractor import bench
+_mark("imports")
+
+LOG_FILE = "frame_extractor.log"
+# (records, handler id) of the in-memory sink used until the file sink exists
+_log_buffer = None
 
 class _LoggerIO(io.StringIO):
     def write(self, message: str) -> int:
@@ -31,7 +45,8 @@ class _LoggerIO(io.StringIO):
     def closed(self) -> bool:
         return False
 
-def _setup_loguru(logger_level: str) -> None:
+def _setup_loguru(logger_level: str, defer_file: bool = False) -> None:
+    global _log_buffer
     try:
         logger.remove(handler_id=0)
     except ValueError:
@@ -40,9 +55,27 @@ def _setup_loguru(logger_level: str) -> None:
     if sys.stderr:
         logger.add(sys.stderr, level=logger_level)
 
-    log_file = "frame_extractor.log"
+    if defer_file:
+        # The enqueued, rotating file sink starts a writer thread and queue:
+        # buffer records in memory until _add_file_sink() (after first paint)
+        records = []
+        _log_buffer = (records, logger.add(records.append, level="DEBUG", colorize=False))
+    else:
+        _add_file_sink()
+
+def _add_file_sink() -> None:
+    global _log_buffer
+    if _log_buffer is not None:
+        records, handler_id = _log_buffer
+        logger.remove(handler_id)
+        _log_buffer = None
+        try:
+            with open(LOG_FILE, "a", encoding="utf-8") as f:
+                f.writelines(records)
+        except OSError:
+            pass
     logger.add(
-        log_file,
+        LOG_FILE,
         colorize=False,
         level="DEBUG",
         rotation="10 MB",
@@ -53,6 +86,26 @@ def _setup_loguru(logger_level: str) -> None:
         diagnose=True,
     )
 
+def _on_first_paint(app, callback):
+    # Calls callback once, after the first paint event has been handled
+    from PyQt6.QtCore import QObject, QEvent, QTimer
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, ev):
+            if ev.type() == QEvent.Type.Paint:
+                app.removeEventFilter(self)
+                QTimer.singleShot(0, callback)
+            return False
+
+    app._first_paint_filter = FirstPaint()
+    app.installEventFilter(app._first_paint_filter)
+
+def _report_startup(app, modules):
+    # Startup probe: phase timestamps and modules loaded by first paint on stdout, then quit
+    import json
+    print(json.dumps(dict(spawn=float(_PROBE), marks=_marks, modules=modules)), flush=True)
+    app.quit()
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--version", "-V", action="store_true", help="show version")
@@ -62,24 +115,61 @@ def main():
         choices=["debug", "info", "warning", "fatal", "error"],
         help="logger level",
     )
+    parser.add_argument(
+        "--backend",
+        default="opencv",
+        choices=["opencv", "pyav"],
+        help="video decoder backend for playback/preview",
+    )
+    parser.add_argument("--decode-threads", type=int, default=0, help="decoder threads (0: decoder default)")
+    subparsers = parser.add_subparsers(dest="command")
+    cli.add_extract_parser(subparsers)
+    bench.add_bench_parser(subparsers)
+    bench.add_startup_parser(subparsers)
     args = parser.parse_args()
 
     if args.version:
         print(f"{__appname__} {__version__}")
         sys.exit(0)
         
-    _setup_loguru(logger_level=args.logger_level.upper())
+    # GUI: the log file sink is set up once the window has been painted
+    _setup_loguru(logger_level=args.logger_level.upper(), defer_file=not args.command)
     logger.info(f"Starting {__appname__} {__version__}")
+    _mark("logging")
+    
+    if args.command:
+        # Headless mode, no Qt
+        sys.exit(args.func(args))
+    
+    # Qt is only imported for the GUI
+    from PyQt6.QtWidgets import QApplication
+    _mark("qt_import")
     
     app = QApplication(sys.argv)
+    _mark("qt_app")
+    from FrameExtractor.app import MainWindow
+    from FrameExtractor.utils import newIcon
+    _mark("app_import")
     app.setApplicationName(__appname__)
     app.setWindowIcon(newIcon("icon"))
     
-    window = MainWindow()
+    window = MainWindow(decode_backend=args.backend, decode_threads=args.decode_threads)
+    _mark("window")
+    
+    def deferred_startup():
+        _mark("first_paint")
+        modules = sorted(sys.modules) if _PROBE else None
+        _add_file_sink()
+        window.preload_modules()
+        _mark("deferred")
+        if _PROBE:
+            _report_startup(app, modules)
     
+    _on_first_paint(app, deferred_startup)
     with contextlib.redirect_stderr(new_target=_LoggerIO()):
         window.show()
         window.raise_()
+        _mark("show")
         sys.exit(app.exec())
         
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ Created on Sun Sep 28 12:39:36 2025
 @author: singh
 """
 
-import os, cv2, functools
+import os, time, functools, importlib, threading
 # import gc, logging
 from loguru import logger
 # from PIL import Image
@@ -18,7 +18,20 @@ from PyQt6.QtGui import QImage, QPixmap, QAction
 from types import SimpleNamespace
 from FrameExtractor import __appname__
 from FrameExtractor import utils
-from FrameExtractor.widgets import VideoLoadDialog, FrameReaderThread, BatchExtractDialog, BatchExtractWorker
+# Light modules only: OpenCV/numpy and the batch tooling load on first use
+# (playback modules are preloaded in the background, see preload_modules)
+from FrameExtractor.widgets import VideoLoadDialog, BatchExtractDialog, BatchJobQueue, VideoIndexThread, ThumbnailIndexThread, StageStatsDialog
+from FrameExtractor.core import FrameCache, PlaybackClock, STAGE_STATS
+
+# Modules needed as soon as a video is loaded
+PRELOAD_MODULES = (
+    "FrameExtractor.core.video_source",
+    "FrameExtractor.core.buffer_pool",
+    "FrameExtractor.core.encoders",
+    "FrameExtractor.widgets.frame_reader",
+    "FrameExtractor.widgets.frame_prefetcher",
+    "FrameExtractor.widgets.frame_seeker",
+)
 
 # from pynvml import nvmlInit, nvmlDeviceGetCount, nvmlShutdown, NVMLError
 # def is_gpu_available():
@@ -38,7 +51,7 @@ from FrameExtractor.widgets import VideoLoadDialog, FrameReaderThread, BatchExtr
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, decode_backend=None, decode_threads=0):
         super().__init__()
         # self.setup_logging()
         self.setWindowTitle(__appname__)
@@ -56,12 +69,26 @@ class MainWindow(QMainWindow):
         self.video_path = None
         self.output_dir = os.getcwd()
         self.cap = None
+        self.decode_backend = decode_backend # see core.video_source.BACKENDS
+        self.decode_threads = decode_threads
         self.frame_rate = 30
         self.frame_count = 0
         self.current_frame = 0
         self.time_step = 1 / self.frame_rate
         self.thread = None
+        self.video_index = None
+        self.index_thread = None
+        self.job_queue = None
+        self.stage_stats_dialog = None
+        self.frame_cache = FrameCache()
+        self.prefetcher = None
+        self.seeker = None
+        self.seek_target = None # (frame_idx, update_state) awaited from the seeker
+        self.thumbnails = None
+        self.thumb_thread = None
+        self.prefetch_bytes = None # playback prefetch budget (None: PrefetchBuffer default)
         self.current_qimg = None
+        self.current_qimg_owner = None # buffer behind current_qimg (ndarray or PooledImage)
         self.video_paused = False
         self.seekbar_moving = False
         self.status_priority = False
@@ -74,9 +101,12 @@ class MainWindow(QMainWindow):
         self.setup_ui()
         QTimer.singleShot(0, self.lock_window_size)
         
-        # Timer to update frame from buffer for smooth playback
+        # Timer ticking the playback clock, frames are presented by timestamp
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update_from_buffer)
+        self.play_clock = None
+        self.underrun_frame = None
         
         # Timer to rolling back to default status message
         self.default_status_timer = QTimer()
@@ -87,6 +117,38 @@ class MainWindow(QMainWindow):
         self.raise_()
         self.setFocus()
 
+    @functools.cached_property
+    def frame_pool(self):
+        from FrameExtractor.core import FramePool
+        return FramePool()
+        
+    @functools.cached_property
+    def capture_pool(self):
+        # Capture handles shared by preview, playback, background decoders and batch jobs
+        from FrameExtractor.core import CapturePool
+        return CapturePool()
+        
+    @functools.cached_property
+    def gop_buffer(self):
+        # Decoded GOP spans for backward steps and reverse playback
+        from FrameExtractor.core import GopRingBuffer
+        return GopRingBuffer()
+        
+    @functools.cached_property
+    def frame_encoder(self):
+        # 'Save frame' format, same encoders as batch extraction
+        from FrameExtractor.core import make_encoder
+        return make_encoder()
+        
+    def preload_modules(self):
+        # Import the playback path off the GUI thread once the window is up
+        def preload():
+            t0 = time.perf_counter()
+            for name in PRELOAD_MODULES:
+                importlib.import_module(name)
+            logger.debug(f"Preloaded playback modules in {time.perf_counter() - t0:.3f}s")
+        threading.Thread(target=preload, name="ModulePreload", daemon=True).start()
+        
     def setup_ui(self):
         # Toolbar
         self.toolbar = utils.ToolBar("Toolbar")
@@ -156,6 +218,13 @@ class MainWindow(QMainWindow):
                 "next",
                 "Forward the video"
                 )
+        reverse_play = selfAction(
+                "Reverse\nPlay",
+                self.toggle_reverse_play,
+                "Shift+Space",
+                "prev",
+                "Play the video backwards"
+                )
         self.toggleToolbar = selfAction(
                 text="Toolbar",
                 func=self.toggle_toolbar,
@@ -163,6 +232,11 @@ class MainWindow(QMainWindow):
                 checkable=True,
                 checked=True
                 )
+        stage_stats = selfAction(
+                text="Stage Stats",
+                func=self.open_stage_stats,
+                tip="Per-stage decode/convert/encode/write/display timings"
+                )
         batch_extract = selfAction(
                 "Batch\nExtract",
                 self.open_batch_extract_dialog,
@@ -208,6 +282,7 @@ class MainWindow(QMainWindow):
             self.menus.edit,
             (
                 self.play_pause,
+                reverse_play,
                 None,
                 rewind,
                 forward,
@@ -221,6 +296,7 @@ class MainWindow(QMainWindow):
             self.menus.view,
             (
                 self.toggleToolbar,
+                stage_stats,
             )
         )
         
@@ -296,19 +372,28 @@ class MainWindow(QMainWindow):
         
     def reset_state(self):
         # Stop thread if running
-        if self.thread and self.thread.isRunning():
+        if self.thread:
             self.thread.stop()
             self.thread = None
+        self.stop_index_thread()
+        self.stop_prefetcher()
+        self.stop_seeker()
+        self.frame_cache.clear()
+        self.gop_buffer.clear()
+        self.thumbnails = None
         if self.cap:
-            self.cap.release()
+            self.capture_pool.release(self.cap)
             self.cap = None
+        self.capture_pool.close()
         # Reset state
         self.setWindowTitle(__appname__)
         self.video_path = None
+        self.video_index = None
         self.current_frame = 0
         self.frame_count = 0
         self.frame_rate = 30
-        self.current_qimg = None
+        self.set_current_image(None)
+        self.frame_pool.clear()
         self.seekbar.setMinimum(0)
         self.seekbar.setMaximum(0)
         self.seekbar.setValue(0)
@@ -341,37 +426,117 @@ class MainWindow(QMainWindow):
             self.video_paused = False
 
     def load_video(self):
-        if self.thread and self.thread.isRunning():
+        if self.thread:
             self.thread.stop()
             self.thread = None
             self.set_play_pause_state("play")
+        self.stop_index_thread()
+        self.stop_prefetcher()
+        self.stop_seeker()
+        self.frame_cache.clear()
+        self.gop_buffer.clear()
+        self.video_index = None
+        self.thumbnails = None
             
         if self.cap:
-            self.cap.release()
+            self.capture_pool.release(self.cap)
             self.cap = None
 
         file_path, _ = VideoLoadDialog.getOpenFileName(self)
         if file_path:
+            from FrameExtractor.widgets import FramePrefetchThread, FrameSeekThread
+            if self.video_path and self.video_path != file_path:
+                self.capture_pool.close(self.video_path)
             self.video_path = file_path
             self.status_priority = True
-            self.cap = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG)
+            # Preview handle, owned by the GUI thread; background threads lease their own
+            self.cap = self.capture_pool.acquire(self.video_path, self.decode_backend, self.decode_threads)
             if not self.cap.isOpened():
                 logger.error(f"Failed to open video: {os.path.basename(self.video_path)}")
                 self.status.showMessage("Failed to open video")
                 self.default_status_timer.start(3000) # after 3 seconds reset to default message
                 return
-            self.frame_rate = self.cap.get(cv2.CAP_PROP_FPS)
-            self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.frame_rate = self.cap.fps
+            self.frame_count = self.cap.frame_count
             self.current_frame = 0
             self.seekbar.setMaximum(self.frame_count - 1)
+            # Background decoder filling the frame cache around paused positions
+            self.prefetcher = FramePrefetchThread(
+                self.video_path, self.frame_cache,
+                backend=self.decode_backend, threads=self.decode_threads, cap_pool=self.capture_pool
+            )
+            self.prefetcher.start()
+            # Seekbar/step targets are decoded off the GUI thread, latest request wins
+            self.seeker = FrameSeekThread(
+                self.video_path, self.frame_cache,
+                backend=self.decode_backend, threads=self.decode_threads, gop_buffer=self.gop_buffer,
+                cap_pool=self.capture_pool
+            )
+            self.seeker.frame_ready.connect(self.on_frame_seeked)
+            self.seeker.start()
             self.show_frame(self.current_frame)
             self.setWindowTitle(f"{__appname__} - {os.path.basename(self.video_path)}")
             self.set_play_pause_state("play")
             self.on_combobox_changed(self.time_cb.currentText())
+            # Build (or load cached) keyframe/PTS index in background
+            self.index_thread = VideoIndexThread(self.video_path)
+            self.index_thread.index_ready.connect(self.on_index_ready)
+            self.index_thread.start()
             logger.info(f"Video loaded: {os.path.basename(self.video_path)}, FPS: {self.frame_rate:.2f}")
             self.status.showMessage(f"Video: {os.path.basename(self.video_path)} | FPS: {self.frame_rate:.2f}")
             self.default_status_timer.start(3000) # after 3 seconds reset to default message
             
+    def on_index_ready(self, index):
+        self.video_index = index
+        if self.prefetcher:
+            self.prefetcher.index = index
+        if self.seeker:
+            self.seeker.index = index
+        if index.frame_count and index.frame_count != self.frame_count:
+            logger.debug(f"Frame count corrected by index: {self.frame_count} -> {index.frame_count}")
+            self.frame_count = index.frame_count
+            self.seekbar.setMaximum(self.frame_count - 1)
+        logger.info(f"Video indexed: {index.frame_count} frames, {len(index.keyframes)} keyframes")
+        # Seekbar preview thumbnails, built with the index's GOP/frame count
+        self.thumb_thread = ThumbnailIndexThread(self.video_path, index, self.decode_backend)
+        self.thumb_thread.thumbnails_ready.connect(self.on_thumbnails_ready)
+        self.thumb_thread.start()
+        
+    def on_thumbnails_ready(self, thumbnails):
+        self.thumbnails = thumbnails
+        logger.debug(f"Seekbar thumbnails ready: {len(thumbnails.thumbs)} every {thumbnails.interval} frames")
+        
+    def stop_prefetcher(self):
+        if self.prefetcher and self.prefetcher.isRunning():
+            self.prefetcher.stop()
+        self.prefetcher = None
+        
+    def stop_seeker(self):
+        self.cancel_seek()
+        if self.seeker and self.seeker.isRunning():
+            self.seeker.stop()
+        self.seeker = None
+        
+    def cancel_seek(self):
+        # Drop the pending seek, a late result is then ignored
+        self.seek_target = None
+        if self.seeker:
+            self.seeker.cancel()
+        
+    def prefetch_neighbors(self, frame_idx):
+        # Prefetch frames one Forward/Rewind step apart while paused
+        if self.prefetcher and not (self.thread and self.thread.isRunning()):
+            step = max(1, int(self.time_step * self.frame_rate))
+            self.prefetcher.prefetch(frame_idx, step, self.frame_count)
+        
+    def stop_index_thread(self):
+        if self.index_thread and self.index_thread.isRunning():
+            self.index_thread.stop()
+        self.index_thread = None
+        if self.thumb_thread and self.thumb_thread.isRunning():
+            self.thumb_thread.stop()
+        self.thumb_thread = None
+            
     def change_output_dir(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Output Directory")
         if directory:
@@ -385,31 +550,58 @@ class MainWindow(QMainWindow):
         else:
             self.time_step = float(val.split(' ')[0])
 
-    def replay_thread(self, start=0):
+    def replay_thread(self, start=0, reverse=False):
         if not self.cap or not self.cap.isOpened():
             return
         
-        if self.thread is not None and self.thread.isRunning():
+        if self.thread is not None:
             self.thread.stop()
             self.thread = None
         
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
-        self.thread = FrameReaderThread(self.cap, start)
-        self.thread.frame_ready.connect(self.handle_frame)
+        if self.prefetcher:
+            self.prefetcher.cancel()
+        self.cancel_seek()
+        # Playback leases its own handle, preview seeks don't touch its position
+        cap = self.capture_pool.acquire(self.video_path, self.decode_backend, self.decode_threads)
+        if reverse:
+            from FrameExtractor.widgets import ReverseReaderThread
+            self.thread = ReverseReaderThread(
+                cap, start, max_bytes=self.prefetch_bytes, display_fps=self.frame_rate,
+                index=self.video_index, gop_buffer=self.gop_buffer, cap_pool=self.capture_pool
+            )
+        else:
+            from FrameExtractor.widgets import FrameReaderThread
+            self.thread = FrameReaderThread(
+                cap, start, max_bytes=self.prefetch_bytes, display_fps=self.frame_rate,
+                index=self.video_index, pool=self.frame_pool, cap_pool=self.capture_pool
+            )
         self.thread.start()
         self.set_play_pause_state("pause")
-        self.timer.start(int(1000 / self.frame_rate))
+        self.play_clock = PlaybackClock(self.frame_rate, rate=-1.0 if reverse else 1.0)
+        # Tick several times per frame so presentation follows the clock, not the tick
+        self.timer.start(max(1, min(10, int(250 / self.frame_rate))))
 
     def toggle_play_pause(self):
         if not self.video_path:
             return
-        if self.thread and self.thread.isRunning():
+        # A reader done decoding may still have buffered frames to present
+        if self.thread:
             self.thread.stop()
             self.thread = None
             self.set_play_pause_state("play")
             self.timer.stop()
+            self.log_playback_stats()
         else:
             self.replay_thread(self.current_frame)
+
+    def toggle_reverse_play(self):
+        if not self.video_path:
+            return
+        reversing = self.thread is not None and self.thread.direction < 0
+        if self.thread:
+            self.toggle_play_pause() # pause
+        if not reversing and self.current_frame > 0:
+            self.replay_thread(self.current_frame, reverse=True)
         self.update_status()
             
     def toggle_toolbar(self, checked):
@@ -422,6 +614,13 @@ class MainWindow(QMainWindow):
     def sync_toggle_toolbar(self, checked):
         self.toggleToolbar.setChecked(checked)
         
+    def open_stage_stats(self):
+        # Non-modal panel, kept while the window lives
+        if self.stage_stats_dialog is None:
+            self.stage_stats_dialog = StageStatsDialog(self, STAGE_STATS)
+        self.stage_stats_dialog.show()
+        self.stage_stats_dialog.raise_()
+        
     def open_batch_extract_dialog(self):
         if not self.cap:
             QMessageBox.information(self, __appname__, "Please load a video first.")
@@ -432,8 +631,8 @@ class MainWindow(QMainWindow):
             current_secs = self.current_frame / self.frame_rate if self.frame_rate else 0
             current_time_str = self.format_time(current_secs, self.frame_rate)
             
-            frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            frame_width = self.cap.width
+            frame_height = self.cap.height
         
             dialog = BatchExtractDialog(self, max_time=max_time_str, current_time=current_time_str, img_width=frame_width, img_height=frame_height, fps=self.frame_rate)
             # Run batch extract with params, show progress
@@ -460,77 +659,204 @@ class MainWindow(QMainWindow):
         return f"{h:02d}:{m:02d}:{s:02d}.{f:02d}"
     
     def run_batch_extract(self, params, dialog):
+        from FrameExtractor.core import ExtractJob
+        from FrameExtractor.core.frame_list import resolve_frames
         video_name = os.path.splitext(os.path.basename(self.video_path))[0]
         output_dir = os.path.join(self.output_dir, video_name, "batch_extract")
         
         start_secs = self.hms_to_secs(params['start_time'], self.frame_rate)
         end_secs = self.hms_to_secs(params['end_time'], self.frame_rate)
-        start_frame = int(start_secs * self.frame_rate)
-        end_frame = int(end_secs * self.frame_rate)
+        if self.video_index:
+            start_frame = self.video_index.frame_at_time(start_secs)
+            end_frame = self.video_index.frame_at_time(end_secs)
+        else:
+            start_frame = int(start_secs * self.frame_rate)
+            end_frame = int(end_secs * self.frame_rate)
         
         # Ensure start and end is within video length
         start_frame = max(0, min(start_frame, self.frame_count - 1))
         end_frame = max(0, min(end_frame, self.frame_count - 1))
         
-        self.batch_worker = BatchExtractWorker(
+        # Frame list replaces the range (timestamps resolved with the keyframe index)
+        frames = None
+        if params.get('frame_items'):
+            frames = [f for f in resolve_frames(params['frame_items'], self.frame_rate, self.video_index) if f < self.frame_count]
+            if not frames:
+                logger.error("Frame list has no frames within the video")
+                QMessageBox.warning(dialog, "Batch Extract", "Frame list has no frames within the video")
+                dialog.extract_btn.setEnabled(True)
+                return
+            start_frame, end_frame = frames[0], frames[-1]
+        
+        job = ExtractJob(
             self.video_path,
             output_dir,
             start_frame,
             end_frame,
             params['frame_step'],
-            params.get('roi')
+            params.get('roi'),
+            workers=params.get('workers', 1),
+            index=self.video_index,
+            backend=params.get('backend'),
+            threads=params.get('threads', 0),
+            encoder=params.get('encoder'),
+            sink=params.get('sink'),
+            resume=params.get('resume', True),
+            frame_filter=params.get('frame_filter'),
+            frames=frames,
+            variants=params.get('variants')
         )
-        dialog.set_worker(self.batch_worker)
-        self.batch_worker.progress.connect(dialog.update_progress)
-        self.batch_worker.finished.connect(dialog.on_finished)
-        self.batch_worker.start()
+        job_queue = self.get_job_queue()
+        dialog.set_job(job)
+        # Dialog only reacts to its own job
+        connections = [
+            (job_queue.job_progress, dialog.on_job_progress),
+            (job_queue.job_strategy, dialog.on_job_strategy),
+            (job_queue.job_state, dialog.on_job_state),
+        ]
+        for signal, slot in connections:
+            signal.connect(slot)
+        dialog.finished.connect(lambda _: self.disconnect_signals(connections))
+        job_queue.submit(job)
         logger.debug("Batch Extraction started")
 
-    def handle_frame(self, qimage, frame_idx):
+    def disconnect_signals(self, connections):
+        for signal, slot in connections:
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass # already disconnected
+            
+    def get_job_queue(self):
+        # Shared batch queue: jobs run concurrently under one worker budget
+        if self.job_queue is None:
+            self.job_queue = BatchJobQueue(parent=self, cap_pool=self.capture_pool)
+            self.job_queue.total_progress.connect(self.on_batch_progress)
+        return self.job_queue
+        
+    def on_batch_progress(self, done, total):
+        active = len(self.job_queue.active_jobs())
+        if active and not self.status_priority:
+            self.status.showMessage(f"Batch Extract: {active} job(s) running [{done}/{total} frames]")
+        elif not active:
+            self.update_status()
+
+    def set_current_image(self, qimg, owner=None):
+        # QImages view their buffer without copying: keep it alive while displayed,
+        # recycle the previous pooled buffer once replaced
+        if hasattr(self.current_qimg_owner, "release"):
+            self.current_qimg_owner.release()
+        self.current_qimg = qimg
+        self.current_qimg_owner = owner
+        
+    def handle_frame(self, qimage, frame_idx, pooled=None):
         # Display as frames are buffered by thread
-        self.current_qimg = None
-        self.current_qimg = qimage
+        self.set_current_image(qimage, pooled)
         self.current_frame = frame_idx
+        t0 = STAGE_STATS.start()
         pixmap = QPixmap.fromImage(qimage).scaled(self.canvas.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        STAGE_STATS.add("scale", t0)
         self.canvas.setPixmap(pixmap)
         self.update_labels()
         self.seekbar.setValue(frame_idx)
-        # Stop automatically at last frame
-        if self.current_frame >= self.frame_count - 1:
+        # Stop automatically at last frame (first one when playing backwards)
+        last_frame = 0 if self.thread.direction < 0 else self.frame_count - 1
+        if (self.current_frame - last_frame) * self.thread.direction >= 0:
             self.toggle_play_pause()
             self.timer.stop()
             
+    def frame_pts(self, frame_idx):
+        if self.video_index:
+            return self.video_index.time_of(frame_idx)
+        return frame_idx / self.frame_rate if self.frame_rate else 0.0
+        
     def update_from_buffer(self):
-        # Timer handler to grab frames from prefetch buffer and display
-        if self.thread:
+        # Timer handler: present the newest frame that is due on the playback clock,
+        # dropping older due frames to keep real time
+        if not self.thread or not self.play_clock:
+            return
+        shown = None
+        while True:
+            frame_data = self.thread.peek_frame()
+            if frame_data is None:
+                # Next frame is due but not decoded yet
+                next_frame = self.current_frame + self.thread.direction
+                if (shown is None and self.play_clock.started and self.underrun_frame != next_frame
+                        and self.play_clock.is_due(self.frame_pts(next_frame))):
+                    self.underrun_frame = next_frame
+                    self.thread.record_underrun()
+                break
+            if not self.play_clock.is_due(self.frame_pts(frame_data[1])):
+                break
             frame_data = self.thread.get_frame()
-            if frame_data:
-                qimg, frame_idx = frame_data
-                self.handle_frame(qimg, frame_idx)
+            if shown is not None:
+                shown[0].release()
+                self.play_clock.record_dropped()
+            shown = frame_data
+            if not self.play_clock.started:
+                break # first frame anchors the clock
+        if shown:
+            pooled, frame_idx = shown
+            self.play_clock.record_shown(self.frame_pts(frame_idx))
+            self.handle_frame(pooled.qimg, frame_idx, pooled)
+            
+    def log_playback_stats(self):
+        if self.play_clock:
+            logger.info(f"Playback timing: {self.play_clock.stats()}")
 
-    def show_frame(self, frame_idx, update_state=True):
-        # Frame display
-        # update_state=False : For non-playing mode, read single frame (blocking)
+    def show_frame(self, frame_idx, update_state=True, backward=False):
+        # Frame display: cached frames at once, others decoded by the seek worker
+        # update_state=False : Preview only (seekbar drag), current frame unchanged
         # update_state=True : No thread stoppage or play state change
         if not self.video_path or not self.cap:
             return
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = self.cap.read()
-        if ret:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            bytes_per_line = ch * w
-            qimg = QImage(rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy()
-            pixmap = QPixmap.fromImage(qimg).scaled(self.canvas.size(), Qt.AspectRatioMode.KeepAspectRatio)
-            self.canvas.setPixmap(pixmap)
-            self.current_qimg = qimg
+        frame = self.frame_cache.get(self.video_path, frame_idx)
+        if frame is None:
+            frame = self.gop_buffer.get(frame_idx)
+        if frame is None and self.seeker:
+            # Decoded by the seek worker, shown by on_frame_seeked
+            self.seek_target = (frame_idx, update_state)
+            self.seeker.seek(frame_idx, backward)
             if update_state:
                 self.current_frame = frame_idx
-            self.update_labels()
+                self.update_labels()
+            return
+        self.cancel_seek()
+        if frame is None:
+            self.cap.seek(frame_idx, self.video_index)
+            ret, frame = self.cap.read()
+            if not ret:
+                return
+            self.frame_cache.put(self.video_path, frame_idx, frame)
+        self.display_frame(frame, frame_idx, update_state)
+
+    def on_frame_seeked(self, frame, frame_idx):
+        # Results of superseded or cancelled seeks are dropped
+        if self.seek_target is None or self.seek_target[0] != frame_idx:
+            return
+        _, update_state = self.seek_target
+        self.seek_target = None
+        self.display_frame(frame, frame_idx, update_state)
+
+    def display_frame(self, frame, frame_idx, update_state=True):
+        # BGR QImage over the (cached, never mutated) frame: no convert, no copy
+        t0 = STAGE_STATS.start()
+        h, w, ch = frame.shape
+        qimg = QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_BGR888)
+        t1 = STAGE_STATS.start()
+        STAGE_STATS.add("qimage", t0)
+        pixmap = QPixmap.fromImage(qimg).scaled(self.canvas.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        STAGE_STATS.add("scale", t1)
+        self.canvas.setPixmap(pixmap)
+        self.set_current_image(qimg, frame)
+        if update_state:
+            self.current_frame = frame_idx
+            self.prefetch_neighbors(frame_idx)
+        self.update_labels()
 
     def rewind_video(self):
         new_frame = max(0, self.current_frame - int(self.time_step * self.frame_rate))
-        self.pause_and_show_frame(new_frame)
+        self.pause_and_show_frame(new_frame, backward=True)
         self.update_status()
 
     def forward_video(self):
@@ -538,13 +864,14 @@ class MainWindow(QMainWindow):
         self.pause_and_show_frame(new_frame)
         self.update_status()
 
-    def pause_and_show_frame(self, frame_idx):
-        if self.thread and self.thread.isRunning():
+    def pause_and_show_frame(self, frame_idx, backward=False):
+        if self.thread:
             self.thread.stop()
             self.thread = None
             self.set_play_pause_state("play")
             self.timer.stop()
-        self.show_frame(frame_idx)
+            self.log_playback_stats()
+        self.show_frame(frame_idx, backward=backward)
         
     # def setup_logging(self):
     #     logging.basicConfig(
@@ -557,12 +884,13 @@ class MainWindow(QMainWindow):
         
     def on_seek_pressed(self):
         self.seekbar_moving = True
-        if self.thread and self.thread.isRunning():
+        if self.thread:
             self.thread.stop()
             self.thread = None
             self.set_play_pause_state("play")
             self.update_status()
             self.timer.stop()
+            self.log_playback_stats()
             
     def on_seek_released(self):
         self.seekbar_moving = False
@@ -575,9 +903,20 @@ class MainWindow(QMainWindow):
         
     def on_seek_moved(self, value):
         if self.seekbar_moving:
-            # show frame when dragging
+            # Nearest thumbnail at once, replaced by the full frame once the seek worker has it
+            if self.thumbnails is not None and (self.video_path, value) not in self.frame_cache:
+                self.show_thumbnail(value)
             self.show_frame(value, update_state=False)
         self.update_status()
+        
+    def show_thumbnail(self, frame_idx):
+        thumb = self.thumbnails.nearest(frame_idx)
+        if thumb is None:
+            return
+        h, w, ch = thumb.shape
+        qimg = QImage(thumb.data, w, h, thumb.strides[0], QImage.Format.Format_BGR888)
+        pixmap = QPixmap.fromImage(qimg).scaled(self.canvas.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.canvas.setPixmap(pixmap)
 
     def update_labels(self):
         total_sec = self.current_frame / self.frame_rate if self.frame_rate else 0
@@ -587,12 +926,19 @@ class MainWindow(QMainWindow):
             self.seekbar.setValue(self.current_frame)
 
     def save_frame(self):
-        if self.current_qimg and not (self.thread and self.thread.isRunning()):
+        # Not while playing or while the displayed frame is not the current one yet
+        if self.current_qimg and not (self.thread and self.thread.isRunning()) and self.seek_target is None:
             video_name = os.path.splitext(os.path.basename(self.video_path))[0]
             save_dir = os.path.join(self.output_dir, video_name)
             os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, f"{video_name}_frame_{self.current_frame}.jpg")
-            self.current_qimg.save(save_path)
+            save_path = os.path.join(save_dir, f"{video_name}_frame_{self.current_frame}{self.frame_encoder.ext}")
+            # Encode the BGR buffer behind the displayed QImage, as batch extraction does
+            frame = getattr(self.current_qimg_owner, "buf", self.current_qimg_owner)
+            try:
+                self.frame_encoder.write(save_path, frame)
+            except Exception as e:
+                logger.error(f"Failed to save frame: {e}")
+                return
             self.status_priority = True
             logger.info(f"Frame saved to {save_path}")
             self.status.showMessage(f"Frame saved to {save_path}")
@@ -600,12 +946,19 @@ class MainWindow(QMainWindow):
             
     def close_window(self):
         logger.info("Exiting...")
-        if self.thread and self.thread.isRunning():
+        if self.thread:
             self.thread.stop()
             self.thread = None
+        self.stop_index_thread()
+        self.stop_prefetcher()
+        self.stop_seeker()
+        if self.job_queue:
+            self.job_queue.shutdown()
+            self.job_queue = None
         if self.cap:
-            self.cap.release()
+            self.capture_pool.release(self.cap)
             self.cap = None
+        self.capture_pool.close()
         self.close()
         
     def closeEvent(self, ev):
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+Offline performance benchmarks (no PyQt6 import)
+
+Synthetic test videos are generated locally with cv2.VideoWriter, so runs are
+reproducible without sample footage. Each result is printed as a JSON line and
+the whole run is written to one JSON file that later runs can be compared to.
+"""
+
+import os, sys, json, time, shutil, random, platform, tempfile, tracemalloc
+from loguru import logger
+
+BENCH_VERSION = 1
+# Container of the generated videos per fourcc
+CODEC_EXT = {"mp4v": "mp4", "avc1": "mp4", "XVID": "avi", "MJPG": "avi"}
+# Metric -> True when higher is better, used to flag regressions
+METRICS = {
+    "fps": True, "ms_mean": False, "ms_p50": False, "ms_p95": False,
+    "bytes_per_frame": False, "seconds": False,
+}
+# Defaults of the full run and of --quick (explicit options win over both)
+DEFAULTS = dict(resolutions="640x360,1280x720,1920x1080", codecs="mp4v,MJPG", gops="12,48", frames=240, seeks=50, repeat=3)
+QUICK = dict(resolutions="640x360", codecs="mp4v", gops="12", frames=120, seeks=20, repeat=1)
+
+
+def parse_list(text, cast=str):
+    return [cast(v) for v in text.split(",") if v.strip()]
+
+
+def parse_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+def add_bench_parser(subparsers):
+    parser = subparsers.add_parser("bench", help="offline performance benchmarks on generated videos")
+    parser.add_argument("--output", "-o", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--workdir", help="keep generated videos here and reuse them (default: temporary directory)")
+    parser.add_argument("--resolutions", help=f"comma-separated WxH (default: {DEFAULTS['resolutions']})")
+    parser.add_argument("--codecs", help="comma-separated VideoWriter fourccs: " + ", ".join(CODEC_EXT) + f" (default: {DEFAULTS['codecs']})")
+    parser.add_argument("--gops", help=f"comma-separated keyframe intervals, requested from the encoder, the measured GOP is reported (default: {DEFAULTS['gops']})")
+    parser.add_argument("--frames", type=int, help=f"frames per generated video (default: {DEFAULTS['frames']})")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate of the generated videos")
+    parser.add_argument("--backends", help="comma-separated decoder backends (default: all available)")
+    parser.add_argument("--seeks", type=int, help=f"random seeks per video and backend (default: {DEFAULTS['seeks']})")
+    parser.add_argument("--steps", default="1,10", help="comma-separated batch extraction frame steps")
+    parser.add_argument("--repeat", type=int, help=f"runs per decode/extract measurement, the best is kept (default: {DEFAULTS['repeat']})")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated content and seek positions")
+    parser.add_argument("--quick", action="store_true", help="small smoke run: " + ", ".join(f"{k}={v}" for k, v in QUICK.items()))
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative slowdown reported as a regression")
+    parser.set_defaults(func=run_bench)
+    return parser
+
+
+def emit(event, **fields):
+    print(json.dumps(dict(event=event, **fields)), flush=True)
+
+
+def generate_video(path, size, codec, gop, frames, fps, seed=0):
+    """Moving textured pattern with a frame counter; returns False if the codec is unavailable"""
+    import cv2
+    import numpy as np
+    w, h = size
+    params = []
+    if hasattr(cv2, "VIDEOWRITER_PROP_KEY_INTERVAL"):
+        # Honored by FFmpeg builds that support it, otherwise the encoder default applies
+        params = [cv2.VIDEOWRITER_PROP_KEY_INTERVAL, gop]
+    writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*codec), fps, (w, h), params)
+    if not writer.isOpened():
+        return False
+    rng = np.random.default_rng(seed)
+    # Texture twice the frame size, panned across: every frame differs, like real footage
+    texture = cv2.GaussianBlur(rng.integers(0, 256, (2 * h, 2 * w, 3), dtype=np.uint8), (0, 0), 3)
+    for i in range(frames):
+        x, y = (7 * i) % w, (3 * i) % h
+        frame = np.ascontiguousarray(texture[y:y + h, x:x + w])
+        cv2.putText(frame, str(i), (w // 10, h // 2), cv2.FONT_HERSHEY_SIMPLEX, h / 150, (255, 255, 255), max(1, h // 100))
+        writer.write(frame)
+    writer.release()
+    return True
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def bench_decode(video_path, backend, repeat):
+    from FrameExtractor.core import open_source
+    best = None
+    for _ in range(repeat):
+        cap = open_source(video_path, backend)
+        count = 0
+        t0 = time.perf_counter()
+        while True:
+            ret, _ = cap.read()
+            if not ret:
+                break
+            count += 1
+        elapsed = time.perf_counter() - t0
+        cap.release()
+        best = elapsed if best is None else min(best, elapsed)
+    return dict(frames=count, seconds=round(best, 4), fps=round(count / best, 2) if best else 0.0)
+
+
+def bench_seek(video_path, backend, index, seeks, seed):
+    # Cold random access as in MainWindow.show_frame: index-aware seek + read, no cache
+    from FrameExtractor.core import open_source, seek
+    rng = random.Random(seed)
+    targets = [rng.randrange(index.frame_count) for _ in range(seeks)]
+    cap = open_source(video_path, backend)
+    latencies = []
+    for frame_idx in targets:
+        t0 = time.perf_counter()
+        seek(cap, frame_idx, index)
+        cap.read()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    cap.release()
+    return dict(
+        seeks=seeks, ms_mean=round(sum(latencies) / len(latencies), 3),
+        ms_p50=round(percentile(latencies, 50), 3), ms_p95=round(percentile(latencies, 95), 3),
+        ms_max=round(max(latencies), 3),
+    )
+
+
+def bench_extract(video_path, backend, index, step, roi, repeat, workdir):
+    # The batch extraction path of the batch job queue/the CLI, JPEG files
+    from FrameExtractor.core import run_extraction
+    best, written = None, 0
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp(prefix="extract_", dir=workdir)
+        t0 = time.perf_counter()
+        written = run_extraction(
+            video_path, output_dir, 0, index.frame_count - 1, step, roi,
+            gop_size=index.gop_size, index=index, backend=backend, resume=False
+        )
+        elapsed = time.perf_counter() - t0
+        out_bytes = sum(e.stat().st_size for e in os.scandir(output_dir) if e.name.endswith(".jpg"))
+        shutil.rmtree(output_dir, ignore_errors=True)
+        best = elapsed if best is None else min(best, elapsed)
+    return dict(
+        frames=written, seconds=round(best, 4), fps=round(written / best, 2) if best else 0.0,
+        output_bytes=out_bytes,
+    )
+
+
+def rss_bytes():
+    # Resident set size of this process, None where it cannot be read
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def bench_memory(video_path, backend, frames=30):
+    # Memory held per decoded frame kept alive: resident set growth (decoder
+    # buffers included) and Python-traced allocations (numpy buffers)
+    from FrameExtractor.core import open_source
+    cap = open_source(video_path, backend)
+    cap.read() # decoder set up outside the measurement
+    kept = []
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    for _ in range(frames):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        kept.append(frame)
+    traced, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_bytes()
+    cap.release()
+    n = max(1, len(kept))
+    rss = (rss_after - rss_before) // n if rss_before is not None and rss_after is not None else None
+    return dict(
+        frames=len(kept), frame_nbytes=kept[0].nbytes if kept else 0,
+        bytes_per_frame=rss if rss is not None else traced // n, traced_bytes_per_frame=traced // n,
+        traced_peak_bytes=peak,
+    )
+
+
+def result_key(result):
+    # Identity of a measurement across runs
+    return json.dumps([result.get(k) for k in ("bench", "video", "backend", "step", "roi")])
+
+
+def compare(results, baseline, tolerance):
+    """Relative changes against a baseline run; returns the regressions"""
+    base = {result_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = base.get(result_key(result))
+        if old is None:
+            continue
+        for metric, higher_better in METRICS.items():
+            if not old.get(metric) or metric not in result:
+                continue
+            change = result[metric] / old[metric] - 1
+            worse = -change if higher_better else change
+            if worse > tolerance:
+                regressions.append(dict(
+                    bench=result["bench"], video=result["video"], backend=result["backend"],
+                    metric=metric, baseline=old[metric], current=result[metric], change=round(change, 3),
+                    **{k: result[k] for k in ("step", "roi") if k in result},
+                ))
+    return regressions
+
+
+def environment():
+    import cv2
+    import numpy as np
+    try:
+        import av
+        av_version = av.__version__
+    except ImportError:
+        av_version = None
+    from FrameExtractor import __version__
+    return dict(
+        app=__version__, python=platform.python_version(), platform=platform.platform(),
+        machine=platform.machine(), cpu_count=os.cpu_count(),
+        opencv=cv2.__version__, numpy=np.__version__, pyav=av_version,
+    )
+
+
+def run_bench(args):
+    from FrameExtractor.core import VideoIndex, available_backends
+
+    for key, value in (QUICK if args.quick else DEFAULTS).items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    backends = parse_list(args.backends) if args.backends else available_backends()
+    unknown = [b for b in backends if b not in available_backends()]
+    if unknown:
+        logger.error(f"Unavailable backend(s): {', '.join(unknown)} (available: {', '.join(available_backends())})")
+        return 2
+    workdir = args.workdir or tempfile.mkdtemp(prefix="frame_extractor_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    config = dict(
+        resolutions=args.resolutions, codecs=args.codecs, gops=args.gops, frames=args.frames, fps=args.fps,
+        backends=backends, seeks=args.seeks, steps=args.steps, repeat=args.repeat, seed=args.seed,
+    )
+    videos, results = [], []
+    t0 = time.perf_counter()
+    try:
+        for size in parse_list(args.resolutions, parse_size):
+            for codec in parse_list(args.codecs):
+                for gop in parse_list(args.gops, int):
+                    name = f"bench_{size[0]}x{size[1]}_{codec}_gop{gop}_{args.frames}"
+                    path = os.path.join(workdir, f"{name}.{CODEC_EXT.get(codec, 'avi')}")
+                    if not os.path.exists(path) and not generate_video(path, size, codec, gop, args.frames, args.fps, args.seed):
+                        logger.warning(f"Codec '{codec}' is unavailable in this OpenCV build, skipped")
+                        break
+                    t1 = time.perf_counter()
+                    index = VideoIndex.build(path)
+                    video = dict(
+                        video=name, codec=codec, width=size[0], height=size[1], gop=gop,
+                        gop_measured=index.gop_size, frames=index.frame_count, file_bytes=os.path.getsize(path),
+                        index_seconds=round(time.perf_counter() - t1, 4),
+                    )
+                    videos.append(video)
+                    emit("video", **video)
+                    roi = (size[0] // 4, size[1] // 4, 3 * size[0] // 4, 3 * size[1] // 4)
+                    for backend in backends:
+                        runs = [("decode", {}, lambda: bench_decode(path, backend, args.repeat))]
+                        runs.append(("seek", {}, lambda: bench_seek(path, backend, index, args.seeks, args.seed)))
+                        runs.append(("memory", {}, lambda: bench_memory(path, backend)))
+                        for step in parse_list(args.steps, int):
+                            for crop in (None, roi):
+                                runs.append((
+                                    "extract", dict(step=step, roi=list(crop) if crop else None),
+                                    lambda step=step, crop=crop: bench_extract(path, backend, index, step, crop, args.repeat, workdir),
+                                ))
+                        for bench, params, run in runs:
+                            result = dict(bench=bench, video=name, backend=backend, **params, **run())
+                            results.append(result)
+                            emit("result", **result)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = dict(
+        version=BENCH_VERSION, created=time.strftime("%Y-%m-%dT%H:%M:%S"), elapsed=round(time.perf_counter() - t0, 3),
+        environment=environment(), config=config, videos=videos, results=results,
+    )
+    status = 0
+    if args.compare:
+        try:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable baseline '{args.compare}': {e}")
+            return 2
+        regressions = compare(results, baseline, args.tolerance)
+        report["baseline"] = dict(path=args.compare, created=baseline.get("created"), regressions=regressions)
+        for regression in regressions:
+            emit("regression", **regression)
+        status = 1 if regressions else 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    emit("summary", results=len(results), videos=len(videos), output=args.output, elapsed=report["elapsed"],
+         **({"regressions": len(report["baseline"]["regressions"])} if args.compare else {}))
+    return status
+
+
+def add_startup_parser(subparsers):
+    parser = subparsers.add_parser("startup", help="GUI startup benchmark: time-to-first-paint breakdown")
+    parser.add_argument("--runs", type=int, default=5, help="fresh GUI processes to start (the median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="time-to-first-paint budget, exceeded: exit code 1")
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list (one extra run with -X importtime)")
+    parser.add_argument("--output", "-o", help="JSON results file")
+    parser.set_defaults(func=run_startup)
+    return parser
+
+
+def probe_startup(importtime=False):
+    """Start the GUI once with the startup probe; returns (probe report, -X importtime output)"""
+    import subprocess
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (package_root, env.get("PYTHONPATH")) if p)
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "FrameExtractor", "--logger-level", "warning"]
+    # The log file of the probed process goes to a scratch directory
+    with tempfile.TemporaryDirectory(prefix="frame_extractor_startup_") as cwd:
+        env["FRAME_EXTRACTOR_STARTUP_PROBE"] = repr(time.time())
+        proc = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True, timeout=120)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line), proc.stderr
+    raise RuntimeError(f"startup probe failed (exit code {proc.returncode}): {proc.stderr.strip()[-500:]}")
+
+
+def startup_phases(report):
+    # Phase durations in ms: each mark closes the phase named after it
+    phases, last = {}, report["spawn"]
+    for phase, t in report["marks"]:
+        phases[phase] = round((t - last) * 1000, 2)
+        last = t
+    return phases
+
+
+def slowest_imports(importtime_output, modules, top):
+    # Top-level imports (cumulative) among the modules loaded by first paint
+    imports = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit() or name.startswith("   "):
+            continue
+        name = name.strip()
+        if name in modules:
+            imports.append(dict(module=name, ms=round(int(cumulative) / 1000, 2)))
+    return sorted(imports, key=lambda i: -i["ms"])[:top]
+
+
+def run_startup(args):
+    runs = []
+    try:
+        for _ in range(max(1, args.runs)):
+            report, _ = probe_startup()
+            phases = startup_phases(report)
+            # "deferred" (log file sink, preload start) runs after first paint
+            ttfp = round((dict(report["marks"])["first_paint"] - report["spawn"]) * 1000, 2)
+            runs.append(dict(first_paint_ms=ttfp, phases=phases))
+            emit("run", **runs[-1])
+        imports = []
+        if args.top > 0:
+            report, importtime_output = probe_startup(importtime=True)
+            imports = slowest_imports(importtime_output, set(report["modules"]), args.top)
+    except (OSError, RuntimeError, ValueError) as e:
+        logger.error(f"Startup benchmark failed: {e}")
+        return 2
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    ttfp = median([r["first_paint_ms"] for r in runs])
+    result = dict(
+        first_paint_ms=ttfp, first_paint_min_ms=min(r["first_paint_ms"] for r in runs),
+        budget_ms=args.budget_ms, within_budget=ttfp <= args.budget_ms,
+        phases={p: median([r["phases"][p] for r in runs]) for p in runs[0]["phases"]},
+        slowest_imports=imports, runs=runs, environment=environment(),
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    emit("summary", **{k: v for k, v in result.items() if k not in ("runs", "environment")})
+    if not result["within_budget"]:
+        logger.warning(f"Time to first paint {ttfp} ms exceeds the {args.budget_ms:g} ms budget")
+        return 1
+    return 0
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Headless batch extraction (no PyQt6 import)
+
+Progress is printed to stdout as JSON lines, logs go to stderr.
+"""
+
+import os, json, time
+from types import SimpleNamespace
+from loguru import logger
+
+# Per-job settings accepted in --jobs-file entries (defaults from the command line)
+JOB_KEYS = ("start", "end", "start_frame", "end_frame", "step", "roi", "workers", "priority", "backend", "decode_threads", "format", "sink", "dedup", "frames", "times", "variants")
+
+
+def parse_time(text, fps):
+    from FrameExtractor.core.frame_list import parse_timestamp
+    return parse_timestamp(text, fps)
+
+
+def parse_roi(text):
+    vals = [int(float(v)) for v in text.split(",")]
+    if len(vals) != 4:
+        raise ValueError(f"ROI '{text}' must be x1,y1,x2,y2")
+    return tuple(vals)
+
+
+def add_extract_parser(subparsers):
+    parser = subparsers.add_parser("extract", help="headless batch frame extraction")
+    parser.add_argument("videos", nargs="*", help="video file(s)")
+    parser.add_argument("--jobs-file", help="JSON list of jobs: {\"video\": ..., " + ", ".join(f"\"{k}\"" for k in JOB_KEYS) + "}")
+    parser.add_argument("--output-dir", "-o", default=os.getcwd(), help="output directory")
+    parser.add_argument("--start", help="start time (HH:MM:SS[.ff] or seconds)")
+    parser.add_argument("--end", help="end time (HH:MM:SS[.ff] or seconds)")
+    parser.add_argument("--start-frame", type=int, help="start frame (overrides --start)")
+    parser.add_argument("--end-frame", type=int, help="end frame (overrides --end)")
+    parser.add_argument("--step", type=int, default=1, help="frame step")
+    parser.add_argument("--frames", help="extract these frames instead of a range: comma-separated frame numbers / HH:MM:SS[.ff] timestamps, or a CSV file (first column)")
+    parser.add_argument("--times", help="like --frames, with plain numbers read as seconds")
+    parser.add_argument("--roi", type=parse_roi, help="crop ROI as x1,y1,x2,y2")
+    parser.add_argument("--variant", dest="variants", action="append", help="named output variant written to its own subdirectory, repeatable: name[=x1,y1,x2,y2][@WxH|@scale], e.g. full, face=100,50,300,250, thumb@320x0")
+    parser.add_argument("--workers", type=int, default=1, help="parallel extraction processes per video")
+    parser.add_argument("--backend", default="opencv", choices=["opencv", "pyav"], help="video decoder backend")
+    parser.add_argument("--decode-threads", type=int, default=0, help="decoder threads per worker (0: decoder default)")
+    parser.add_argument("--format", default="jpeg", help="output image format and options, e.g. jpeg:quality=90,subsampling=444, png:level=1, webp:quality=101, tiff, bmp, npy")
+    parser.add_argument("--sink", default="files", help="output container: files (one per frame), tar (sharded), zip, hdf5, lmdb (packed, with a frame index JSON), memmap (raw (N, H, W, C) uint8 .npy array + JSON header, --format ignored)")
+    parser.add_argument("--dedup", help="skip near-duplicate frames: dhash[:bits], pixel[:mean diff 0-1] or hist[:distance 0-1]")
+    parser.add_argument("--priority", type=int, default=0, help="job priority (higher runs first)")
+    parser.add_argument("--decode-workers", type=int, help="global decode worker budget (default: CPU count)")
+    parser.add_argument("--encode-workers", type=int, help="global encode worker budget (default: CPU count)")
+    parser.add_argument("--no-resume", action="store_true", help="re-extract everything instead of resuming from the job manifest")
+    parser.add_argument("--no-index", action="store_true", help="do not build/use the keyframe index")
+    parser.add_argument("--stats", action="store_true", help="time decode/convert/crop/encode/write stages: {video}_stats.json per job and a summary at the end")
+    parser.set_defaults(func=run_extract)
+    return parser
+
+
+def emit(event, **fields):
+    print(json.dumps(dict(event=event, **fields)), flush=True)
+
+
+def resolve_range(spec, index, fps, frame_count):
+    def to_frame(secs):
+        return index.frame_at_time(secs) if index else int(secs * fps)
+
+    start_frame = spec.start_frame
+    if start_frame is None:
+        start_frame = to_frame(parse_time(str(spec.start), fps)) if spec.start else 0
+    end_frame = spec.end_frame
+    if end_frame is None:
+        end_frame = to_frame(parse_time(str(spec.end), fps)) if spec.end else frame_count - 1
+    start_frame = max(0, min(start_frame, frame_count - 1))
+    end_frame = max(0, min(end_frame, frame_count - 1))
+    if start_frame > end_frame:
+        raise ValueError(f"start frame {start_frame} is after end frame {end_frame}")
+    return start_frame, end_frame
+
+
+def validate_roi(roi, width, height):
+    if roi is None:
+        return
+    x1, y1, x2, y2 = roi
+    if not (0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height):
+        raise ValueError(f"ROI {roi} is invalid for {width}x{height} frames")
+
+
+def job_specs(args):
+    defaults = {k: getattr(args, k) for k in JOB_KEYS}
+    specs = [SimpleNamespace(video=v, **defaults) for v in args.videos]
+    if args.jobs_file:
+        with open(args.jobs_file, "r", encoding="utf-8") as f:
+            for entry in json.load(f):
+                spec = SimpleNamespace(**{**defaults, **entry})
+                if isinstance(spec.roi, str):
+                    spec.roi = parse_roi(spec.roi)
+                spec.roi = tuple(spec.roi) if spec.roi else None
+                specs.append(spec)
+    return specs
+
+
+def prepare_job(spec, args, cap_pool):
+    from FrameExtractor.core import VideoIndex, ExtractJob, encoder_from_spec, available_sinks, filter_from_spec
+    from FrameExtractor.core.frame_list import read_frame_list, resolve_frames
+    from FrameExtractor.core.frame_variants import parse_variants
+
+    if spec.step < 1:
+        raise ValueError("step must be >= 1")
+    encoder = encoder_from_spec(spec.format)
+    frame_filter = filter_from_spec(spec.dedup)
+    variants = parse_variants(spec.variants) if spec.variants else None
+    if variants and spec.roi:
+        raise ValueError("--roi cannot be combined with output variants, give the variants ROIs instead")
+    if (spec.frames or spec.times) and spec.workers > 1:
+        raise ValueError("frame lists are extracted in a single pass, --workers must be 1")
+    if spec.sink not in available_sinks():
+        raise ValueError(f"output sink '{spec.sink}' is unavailable (available: {', '.join(available_sinks())})")
+    # The probed handle goes back to the pool for the job to reuse
+    with cap_pool.lease(spec.video, spec.backend, spec.decode_threads) as cap:
+        if not cap.isOpened():
+            raise ValueError(f"failed to open video '{spec.video}'")
+        fps, frame_count, width, height = cap.fps, cap.frame_count, cap.width, cap.height
+
+    index = None if args.no_index else VideoIndex.load_or_build(spec.video)
+    if index is not None:
+        frame_count = index.frame_count
+    frames = None
+    if spec.frames or spec.times:
+        frames = resolve_frames(read_frame_list(spec.times or spec.frames), fps, index, times=bool(spec.times))
+        frames = [f for f in frames if f < frame_count]
+        if not frames:
+            raise ValueError("frame list is empty")
+        start_frame, end_frame = frames[0], frames[-1]
+    else:
+        start_frame, end_frame = resolve_range(spec, index, fps, frame_count)
+    validate_roi(spec.roi, width, height)
+    for variant in variants or []:
+        variant.validate(width, height)
+
+    video_name = os.path.splitext(os.path.basename(spec.video))[0]
+    output_dir = os.path.join(args.output_dir, video_name, "batch_extract")
+    return ExtractJob(
+        spec.video, output_dir, start_frame, end_frame, spec.step, spec.roi,
+        workers=spec.workers, priority=spec.priority, index=index,
+        backend=spec.backend, threads=spec.decode_threads, encoder=encoder,
+        sink=spec.sink, resume=not args.no_resume, frame_filter=frame_filter,
+        frames=frames, variants=variants
+    )
+
+
+def skipped(job):
+    # Frames dropped by the duplicate filter count as done
+    return job.frame_filter.skipped if job.frame_filter else 0
+
+
+def run_extract(args):
+    from FrameExtractor.core import JobScheduler, CapturePool, STAGE_STATS
+
+    if args.stats:
+        STAGE_STATS.enable()
+    t0 = time.perf_counter()
+    started = {}
+    last_report = {}
+
+    def on_state(job):
+        now = time.perf_counter()
+        if job.state == "running":
+            started[job.job_id] = now
+            return
+        elapsed = now - started.get(job.job_id, now)
+        emit(job.state, job=job.job_id, video=job.video_path, written=job.done - skipped(job), total=job.total,
+             elapsed=round(elapsed, 3), fps=round(job.done / elapsed, 2) if elapsed else 0.0,
+             encode=job.encoder.stats(),
+             **({"dedup": job.frame_filter.stats()} if job.frame_filter else {}),
+             **({"error": job.error} if job.error else {}))
+
+    def on_strategy(job):
+        emit("start", job=job.job_id, video=job.video_path, output_dir=job.output_dir,
+             start_frame=job.start_frame, end_frame=job.end_frame, step=job.frame_step,
+             roi=job.roi, strategy=job.strategy,
+             **({"variants": [v.spec() for v in job.variants]} if job.variants else {}))
+
+    def on_progress(job):
+        now = time.perf_counter()
+        # Throttle output to ~4 lines per second per job, always report the last frame
+        if now - last_report.get(job.job_id, 0.0) < 0.25 and job.done < job.total:
+            return
+        last_report[job.job_id] = now
+        elapsed = now - started.get(job.job_id, now)
+        done, total = scheduler.progress()
+        emit("progress", job=job.job_id, video=job.video_path, done=job.done, total=job.total,
+             elapsed=round(elapsed, 3), fps=round(job.done / elapsed, 2) if elapsed else 0.0,
+             all_done=done, all_total=total)
+
+    cap_pool = CapturePool(max_idle=1)
+    scheduler = JobScheduler(
+        args.decode_workers, args.encode_workers,
+        on_progress=on_progress, on_state=on_state, on_strategy=on_strategy, cap_pool=cap_pool
+    )
+    failed = 0
+    try:
+        specs = job_specs(args)
+    except (OSError, ValueError, TypeError) as e:
+        logger.error(f"Invalid jobs file: {e}")
+        return 2
+    if not specs:
+        logger.error("No videos given")
+        return 2
+    for spec in specs:
+        try:
+            scheduler.submit(prepare_job(spec, args, cap_pool))
+        except Exception as e:
+            failed += 1
+            logger.error(f"{spec.video}: {e}")
+            emit("error", video=spec.video, error=str(e))
+    try:
+        scheduler.wait_all()
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, cancelling jobs")
+        scheduler.shutdown(cancel=True)
+    cap_pool.close()
+    failed += sum(1 for job in scheduler.jobs if job.state != "done")
+    written = sum(job.done - skipped(job) for job in scheduler.jobs)
+    elapsed = time.perf_counter() - t0
+    emit("summary", videos=len(specs), failed=failed, written=written,
+         elapsed=round(elapsed, 3), fps=round(written / elapsed, 2) if elapsed else 0.0,
+         **({"stages": STAGE_STATS.summary()} if STAGE_STATS.enabled else {}))
+    return 1 if failed else 0
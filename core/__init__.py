@@ -0,0 +1,58 @@
+"""Extraction, decoding and caching core (Qt-free)
+
+Submodules load on first use of their names: OpenCV/numpy are not imported
+until something needs them.
+"""
+
+import importlib
+
+# Exported name -> submodule, imported on first access
+_EXPORTS = {
+    "ExtractEngine": "extract_engine",
+    "choose_strategy": "extract_engine",
+    "plan_access": "extract_engine",
+    "VideoIndex": "video_index",
+    "seek": "video_index",
+    "ParallelExtractor": "parallel_extract",
+    "FrameWriter": "frame_writer",
+    "run_extraction": "extract_job",
+    "ExtractJob": "job_queue",
+    "JobScheduler": "job_queue",
+    "FrameCache": "frame_cache",
+    "ThumbnailIndex": "thumbnail_index",
+    "FramePool": "buffer_pool",
+    "PrefetchBuffer": "prefetch_buffer",
+    "PlaybackClock": "playback_clock",
+    "GopRingBuffer": "gop_buffer",
+    "VideoSource": "video_source",
+    "open_source": "video_source",
+    "CapturePool": "capture_pool",
+    "available_backends": "video_source",
+    "make_encoder": "encoders",
+    "encoder_from_spec": "encoders",
+    "open_sink": "frame_sinks",
+    "available_sinks": "frame_sinks",
+    "load_index": "frame_sinks",
+    "read_frame_bytes": "frame_sinks",
+    "JobManifest": "job_manifest",
+    "DuplicateFilter": "frame_filter",
+    "filter_from_spec": "frame_filter",
+    "OutputVariant": "frame_variants",
+    "parse_variants": "frame_variants",
+    "STAGE_STATS": "stage_stats",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,49 @@
+import threading
+import numpy as np
+
+
+class FramePool:
+    """Recycles frame buffers by shape so steady-state decoding allocates nothing
+
+    `allocations` counts every buffer the pool had to create (or adopt), `reuses`
+    every buffer handed out again.
+    """
+
+    def __init__(self, max_free=64):
+        self.max_free = max_free
+        self.allocations = 0
+        self.reuses = 0
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.reuses += 1
+                return free.pop()
+            self.allocations += 1
+        return np.empty(shape, dtype)
+
+    def adopt(self, buf):
+        # Buffer allocated outside the pool (e.g. first decoded frame)
+        with self._lock:
+            self.allocations += 1
+        return buf
+
+    def release(self, buf):
+        key = (buf.shape, buf.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_free:
+                free.append(buf)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+    def stats(self):
+        with self._lock:
+            free = sum(len(v) for v in self._free.values())
+        return dict(allocations=self.allocations, reuses=self.reuses, free=free)
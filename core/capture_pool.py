@@ -0,0 +1,89 @@
+import os, threading
+from contextlib import contextmanager
+from loguru import logger
+from .video_source import DEFAULT_BACKEND, open_source
+
+
+class CapturePool:
+    """Capture handles per (video, backend, threads), each owned by one consumer at a time
+
+    acquire() hands out an idle handle or opens a new one, release() gives it
+    back for reuse: at most max_idle idle handles per key and max_total idle
+    handles overall, the least recently released ones are closed. Handles keep
+    the position their last owner left, so owners seek before reading.
+    close() drops the idle handles of a video; handles still owned are closed
+    when released.
+    """
+
+    def __init__(self, max_idle=2, max_total=8):
+        self.max_idle = max_idle
+        self.max_total = max_total
+        self.opened = 0
+        self.reused = 0
+        self._idle = [] # (key, cap), least recently released first
+        self._owned = {} # id(cap) -> key
+        self._discard = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(video_path, backend, threads):
+        return os.path.abspath(video_path), backend or DEFAULT_BACKEND, threads or 0
+
+    def acquire(self, video_path, backend=None, threads=0):
+        key = self._key(video_path, backend, threads)
+        with self._lock:
+            for i in range(len(self._idle) - 1, -1, -1):
+                if self._idle[i][0] == key:
+                    cap = self._idle.pop(i)[1]
+                    self._owned[id(cap)] = key
+                    self.reused += 1
+                    return cap
+        cap = open_source(video_path, backend, threads)
+        with self._lock:
+            self.opened += 1
+            if cap.isOpened():
+                self._owned[id(cap)] = key
+        return cap
+
+    def release(self, cap):
+        closing = [cap]
+        with self._lock:
+            key = self._owned.pop(id(cap), None)
+            if key is not None and id(cap) not in self._discard and self.max_idle > 0:
+                closing.pop()
+                self._idle.append((key, cap))
+                same = [i for i, (k, _) in enumerate(self._idle) if k == key]
+                evict = set(same[:max(0, len(same) - self.max_idle)])
+                evict.update(range(len(self._idle) - self.max_total))
+                closing = [c for i, (_, c) in enumerate(self._idle) if i in evict]
+                self._idle = [item for i, item in enumerate(self._idle) if i not in evict]
+            self._discard.discard(id(cap))
+        for c in closing:
+            c.release()
+
+    @contextmanager
+    def lease(self, video_path, backend=None, threads=0):
+        cap = self.acquire(video_path, backend, threads)
+        try:
+            yield cap
+        finally:
+            self.release(cap)
+
+    def close(self, video_path=None):
+        """Close idle handles (of one video, or all) and retire the owned ones"""
+        path = os.path.abspath(video_path) if video_path else None
+        with self._lock:
+            caps = [cap for k, cap in self._idle if path is None or k[0] == path]
+            self._idle = [(k, cap) for k, cap in self._idle if not (path is None or k[0] == path)]
+            self._discard.update(i for i, k in self._owned.items() if path is None or k[0] == path)
+        for cap in caps:
+            cap.release()
+        if caps:
+            logger.debug(f"Closed {len(caps)} idle capture handle(s)")
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                opened=self.opened, reused=self.reused, owned=len(self._owned),
+                idle=len(self._idle)
+            )
@@ -0,0 +1,204 @@
+import io, time, threading
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+from .stage_stats import STAGE_STATS
+
+DEFAULT_FORMAT = "jpeg"
+
+JPEG_SUBSAMPLING = {
+    "444": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444,
+    "422": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422,
+    "420": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+}
+
+
+class ImageEncoder(ABC):
+    """Encodes BGR frames to bytes and tracks its own encode throughput"""
+
+    name = None
+    ext = None
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _encode(self, frame):
+        ...
+
+    def encode(self, frame):
+        t0 = time.perf_counter()
+        data = self._encode(frame)
+        elapsed = time.perf_counter() - t0
+        STAGE_STATS.record("encode", elapsed, len(data))
+        with self._lock:
+            self.frames += 1
+            self.bytes_in += frame.nbytes
+            self.bytes_out += len(data)
+            self.seconds += elapsed
+        return data
+
+    def write(self, path, frame):
+        data = self.encode(frame)
+        with open(path, "wb") as f:
+            f.write(data)
+        return True
+
+    def params(self):
+        return {}
+
+    def spec(self):
+        params = ",".join(f"{k}={v}" for k, v in self.params().items())
+        return f"{self.name}:{params}" if params else self.name
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                encoder=self.spec(), frames=self.frames, bytes_out=self.bytes_out,
+                seconds=round(self.seconds, 4),
+                fps=round(self.frames / self.seconds, 2) if self.seconds else 0.0,
+                mb_per_s=round(self.bytes_in / self.seconds / 1e6, 2) if self.seconds else 0.0,
+                ratio=round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else 0.0,
+            )
+
+    def merge_stats(self, stats):
+        # Fold counters of a copy that ran in another process
+        with self._lock:
+            self.frames += stats["frames"]
+            self.bytes_in += stats["bytes_in"]
+            self.bytes_out += stats["bytes_out"]
+            self.seconds += stats["seconds"]
+
+    def raw_stats(self):
+        with self._lock:
+            return dict(frames=self.frames, bytes_in=self.bytes_in, bytes_out=self.bytes_out, seconds=self.seconds)
+
+    def __getstate__(self):
+        # Picklable for process pools: fresh counters and lock on the other side
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state.update(frames=0, bytes_in=0, bytes_out=0, seconds=0.0)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class CV2Encoder(ImageEncoder):
+    def _imwrite_params(self):
+        return []
+
+    def _encode(self, frame):
+        ok, buf = cv2.imencode(self.ext, frame, self._imwrite_params())
+        if not ok:
+            raise ValueError(f"{self.name} encoding failed")
+        return buf.data
+
+
+class JpegEncoder(CV2Encoder):
+    name = "jpeg"
+    ext = ".jpg"
+
+    def __init__(self, quality=95, subsampling="420"):
+        super().__init__()
+        if not 0 <= int(quality) <= 100:
+            raise ValueError("JPEG quality must be 0-100")
+        if str(subsampling) not in JPEG_SUBSAMPLING:
+            raise ValueError(f"JPEG subsampling must be one of {', '.join(JPEG_SUBSAMPLING)}")
+        self.quality = int(quality)
+        self.subsampling = str(subsampling)
+
+    def params(self):
+        return dict(quality=self.quality, subsampling=self.subsampling)
+
+    def _imwrite_params(self):
+        return [
+            cv2.IMWRITE_JPEG_QUALITY, self.quality,
+            cv2.IMWRITE_JPEG_SAMPLING_FACTOR, JPEG_SUBSAMPLING[self.subsampling],
+        ]
+
+
+class PngEncoder(CV2Encoder):
+    name = "png"
+    ext = ".png"
+
+    def __init__(self, level=3):
+        super().__init__()
+        if not 0 <= int(level) <= 9:
+            raise ValueError("PNG compression level must be 0-9")
+        self.level = int(level)
+
+    def params(self):
+        return dict(level=self.level)
+
+    def _imwrite_params(self):
+        return [cv2.IMWRITE_PNG_COMPRESSION, self.level]
+
+
+class WebpEncoder(CV2Encoder):
+    name = "webp"
+    ext = ".webp"
+
+    def __init__(self, quality=90):
+        super().__init__()
+        # Quality above 100 selects lossless WebP
+        if not 1 <= int(quality) <= 101:
+            raise ValueError("WebP quality must be 1-100 (101: lossless)")
+        self.quality = int(quality)
+
+    def params(self):
+        return dict(quality=self.quality)
+
+    def _imwrite_params(self):
+        return [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+
+
+class TiffEncoder(CV2Encoder):
+    name = "tiff"
+    ext = ".tiff"
+
+
+class BmpEncoder(CV2Encoder):
+    name = "bmp"
+    ext = ".bmp"
+
+
+class NpyEncoder(ImageEncoder):
+    # Uncompressed numpy array, loads with np.load at zero decode cost
+    name = "npy"
+    ext = ".npy"
+
+    def _encode(self, frame):
+        out = io.BytesIO()
+        np.save(out, np.ascontiguousarray(frame), allow_pickle=False)
+        return out.getbuffer()
+
+
+ENCODERS = {cls.name: cls for cls in (JpegEncoder, PngEncoder, WebpEncoder, TiffEncoder, BmpEncoder, NpyEncoder)}
+LOSSLESS_FORMATS = ("png", "tiff", "bmp", "npy")
+
+
+def make_encoder(fmt=None, **params):
+    fmt = (fmt or DEFAULT_FORMAT).lower()
+    fmt = {"jpg": "jpeg", "tif": "tiff"}.get(fmt, fmt)
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown image format '{fmt}' (available: {', '.join(ENCODERS)})")
+    try:
+        return ENCODERS[fmt](**params)
+    except TypeError:
+        raise ValueError(f"Invalid parameters for '{fmt}': {params}")
+
+
+def encoder_from_spec(spec):
+    """'jpeg:quality=90,subsampling=444' -> JpegEncoder(quality=90, subsampling='444')"""
+    fmt, _, param_str = (spec or DEFAULT_FORMAT).partition(":")
+    params = {}
+    for item in filter(None, param_str.split(",")):
+        key, _, value = item.partition("=")
+        params[key.strip()] = value.strip()
+    return make_encoder(fmt, **params)
@@ -0,0 +1,133 @@
+from loguru import logger
+from .video_index import seek
+
+# Extraction strategies
+STRATEGY_READ = "read"  # decode + convert every frame (step of 1)
+STRATEGY_GRAB = "grab"  # grab (decode only) skipped frames, retrieve kept ones
+STRATEGY_SEEK = "seek"  # seek straight to every kept frame
+STRATEGY_PLAN = "plan"  # arbitrary frame list: per group seek or decode on
+
+# Typical keyframe interval of encoders (x264/x265 keyint default)
+DEFAULT_GOP_SIZE = 250
+# Seek once the step spans this many GOPs, decoding a whole GOP
+# sequentially costs more than one seek + partial GOP decode
+SEEK_GOP_RATIO = 2
+
+
+def choose_strategy(frame_step, gop_size=None, seek_ratio=SEEK_GOP_RATIO):
+    gop_size = gop_size or DEFAULT_GOP_SIZE
+    if frame_step <= 1:
+        return STRATEGY_READ
+    if frame_step >= seek_ratio * gop_size:
+        return STRATEGY_SEEK
+    return STRATEGY_GRAB
+
+
+def plan_access(frames, gop_size=None, index=None, seek_ratio=SEEK_GOP_RATIO):
+    """Group target frames into [(seek, [frame, ...]), ...] for one forward pass
+
+    Targets are sorted and deduplicated. A group starts with a seek when the
+    gap to the previous target spans seek_ratio GOPs (and, with an index, a
+    keyframe lies in between); otherwise decoding continues from there.
+    """
+    gop_size = gop_size or (index.gop_size if index is not None else None) or DEFAULT_GOP_SIZE
+    groups = []
+    prev = None
+    for frame_idx in sorted(set(frames)):
+        if prev is None:
+            do_seek = True
+        else:
+            keyframe = index.keyframe_before(frame_idx) if index is not None else None
+            do_seek = frame_idx - prev >= seek_ratio * gop_size and (keyframe is None or keyframe > prev)
+        if do_seek:
+            groups.append((True, [frame_idx]))
+        else:
+            groups[-1][1].append(frame_idx)
+        prev = frame_idx
+    return groups
+
+
+class ExtractEngine:
+    """Yields (frame_idx, frame) for every kept frame of [start_frame, end_frame]
+
+    With `frames`, yields that list of frames instead (in frame order), following
+    the access plan of plan_access().
+    """
+
+    def __init__(self, cap, start_frame, end_frame, frame_step, gop_size=None, strategy=None, index=None, frames=None):
+        self.cap = cap
+        self.index = index
+        if index is not None:
+            gop_size = gop_size or index.gop_size
+            end_frame = min(end_frame, index.frame_count - 1)
+        self.gop_size = gop_size or DEFAULT_GOP_SIZE
+        if frames is not None:
+            targets = [f for f in frames if 0 <= f <= end_frame]
+            self.plan = plan_access(targets, self.gop_size, index)
+            targets = [f for _, group in self.plan for f in group]
+            start_frame, end_frame = (targets[0], targets[-1]) if targets else (0, -1)
+            strategy = STRATEGY_PLAN
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.frame_step = max(1, frame_step)
+        self.strategy = strategy or choose_strategy(self.frame_step, self.gop_size)
+        if self.strategy == STRATEGY_PLAN:
+            self.total_frames = len(targets)
+            logger.debug(
+                f"Extract strategy: '{self.strategy}' "
+                f"({self.total_frames} frames in {len(self.plan)} groups, gop={self.gop_size})"
+            )
+            return
+        self.total_frames = 1 + (self.end_frame - self.start_frame) // self.frame_step
+        logger.debug(
+            f"Extract strategy: '{self.strategy}' "
+            f"(step={self.frame_step}, gop={self.gop_size}, frames={self.total_frames})"
+        )
+
+    def frames(self):
+        if self.strategy == STRATEGY_PLAN:
+            yield from self._plan_frames()
+        elif self.strategy == STRATEGY_SEEK:
+            yield from self._seek_frames()
+        else:
+            yield from self._sequential_frames()
+
+    def _plan_frames(self):
+        position = None # frame the next grab/read returns
+        for do_seek, group in self.plan:
+            if do_seek:
+                seek(self.cap, group[0], self.index)
+                position = group[0]
+            for frame_idx in group:
+                while position < frame_idx:
+                    # Between targets: decode only, no retrieve/BGR conversion
+                    if not self.cap.grab():
+                        return
+                    position += 1
+                ret, frame = self.cap.read()
+                if not ret:
+                    return
+                position += 1
+                yield frame_idx, frame
+
+    def _sequential_frames(self):
+        seek(self.cap, self.start_frame, self.index)
+        current_frame = self.start_frame
+        while current_frame <= self.end_frame:
+            if (current_frame - self.start_frame) % self.frame_step == 0:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                yield current_frame, frame
+            elif not self.cap.grab():
+                # Skipped frame: decode only, no retrieve/BGR conversion
+                break
+            current_frame += 1
+
+    def _seek_frames(self):
+        for frame_idx in range(self.start_frame, self.end_frame + 1, self.frame_step):
+            seek(self.cap, frame_idx, self.index)
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            yield frame_idx, frame
@@ -0,0 +1,202 @@
+import os, itertools
+from loguru import logger
+from .capture_pool import CapturePool
+from .extract_engine import ExtractEngine
+from .frame_writer import FrameWriter
+from .parallel_extract import ParallelExtractor
+from .encoders import make_encoder
+from .frame_sinks import create_memmap, finish_memmap, sink_verifier, write_index
+from .job_manifest import JobManifest, manifest_path
+from .frame_variants import VariantWriter, variant_dir
+from .stage_stats import STAGE_STATS, stats_path
+
+
+def run_extraction(
+    video_path, output_dir, start_frame, end_frame, frame_step, roi=None,
+    gop_size=None, index=None, workers=1,
+    progress_cb=None, strategy_cb=None, should_stop=None, encode_workers=None,
+    backend=None, threads=0, encoder=None, sink=None, resume=True, frame_filter=None,
+    frames=None, variants=None, cap_pool=None
+):
+    """Extract one frame range of a video; returns the number of frames done
+
+    Qt-free entry point shared by the batch job queue (JobScheduler) and the headless CLI.
+    Completed frames are checkpointed to a job manifest in output_dir; with
+    resume, a rerun of the same job only extracts frames not verified there.
+    frame_filter (core.frame_filter.DuplicateFilter) drops near-duplicate
+    frames before encoding; they count as done, its stats() report them.
+    With `frames` (frame indices), that list is extracted instead of the
+    range in one pass over the file (see extract_engine.plan_access).
+    With `variants` (core.frame_variants.OutputVariant), every decoded frame
+    is written once per variant, to output_dir/<variant name>.
+    With stage stats enabled (core.stage_stats), the stage timings of the job
+    are dumped to {video}_stats.json in output_dir when it ends.
+    cap_pool (core.capture_pool.CapturePool) lends the capture handles of the
+    sequential path; without one they are opened and closed here.
+    """
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    frame_step = max(1, frame_step)
+    stats_before = STAGE_STATS.raw() if STAGE_STATS.enabled else None
+    if frames is not None:
+        frames = sorted({f for f in frames if f >= 0 and (index is None or f < index.frame_count)})
+        if not frames:
+            raise ValueError("no frames to extract")
+        start_frame, end_frame, frame_step = frames[0], frames[-1], 1
+        if workers > 1:
+            logger.warning("Frame lists are extracted in a single pass, ignoring workers")
+            workers = 1
+    if index is not None:
+        end_frame = min(end_frame, index.frame_count - 1)
+    total_frames = len(frames) if frames is not None else 1 + (end_frame - start_frame) // frame_step
+    encoder = encoder or make_encoder()
+    cap_pool = cap_pool or CapturePool(max_idle=0)
+    if variants and roi:
+        raise ValueError("a job ROI cannot be combined with output variants, give the variants ROIs instead")
+    # Output directories: one per variant, all checked when resuming
+    out_dirs = [variant_dir(output_dir, v) for v in variants] if variants else [output_dir]
+    if frame_filter is not None:
+        if sink == "memmap":
+            raise ValueError("the duplicate filter cannot be used with memmap output (rows are preallocated)")
+        frame_filter.reset()
+
+    os.makedirs(output_dir, exist_ok=True)
+    params = JobManifest.job_params(
+        video_path, start_frame, end_frame, frame_step, roi, encoder, sink, frame_filter, frames, variants
+    )
+    if resume:
+        manifest = JobManifest.load_or_create(output_dir, video_path, params)
+    else:
+        manifest = JobManifest(manifest_path(output_dir, video_path), params)
+    done_before = 0
+    if manifest.completed:
+        verifiers = [sink_verifier(sink, d, video_path, encoder.ext) for d in out_dirs]
+        done_before = manifest.verify(lambda i: all(exists(i) for exists in verifiers))
+    if frames is not None:
+        pending = manifest.pending(frames)
+        ranges = [(pending[0], pending[-1])] if pending else []
+    else:
+        ranges = manifest.remaining(start_frame, end_frame)
+    resuming = done_before > 0
+    if resuming:
+        logger.info(f"Resuming '{video_name}': {done_before}/{total_frames} frames already extracted")
+    if sink == "memmap" and not resuming:
+        prepare_memmap(
+            video_path, output_dir, start_frame, end_frame, frame_step, roi, index, backend, frames, variants, cap_pool
+        )
+
+    def on_progress(count, total):
+        if progress_cb:
+            progress_cb(done_before + count, total_frames)
+
+    written = 0
+    if not ranges:
+        if strategy_cb:
+            strategy_cb("already complete")
+        on_progress(0, 0)
+    elif workers > 1:
+        extractor = ParallelExtractor(
+            video_path, output_dir, start_frame, end_frame, frame_step, roi, workers,
+            index, backend, threads, encoder, sink, ranges=ranges, merge_index=resuming,
+            frame_filter=frame_filter, variants=variants
+        )
+        if strategy_cb:
+            strategy_cb(f"{len(extractor.segments)} segments x {workers} processes")
+        try:
+            written = extractor.run(
+                on_progress, should_stop=should_stop, on_frames=manifest.add, on_skipped=manifest.skip
+            )
+        except Exception:
+            # Failed segments: keep what the others completed for a resume
+            manifest.checkpoint(force=True)
+            raise
+        written += extractor.skipped
+    else:
+        with cap_pool.lease(video_path, backend, threads) as cap:
+            if frames is not None:
+                engines = [ExtractEngine(cap, start_frame, end_frame, 1, gop_size, index=index, frames=pending)]
+            else:
+                engines = [ExtractEngine(cap, first, last, frame_step, gop_size, index=index) for first, last in ranges]
+            if strategy_cb:
+                strategy_cb(engines[0].strategy)
+            frame_iter = itertools.chain.from_iterable(engine.frames() for engine in engines)
+            last_count = 0
+            skipped = 0
+
+            def on_written(frame_idx, count, ok):
+                nonlocal last_count
+                if ok:
+                    manifest.add(frame_idx)
+                last_count = count
+                on_progress(count + skipped, total_frames)
+
+            if cap.isOpened():
+                # Encode/write runs on writer threads while this thread decodes;
+                # a resumed run writes packed outputs as a new part
+                writer_args = dict(
+                    workers=encode_workers, encoder=encoder, sink=sink,
+                    part=ranges[0][0] if resuming else None, on_written=on_written
+                )
+                if variants:
+                    writer = VariantWriter(output_dir, video_path, variants, **writer_args)
+                else:
+                    writer = FrameWriter(output_dir, video_path, **writer_args)
+                with writer:
+                    for current_frame, frame in frame_iter:
+                        if should_stop and should_stop():
+                            break
+                        if roi:
+                            t0 = STAGE_STATS.start()
+                            x1, y1, x2, y2 = roi
+                            frame = frame[y1:y2, x1:x2]
+                            STAGE_STATS.add("crop", t0)
+                        if frame_filter is not None and not frame_filter.keep(frame):
+                            # Near-duplicate of the last kept frame: no encode, no write
+                            skipped += 1
+                            manifest.skip(current_frame)
+                            on_progress(last_count + skipped, total_frames)
+                            continue
+                        writer.submit(current_frame, frame)
+                written = writer.written + skipped
+                indexes = writer.indexes if variants else {output_dir: writer.index}
+                for out_dir, entries in indexes.items():
+                    if resuming and entries:
+                        write_index(out_dir, video_name, writer.sink.kind, encoder.ext, entries, merge=True)
+
+    manifest.checkpoint(force=True)
+    if sink == "memmap":
+        for out_dir in out_dirs:
+            finish_memmap(out_dir, video_name, done_before + written)
+    if stats_before is not None:
+        # Process-wide counters: concurrent jobs share them
+        STAGE_STATS.dump(
+            stats_path(output_dir, video_path), STAGE_STATS.diff(stats_before),
+            video=video_path, frames=written, total_frames=total_frames
+        )
+    return done_before + written
+
+
+def prepare_memmap(
+    video_path, output_dir, start_frame, end_frame, frame_step, roi=None, index=None, backend=None, frames=None,
+    variants=None, cap_pool=None
+):
+    # Preallocate the (N, H, W, C) array of the kept frames (one per variant), writers then fill its rows
+    with (cap_pool or CapturePool(max_idle=0)).lease(video_path, backend) as cap:
+        fps, width, height = cap.fps, cap.width, cap.height
+    if index is not None:
+        end_frame = min(end_frame, index.frame_count - 1)
+    if frames is None:
+        frames = range(start_frame, end_frame + 1, max(1, frame_step))
+    timestamps = [index.time_of(i) if index else (i / fps if fps else 0.0) for i in frames]
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    # Rows are sized from the ROI: one outside the frame would only fail on the first write
+    if variants:
+        for v in variants:
+            v.validate(width, height)
+        outputs = [(variant_dir(output_dir, v), v.output_size(width, height)) for v in variants]
+    else:
+        x1, y1, x2, y2 = roi if roi else (0, 0, width, height)
+        if not (0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height):
+            raise ValueError(f"ROI {roi} is outside the {width}x{height} frame")
+        outputs = [(output_dir, (x2 - x1, y2 - y1))]
+    for out_dir, (w, h) in outputs:
+        create_memmap(out_dir, video_name, frames, timestamps, (h, w, 3))
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class FrameCache:
+    """Thread-safe LRU cache of decoded frames keyed by (video, frame_idx), bounded in bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video, frame_idx):
+        key = (video, frame_idx)
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._frames
+
+    def put(self, video, frame_idx, frame):
+        if frame.nbytes > self.max_bytes:
+            return
+        key = (video, frame_idx)
+        with self._lock:
+            old = self._frames.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._frames[key] = frame
+            self.nbytes += frame.nbytes
+            # Evict least recently used frames until within budget
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._frames.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self, video=None):
+        with self._lock:
+            if video is None:
+                self._frames.clear()
+                self.nbytes = 0
+                return
+            for key in [k for k in self._frames if k[0] == video]:
+                self.nbytes -= self._frames.pop(key).nbytes
+
+    def __len__(self):
+        return len(self._frames)
+
+    def stats(self):
+        return dict(frames=len(self), bytes=self.nbytes, max_bytes=self.max_bytes, hits=self.hits, misses=self.misses)
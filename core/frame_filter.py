@@ -0,0 +1,96 @@
+import cv2
+import numpy as np
+
+# Signature methods and their default thresholds
+DEFAULT_THRESHOLDS = {
+    "dhash": 4,      # differing bits of a 64-bit difference hash
+    "pixel": 0.02,   # mean absolute difference of a 32x32 grayscale copy (0-1)
+    "hist": 0.05,    # Bhattacharyya distance of 64-bin grayscale histograms (0-1)
+}
+DEFAULT_METHOD = "dhash"
+
+
+class DuplicateFilter:
+    """Drops frames nearly identical to the last kept one
+
+    Frames are compared through a signature of a small grayscale copy, so the
+    cost per candidate is one cv2.resize and a few vectorized operations.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, threshold=None):
+        if method not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown duplicate filter '{method}' (available: {', '.join(DEFAULT_THRESHOLDS)})")
+        self.method = method
+        self.threshold = float(DEFAULT_THRESHOLDS[method] if threshold is None else threshold)
+        if self.threshold < 0:
+            raise ValueError("Duplicate filter threshold must be >= 0")
+        self.checked = 0
+        self.skipped = 0
+        self._last = None
+
+    def spec(self):
+        return f"{self.method}:{self.threshold:g}"
+
+    def _gray(self, frame, size):
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def signature(self, frame):
+        if self.method == "dhash":
+            gray = self._gray(frame, (9, 8))
+            return np.packbits(gray[:, 1:] > gray[:, :-1])
+        if self.method == "pixel":
+            # Kept as uint8: the parallel path ships one signature per frame between processes
+            return self._gray(frame, (32, 32))
+        hist = cv2.calcHist([self._gray(frame, (64, 64))], [0], None, [64], [0, 256])
+        return cv2.normalize(hist, None, norm_type=cv2.NORM_L1)
+
+    def distance(self, a, b):
+        if self.method == "dhash":
+            return int(np.unpackbits(a ^ b).sum())
+        if self.method == "pixel":
+            return float(np.abs(a.astype(np.int16) - b).mean()) / 255.0
+        return float(cv2.compareHist(a, b, cv2.HISTCMP_BHATTACHARYYA))
+
+    def keep(self, frame):
+        return self.keep_signature(self.signature(frame))
+
+    def keep_signature(self, sig):
+        self.checked += 1
+        if self.is_duplicate(sig, self._last):
+            self.skipped += 1
+            return False
+        self._last = sig
+        return True
+
+    def is_duplicate(self, sig, reference):
+        return reference is not None and self.distance(sig, reference) <= self.threshold
+
+    def reset(self):
+        # Next frame is kept unconditionally (new range or segment)
+        self._last = None
+
+    def stats(self):
+        return dict(filter=self.spec(), checked=self.checked, skipped=self.skipped)
+
+    def merge_stats(self, stats):
+        # Fold counters of a copy that ran in another process
+        self.checked += stats["checked"]
+        self.skipped += stats["skipped"]
+
+    def __getstate__(self):
+        # Picklable for process pools: fresh counters and reference on the other side
+        state = self.__dict__.copy()
+        state.update(checked=0, skipped=0, _last=None)
+        return state
+
+
+def filter_from_spec(spec):
+    """'dhash' / 'pixel:0.03' -> DuplicateFilter, None or 'off' -> None"""
+    if not spec or spec == "off":
+        return None
+    method, _, threshold = spec.partition(":")
+    try:
+        return DuplicateFilter(method, float(threshold) if threshold else None)
+    except ValueError as e:
+        raise ValueError(f"Invalid duplicate filter '{spec}': {e}")
@@ -0,0 +1,44 @@
+import os, re, csv
+
+
+def parse_timestamp(text, fps):
+    # HH:MM:SS[.ff] (ff = frame number, as in the GUI) or plain seconds
+    m = re.match(r'^(\d{1,2}):(\d{2}):(\d{2})(?:\.(\d{1,3}))?$', text)
+    if m:
+        h, mi, s, f = m.groups()
+        return int(h)*3600 + int(mi)*60 + int(s) + (int(f or 0) / fps if fps else 0)
+    return float(text)
+
+
+def read_frame_list(spec):
+    """Items of a frame list: a CSV/text file (first column) or a comma/space separated string"""
+    if isinstance(spec, (list, tuple)):
+        return [str(v).strip() for v in spec]
+    if os.path.isfile(spec):
+        with open(spec, "r", newline="", encoding="utf-8") as f:
+            return [row[0].strip() for row in csv.reader(f) if row and row[0].strip()]
+    return [v for v in re.split(r"[,\s]+", spec) if v]
+
+
+def resolve_frames(items, fps, index=None, times=False):
+    """Sorted unique frame indices of frame list items
+
+    Numbers are frame indices (seconds with times=True), HH:MM:SS[.ff] items are
+    timestamps. A first item without digits (CSV header) is ignored.
+    """
+    frames = set()
+    for pos, item in enumerate(items):
+        try:
+            if times or ":" in item:
+                # Small bias: timestamps printed from frame times land on that frame
+                secs = parse_timestamp(item, fps) + 1e-6
+                frames.add(index.frame_at_time(secs) if index else int(secs * fps))
+            else:
+                frames.add(int(item))
+        except ValueError:
+            if pos == 0 and not any(c.isdigit() for c in item):
+                continue
+            raise ValueError(f"Invalid frame list entry '{item}'")
+    if index is not None:
+        frames = {f for f in frames if f < index.frame_count}
+    return sorted(f for f in frames if f >= 0)
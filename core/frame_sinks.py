@@ -0,0 +1,454 @@
+import io, os, glob, json, shutil, tarfile, zipfile
+from abc import ABC, abstractmethod
+import numpy as np
+from loguru import logger
+
+DEFAULT_SINK = "files"
+# Archive writes go through a large buffer: few big sequential writes per file
+WRITE_BUFFER = 8 * 1024 * 1024
+DEFAULT_SHARD_BYTES = 1024 * 1024 * 1024
+# Initial LMDB map, doubled whenever a batch does not fit: some platforms (Windows)
+# allocate the data file at the full map size
+LMDB_MAP_SIZE = 64 * 1024 * 1024
+
+
+def index_path(output_dir, video_name):
+    return os.path.join(output_dir, f"{video_name}_frames.index.json")
+
+
+def write_index(output_dir, video_name, kind, ext, entries, merge=False):
+    """Frame -> [file, offset, size] map of a packed output, file relative to output_dir"""
+    path = index_path(output_dir, video_name)
+    if merge and os.path.exists(path):
+        # Resumed job: keep the entries of earlier runs
+        entries = {**load_index(output_dir, video_name)["frames"], **entries}
+    data = dict(format=kind, ext=ext, frames={str(k): entries[k] for k in sorted(entries)})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    logger.debug(f"Wrote {kind} index of {len(entries)} frames to {path}")
+    return path
+
+
+def load_index(output_dir, video_name):
+    with open(index_path(output_dir, video_name), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["frames"] = {int(k): v for k, v in data["frames"].items()}
+    return data
+
+
+def memmap_paths(output_dir, video_name):
+    base = os.path.join(output_dir, f"{video_name}_frames")
+    return f"{base}.npy", f"{base}.json"
+
+
+def create_memmap(output_dir, video_name, frames, timestamps, shape):
+    """Preallocate the (N, H, W, C) uint8 array of a memmap export and its JSON header"""
+    os.makedirs(output_dir, exist_ok=True)
+    array_path, header_path = memmap_paths(output_dir, video_name)
+    # .npy layout: np.load(path, mmap_mode="r") maps it back without any decoding
+    array = np.lib.format.open_memmap(array_path, mode="w+", dtype=np.uint8, shape=(len(frames), *shape))
+    del array
+    header = dict(
+        format="memmap", file=os.path.basename(array_path), dtype="uint8",
+        shape=[len(frames), *shape], frames=list(frames),
+        timestamps=[round(t, 6) for t in timestamps], complete=False
+    )
+    with open(header_path, "w", encoding="utf-8") as f:
+        json.dump(header, f)
+    logger.debug(f"Allocated {header['shape']} frame array {array_path}")
+    return header
+
+
+def finish_memmap(output_dir, video_name, written):
+    # Rows of frames that were never written (stopped/failed) stay zero
+    header = load_memmap_header(output_dir, video_name)
+    header["complete"] = written == header["shape"][0]
+    header["written"] = written
+    with open(memmap_paths(output_dir, video_name)[1], "w", encoding="utf-8") as f:
+        json.dump(header, f)
+    return header
+
+
+def load_memmap_header(output_dir, video_name):
+    with open(memmap_paths(output_dir, video_name)[1], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_frame_bytes(output_dir, entry):
+    # Encoded bytes of one indexed frame (tar/zip/files); hdf5/lmdb are read with their own libraries
+    name, offset, size = entry
+    with open(os.path.join(output_dir, name), "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+class SequentialFile:
+    """Buffered write-only file without seek(): archives are streamed, never patched in place"""
+
+    def __init__(self, path):
+        self.file = open(path, "wb", buffering=WRITE_BUFFER)
+        self.pos = 0
+
+    def write(self, data):
+        n = self.file.write(data)
+        self.pos += n
+        return n
+
+    def tell(self):
+        return self.pos
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class FrameSink(ABC):
+    """Destination of encoded frames of one extraction
+
+    write(frame_idx, data) is called in frame order unless `ordered` is False;
+    close() returns the frame index ({frame_idx: [file, offset, size]}) or None.
+    `part` names the output of one parallel segment (merged by the caller).
+    """
+
+    kind = None
+    ordered = True
+    raw = False # receives decoded frames instead of encoded bytes
+
+    def __init__(self, output_dir, video_name, ext, part=None):
+        self.output_dir = output_dir
+        self.video_name = video_name
+        self.ext = ext
+        self.part = part
+        self.base = f"{video_name}_frames" if part is None else f"{video_name}_frames_{part:08d}"
+        self.entries = {}
+
+    @classmethod
+    def verifier(cls, output_dir, video_name, ext):
+        """Predicate telling whether a frame of an earlier run is present in this output"""
+        try:
+            data = load_index(output_dir, video_name)
+        except (OSError, ValueError, KeyError):
+            return lambda frame_idx: False
+        frames = data["frames"] if data.get("format") == cls.kind and data.get("ext") == ext else {}
+        return lambda frame_idx: frame_idx in frames
+
+    @classmethod
+    def reader(cls, output_dir, name):
+        """(read(entry) -> bytes, close()) over one file this sink wrote"""
+        f = open(os.path.join(output_dir, name), "rb")
+
+        def read(entry):
+            f.seek(entry[1])
+            return f.read(entry[2])
+        return read, f.close
+
+    def member_name(self, frame_idx):
+        return f"{self.video_name}_frame_{frame_idx}{self.ext}"
+
+    @abstractmethod
+    def write(self, frame_idx, data):
+        ...
+
+    def close(self):
+        return self.entries
+
+
+class FileSink(FrameSink):
+    # One file per frame (written concurrently by the encode threads)
+    kind = "files"
+    ordered = False
+
+    def __init__(self, output_dir, video_name, ext, part=None):
+        super().__init__(output_dir, video_name, ext, part)
+        self.prefix = os.path.join(output_dir, f"{video_name}_frame_")
+
+    def path_for(self, frame_idx):
+        return f"{self.prefix}{frame_idx}{self.ext}"
+
+    @classmethod
+    def verifier(cls, output_dir, video_name, ext):
+        prefix = os.path.join(output_dir, f"{video_name}_frame_")
+
+        def exists(frame_idx):
+            try:
+                return os.path.getsize(f"{prefix}{frame_idx}{ext}") > 0
+            except OSError:
+                return False
+        return exists
+
+    def write(self, frame_idx, data):
+        with open(self.path_for(frame_idx), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        return None
+
+
+class TarSink(FrameSink):
+    # Uncompressed tar shards, a new shard every shard_bytes
+    kind = "tar"
+
+    def __init__(self, output_dir, video_name, ext, part=None, shard_bytes=DEFAULT_SHARD_BYTES):
+        super().__init__(output_dir, video_name, ext, part)
+        self.shard_bytes = shard_bytes
+        self.shard = -1
+        self.tar = None
+        self.file = None
+
+    def _next_shard(self):
+        self._close_shard()
+        self.shard += 1
+        self.name = f"{self.base}_{self.shard:04d}.tar"
+        self.file = SequentialFile(os.path.join(self.output_dir, self.name))
+        self.tar = tarfile.open(fileobj=self.file, mode="w", format=tarfile.GNU_FORMAT)
+
+    def _close_shard(self):
+        if self.tar is not None:
+            self.tar.close()
+            self.file.close()
+            self.tar = self.file = None
+
+    def write(self, frame_idx, data):
+        if self.tar is None or self.tar.offset >= self.shard_bytes:
+            self._next_shard()
+        info = tarfile.TarInfo(self.member_name(frame_idx))
+        info.size = len(data)
+        self.tar.addfile(info, io.BytesIO(data))
+        # Data ends the member, padded to whole tar blocks
+        padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        self.entries[frame_idx] = [self.name, self.tar.offset - padded, info.size]
+        # Members are only needed for reading, don't keep one TarInfo per frame
+        self.tar.members.clear()
+
+    def close(self):
+        self._close_shard()
+        return self.entries
+
+
+class ZipSink(FrameSink):
+    # Stored (uncompressed) zip: frames are already compressed images
+    kind = "zip"
+
+    def __init__(self, output_dir, video_name, ext, part=None):
+        super().__init__(output_dir, video_name, ext, part)
+        self.name = f"{self.base}.zip"
+        # Unseekable output: entries get data descriptors instead of rewritten headers
+        self.file = SequentialFile(os.path.join(output_dir, self.name))
+        self.zip = zipfile.ZipFile(self.file, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+
+    def write(self, frame_idx, data):
+        info = zipfile.ZipInfo(self.member_name(frame_idx))
+        self.zip.writestr(info, bytes(data))
+        # Data follows the 30-byte local header, the name and the extra field
+        offset = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra)
+        self.entries[frame_idx] = [self.name, offset, info.file_size]
+
+    def close(self):
+        self.zip.close()
+        self.file.close()
+        return self.entries
+
+
+class Hdf5Sink(FrameSink):
+    # Encoded frames concatenated in one uint8 dataset, plus an (N, 3) index dataset
+    kind = "hdf5"
+
+    def __init__(self, output_dir, video_name, ext, part=None):
+        import h5py
+        super().__init__(output_dir, video_name, ext, part)
+        self.name = f"{self.base}.h5"
+        self.h5 = h5py.File(os.path.join(output_dir, self.name), "w")
+        self.data = self.h5.create_dataset("frames", shape=(0,), maxshape=(None,), dtype="uint8", chunks=(1024 * 1024,))
+        self.data.attrs["ext"] = ext
+        self.pending = bytearray()
+        self.size = 0
+
+    @classmethod
+    def reader(cls, output_dir, name):
+        import h5py
+        h5 = h5py.File(os.path.join(output_dir, name), "r")
+        frames = h5["frames"]
+        return lambda entry: frames[entry[1]:entry[1] + entry[2]].tobytes(), h5.close
+
+    def write(self, frame_idx, data):
+        self.entries[frame_idx] = [self.name, self.size + len(self.pending), len(data)]
+        self.pending += data
+        if len(self.pending) >= WRITE_BUFFER:
+            self._flush()
+
+    def _flush(self):
+        if self.pending:
+            self.data.resize((self.size + len(self.pending),))
+            self.data[self.size:] = np.frombuffer(self.pending, dtype="uint8")
+            self.size += len(self.pending)
+            self.pending = bytearray()
+
+    def close(self):
+        self._flush()
+        rows = [(idx, offset, size) for idx, (_, offset, size) in sorted(self.entries.items())]
+        self.h5.create_dataset("index", data=np.asarray(rows, dtype="int64").reshape(-1, 3))
+        self.h5.close()
+        return self.entries
+
+
+class LmdbSink(FrameSink):
+    # Frames keyed by zero-padded frame number, committed in batches
+    kind = "lmdb"
+
+    def __init__(self, output_dir, video_name, ext, part=None, map_size=LMDB_MAP_SIZE):
+        import lmdb
+        super().__init__(output_dir, video_name, ext, part)
+        self.name = f"{self.base}.lmdb"
+        self.env = lmdb.open(os.path.join(output_dir, self.name), map_size=map_size)
+        self.batch = []
+        self.pending = 0
+
+    @classmethod
+    def reader(cls, output_dir, name):
+        import lmdb
+        env = lmdb.open(os.path.join(output_dir, name), readonly=True, lock=False)
+        txn = env.begin()
+
+        def close():
+            txn.abort()
+            env.close()
+        return lambda entry: txn.get(entry[1].encode()), close
+
+    def key(self, frame_idx):
+        return f"{frame_idx:010d}".encode()
+
+    def write(self, frame_idx, data):
+        self.batch.append((self.key(frame_idx), bytes(data)))
+        # LMDB is keyed: the index records the key in place of a byte offset
+        self.entries[frame_idx] = [self.name, self.key(frame_idx).decode(), len(data)]
+        self.pending += len(data)
+        if self.pending >= WRITE_BUFFER:
+            self._commit()
+
+    def _commit(self):
+        import lmdb
+        while True:
+            try:
+                with self.env.begin(write=True) as txn:
+                    for key, data in self.batch:
+                        txn.put(key, data)
+                break
+            except lmdb.MapFullError:
+                # The batch was aborted: retry it in a map twice the size
+                self.env.set_mapsize(2 * self.env.info()["map_size"])
+        self.batch = []
+        self.pending = 0
+
+    def close(self):
+        self._commit()
+        self.env.close()
+        return self.entries
+
+
+class MemmapSink(FrameSink):
+    # Raw frames into the rows of an array preallocated by create_memmap();
+    # rows are independent, so threads and segment processes write concurrently
+    kind = "memmap"
+    ordered = False
+    raw = True
+
+    def __init__(self, output_dir, video_name, ext, part=None):
+        super().__init__(output_dir, video_name, ext, part)
+        header = load_memmap_header(output_dir, video_name)
+        self.rows = {frame_idx: row for row, frame_idx in enumerate(header["frames"])}
+        self.array = np.load(os.path.join(output_dir, header["file"]), mmap_mode="r+")
+
+    @classmethod
+    def verifier(cls, output_dir, video_name, ext):
+        # Rows are written in place: trust the manifest while the array is there
+        array_path, header_path = memmap_paths(output_dir, video_name)
+        present = os.path.exists(array_path) and os.path.exists(header_path)
+        return lambda frame_idx: present
+
+    def write(self, frame_idx, frame):
+        if frame.shape != self.array.shape[1:]:
+            raise ValueError(f"frame shape {frame.shape} does not match array rows {self.array.shape[1:]}")
+        self.array[self.rows[frame_idx]] = frame
+
+    def close(self):
+        self.array.flush()
+        del self.array
+        return None
+
+
+SINKS = {cls.kind: cls for cls in (FileSink, TarSink, ZipSink, Hdf5Sink, LmdbSink, MemmapSink)}
+# Optional modules needed by some sinks
+SINK_MODULES = {"hdf5": "h5py", "lmdb": "lmdb"}
+
+
+def merge_parts(output_dir, video_path, kind, ext, entries, parts, part=None):
+    """Copy frames of per-segment parts into one container, then delete the parts
+
+    entries index the frames to keep across the parts; parts are the `part`
+    numbers the segments wrote. Returns the index entries of the container.
+    """
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    cls = SINKS[kind]
+    # Built aside: a resumed run's container may carry the name of a part
+    merge_dir = os.path.join(output_dir, f".{video_name}_merge")
+    os.makedirs(merge_dir, exist_ok=True)
+    last_of = {entry[0]: frame_idx for frame_idx, entry in sorted(entries.items())}
+    readers = {}
+    sink = cls(merge_dir, video_name, ext, part)
+    try:
+        for frame_idx, entry in sorted(entries.items()):
+            name = entry[0]
+            if name not in readers:
+                readers[name] = cls.reader(output_dir, name)
+            sink.write(frame_idx, readers[name][0](entry))
+            if last_of[name] == frame_idx:
+                readers.pop(name)[1]()
+    finally:
+        merged = sink.close()
+        for _, close in readers.values():
+            close()
+    for p in parts:
+        base = f"{video_name}_frames_{p:08d}"
+        for path in glob.glob(os.path.join(glob.escape(output_dir), glob.escape(base) + "[._]*")):
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+    for name in os.listdir(merge_dir):
+        target = os.path.join(output_dir, name)
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        os.replace(os.path.join(merge_dir, name), target)
+    os.rmdir(merge_dir)
+    logger.debug(f"Merged {len(entries)} frames of {len(parts)} parts into {kind} output '{output_dir}'")
+    return merged
+
+
+def available_sinks():
+    sinks = []
+    for kind in SINKS:
+        try:
+            if kind in SINK_MODULES:
+                __import__(SINK_MODULES[kind])
+            sinks.append(kind)
+        except ImportError:
+            pass
+    return sinks
+
+
+def sink_verifier(kind, output_dir, video_path, ext):
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    return SINKS[kind or DEFAULT_SINK].verifier(output_dir, video_name, ext)
+
+
+def open_sink(kind, output_dir, video_path, ext, part=None):
+    kind = kind or DEFAULT_SINK
+    if kind not in SINKS:
+        raise ValueError(f"Unknown output sink '{kind}' (available: {', '.join(SINKS)})")
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    try:
+        return SINKS[kind](output_dir, video_name, ext, part)
+    except ImportError:
+        raise ValueError(f"Output sink '{kind}' requires the '{SINK_MODULES[kind]}' package")
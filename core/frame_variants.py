@@ -0,0 +1,162 @@
+import os, re, threading
+import cv2
+from .encoders import make_encoder
+from .frame_writer import FrameWriter
+
+_VARIANT_RE = re.compile(
+    r"^(?P<name>[A-Za-z0-9_-]+)"
+    r"(?:=(?P<roi>\d+,\d+,\d+,\d+))?"
+    r"(?:@(?:(?P<w>\d+)x(?P<h>\d+)|(?P<scale>\d*\.?\d+)))?$"
+)
+
+
+class OutputVariant:
+    """One named output of a batch job: optional crop ROI, then optional resize
+
+    size is (width, height), a 0 side keeps the aspect ratio; scale multiplies
+    the (cropped) frame size instead.
+    """
+
+    def __init__(self, name, roi=None, size=None, scale=None):
+        self.name = name
+        self.roi = tuple(roi) if roi else None
+        self.size = tuple(size) if size else None
+        self.scale = scale
+        if self.size and not any(self.size):
+            raise ValueError(f"Variant '{name}': size needs a width or a height")
+        if scale is not None and scale <= 0:
+            raise ValueError(f"Variant '{name}': scale must be > 0")
+
+    def spec(self):
+        text = self.name
+        if self.roi:
+            text += "=" + ",".join(map(str, self.roi))
+        if self.size:
+            text += "@{}x{}".format(*self.size)
+        elif self.scale is not None:
+            text += f"@{self.scale:g}"
+        return text
+
+    def validate(self, width, height):
+        if self.roi:
+            x1, y1, x2, y2 = self.roi
+            if not (0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height):
+                raise ValueError(f"Variant '{self.name}': ROI {self.roi} is outside the {width}x{height} frame")
+
+    def output_size(self, width, height):
+        # (width, height) of the output for a width x height source frame
+        if self.roi:
+            x1, y1, x2, y2 = self.roi
+            width, height = x2 - x1, y2 - y1
+        if self.size:
+            w, h = self.size
+            return (w or max(1, round(width * h / height)), h or max(1, round(height * w / width)))
+        if self.scale is not None:
+            return max(1, round(width * self.scale)), max(1, round(height * self.scale))
+        return width, height
+
+    def apply(self, frame):
+        if self.roi:
+            x1, y1, x2, y2 = self.roi
+            frame = frame[y1:y2, x1:x2]
+        if self.size or self.scale is not None:
+            height, width = frame.shape[:2]
+            size = self.output_size(width, height)
+            if size != (width, height):
+                # INTER_AREA for downscaling, no moire on thumbnails
+                shrink = size[0] * size[1] < width * height
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR)
+        return frame
+
+
+def parse_variant(text):
+    """'name[=x1,y1,x2,y2][@WxH|@scale]' -> OutputVariant, e.g. 'face=100,50,300,250@128x128'"""
+    m = _VARIANT_RE.match(text.strip())
+    if not m:
+        raise ValueError(f"Invalid output variant '{text}' (expected name[=x1,y1,x2,y2][@WxH|@scale])")
+    roi = tuple(int(v) for v in m["roi"].split(",")) if m["roi"] else None
+    size = (int(m["w"]), int(m["h"])) if m["w"] else None
+    scale = float(m["scale"]) if m["scale"] else None
+    return OutputVariant(m["name"], roi, size, scale)
+
+
+def parse_variants(specs):
+    """Variants of a list of specs or a ';' separated string, names must be unique"""
+    if isinstance(specs, str):
+        specs = specs.split(";")
+    variants = [parse_variant(s) for s in specs if s.strip()]
+    names = [v.name for v in variants]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate output variant names: {', '.join(duplicates)}")
+    return variants
+
+
+def variant_dir(output_dir, variant):
+    return os.path.join(output_dir, variant.name)
+
+
+class VariantWriter:
+    """Fans every submitted frame out to one FrameWriter per output variant
+
+    Each variant writes to its own subdirectory of output_dir with its own sink;
+    cropping and resizing run on the writer threads. A frame is reported through
+    on_written(frame_idx, written, ok) once all variants have written it.
+    """
+
+    def __init__(
+        self, output_dir, video_path, variants, workers=None, max_pending=None, on_written=None,
+        encoder=None, sink=None, part=None
+    ):
+        self.output_dir = output_dir
+        self.variants = variants
+        self.encoder = encoder or make_encoder()
+        self.on_written = on_written
+        self.written = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        # The encode thread budget is shared by the variants
+        workers = max(1, (workers or min(4, os.cpu_count() or 1)) // len(variants))
+        self.writers = [
+            FrameWriter(
+                variant_dir(output_dir, v), video_path, workers=workers, max_pending=max_pending,
+                on_written=self._on_written, encoder=self.encoder, sink=sink, part=part, transform=v.apply
+            )
+            for v in variants
+        ]
+        self.indexes = {}
+
+    @property
+    def sink(self):
+        return self.writers[0].sink
+
+    def submit(self, frame_idx, frame):
+        for writer in self.writers:
+            writer.submit(frame_idx, frame)
+
+    def _on_written(self, frame_idx, count, ok):
+        # Writers report in submission order, so frames complete in that order too
+        with self._lock:
+            done, all_ok = self._pending.pop(frame_idx, (0, True))
+            done, all_ok = done + 1, all_ok and ok
+            if done < len(self.writers):
+                self._pending[frame_idx] = (done, all_ok)
+                return
+            if all_ok:
+                self.written += 1
+            else:
+                self.failed += 1
+            if self.on_written:
+                self.on_written(frame_idx, self.written, all_ok)
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+        self.indexes = {w.output_dir: w.index for w in self.writers if w.index is not None}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,110 @@
+import os, queue, threading
+from loguru import logger
+from .encoders import make_encoder
+from .frame_sinks import open_sink, write_index
+from .stage_stats import STAGE_STATS
+
+
+class FrameWriter:
+    """Encodes and writes frames on a pool of threads alongside decoding
+
+    submit() blocks while max_pending frames are queued (backpressure), and
+    on_written(frame_idx, written, ok) is called in submission order. Packed sinks
+    (see core.frame_sinks) receive frames in submission order as well; their
+    index is written on close() unless `part` marks one segment of a larger job.
+    transform(frame), if given, runs on the writer threads before encoding.
+    """
+
+    def __init__(
+        self, output_dir, video_path, workers=None, max_pending=None, on_written=None,
+        encoder=None, sink=None, part=None, transform=None
+    ):
+        self.output_dir = output_dir
+        # Output directory and sink are resolved once per job
+        os.makedirs(output_dir, exist_ok=True)
+        self.encoder = encoder or make_encoder()
+        self.sink = open_sink(sink, output_dir, video_path, self.encoder.ext, part)
+        self.index = None
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.on_written = on_written
+        self.transform = transform
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=max_pending or 2 * self.workers)
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        self._report_seq = 0
+        self._done = {}
+        self._threads = [
+            threading.Thread(target=self._work, name=f"FrameWriter-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, frame_idx, frame):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._queue.put((seq, frame_idx, frame))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            seq, frame_idx, frame = item
+            data = None
+            try:
+                if self.transform is not None:
+                    t0 = STAGE_STATS.start()
+                    frame = self.transform(frame)
+                    STAGE_STATS.add("crop", t0)
+                # Encoders release the GIL while encoding
+                data = frame if self.sink.raw else self.encoder.encode(frame)
+                if not self.sink.ordered:
+                    self._write(frame_idx, data)
+                    data = b""
+            except Exception as e:
+                logger.error(f"Failed to write frame {frame_idx}: {e}")
+            self._complete(seq, frame_idx, data)
+
+    def _complete(self, seq, frame_idx, data):
+        with self._lock:
+            self._done[seq] = (frame_idx, data)
+            # Report the contiguous run of completed frames in submission order
+            while self._report_seq in self._done:
+                frame_idx, data = self._done.pop(self._report_seq)
+                self._report_seq += 1
+                ok = data is not None
+                if ok and self.sink.ordered:
+                    try:
+                        self._write(frame_idx, data)
+                    except Exception as e:
+                        logger.error(f"Failed to write frame {frame_idx}: {e}")
+                        ok = False
+                if ok:
+                    self.written += 1
+                else:
+                    self.failed += 1
+                if self.on_written:
+                    self.on_written(frame_idx, self.written, ok)
+
+    def _write(self, frame_idx, data):
+        t0 = STAGE_STATS.start()
+        self.sink.write(frame_idx, data)
+        STAGE_STATS.add("write", t0, data.nbytes if hasattr(data, "nbytes") else len(data))
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        self.index = self.sink.close()
+        if self.index is not None and self.sink.part is None:
+            write_index(self.output_dir, self.sink.video_name, self.sink.kind, self.encoder.ext, self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,81 @@
+import threading
+from collections import deque
+from .video_index import seek
+
+DEFAULT_GOP_BYTES = 512 * 1024 * 1024
+# Longest span decoded in one pass when the GOP is unknown or huge
+DEFAULT_MAX_SPAN = 250
+
+
+class GopRingBuffer:
+    """Ring of decoded spans for backward stepping and reverse playback
+
+    fill() decodes the span ending at a frame in one forward pass: from the
+    start of its GOP (keyframe index) or a fixed window before it, capped so
+    that two spans fit in max_bytes. Steps back within the span are then
+    served without decoding; the oldest spans are evicted beyond max_bytes.
+    Stored frames are never mutated, so they are displayed without copying.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_GOP_BYTES, max_span=DEFAULT_MAX_SPAN):
+        self.max_bytes = max_bytes
+        self.max_span = max_span
+        self.nbytes = 0
+        self.decoded = 0
+        self._spans = deque()
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def get(self, frame_idx):
+        with self._lock:
+            return self._frames.get(frame_idx)
+
+    def __contains__(self, frame_idx):
+        with self._lock:
+            return frame_idx in self._frames
+
+    def span_start(self, frame_idx, frame_bytes, index=None):
+        # First frame of the span ending at frame_idx
+        span = min(self.max_span, max(1, self.max_bytes // max(1, 2 * frame_bytes)))
+        start = max(0, frame_idx - span + 1)
+        keyframe = index.keyframe_before(frame_idx) if index else None
+        return max(start, keyframe) if keyframe is not None else start
+
+    def fill(self, cap, frame_idx, index=None):
+        """Decode the span ending at frame_idx; returns its [(frame_idx, frame)] in order"""
+        start = self.span_start(frame_idx, cap.width * cap.height * 3, index)
+        seek(cap, start, index)
+        frames = []
+        for i in range(start, frame_idx + 1):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append((i, frame))
+        if frames:
+            self.put(frames)
+        return frames
+
+    def put(self, frames):
+        nbytes = sum(frame.nbytes for _, frame in frames)
+        with self._lock:
+            self.decoded += len(frames)
+            self._frames.update(frames)
+            self._spans.append((frames, nbytes))
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes and len(self._spans) > 1:
+                old, old_bytes = self._spans.popleft()
+                self.nbytes -= old_bytes
+                for i, frame in old:
+                    # Overlapping spans: keep the entry of the newer one
+                    if self._frames.get(i) is frame:
+                        del self._frames[i]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._frames.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(spans=len(self._spans), frames=len(self._frames), bytes=self.nbytes, decoded=self.decoded)
@@ -0,0 +1,144 @@
+import os, json, time, bisect, hashlib, threading
+from loguru import logger
+from .video_index import file_key
+
+MANIFEST_VERSION = 1
+# Minimum interval between manifest checkpoints during extraction
+CHECKPOINT_SECONDS = 5.0
+
+
+def manifest_path(output_dir, video_path):
+    return os.path.join(output_dir, f"{os.path.splitext(os.path.basename(video_path))[0]}_job.json")
+
+
+class JobManifest:
+    """Parameters and completed frame ranges of one extraction, checkpointed to JSON
+
+    Ranges are inclusive [first, last] runs on the start_frame + k*step grid.
+    A rerun with the same parameters (and unchanged video) resumes from them.
+    Frames dropped by the duplicate filter are completed without an output,
+    they are also kept in `skipped` so verification does not look for them.
+    """
+
+    def __init__(self, path, params, completed=None, skipped=None):
+        self.path = path
+        self.params = params
+        self.step = params["step"]
+        self.completed = [list(r) for r in completed or []]
+        self.skipped = [list(r) for r in skipped or []]
+        self._lock = threading.Lock()
+        self._saved = 0.0
+
+    @staticmethod
+    def job_params(
+        video_path, start_frame, end_frame, frame_step, roi=None, encoder=None, sink=None,
+        frame_filter=None, frames=None, variants=None
+    ):
+        return dict(
+            video=file_key(video_path), start=start_frame, end=end_frame, step=max(1, frame_step),
+            roi=list(roi) if roi else None, format=encoder.spec() if encoder else None, sink=sink or "files",
+            dedup=frame_filter.spec() if frame_filter else None,
+            # Frame list jobs are identified by a digest of the list
+            frames=hashlib.sha1(",".join(map(str, frames)).encode()).hexdigest() if frames is not None else None,
+            variants=[v.spec() for v in variants] if variants else None,
+        )
+
+    @classmethod
+    def load_or_create(cls, output_dir, video_path, params):
+        path = manifest_path(output_dir, video_path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION and data.get("params") == params:
+                return cls(path, params, data["completed"], data.get("skipped"))
+            logger.info(f"Job parameters changed, not resuming '{path}'")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable job manifest '{path}': {e}")
+        return cls(path, params)
+
+    def _merge(self, ranges):
+        merged = []
+        for first, last in sorted(ranges):
+            if merged and first <= merged[-1][1] + self.step:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        return merged
+
+    def _insert(self, ranges, first, last):
+        # Frames mostly complete in order: extend the last range in place
+        if ranges and ranges[-1][0] <= first <= ranges[-1][1] + self.step:
+            ranges[-1][1] = max(ranges[-1][1], last)
+            return
+        lo = max(0, bisect.bisect_left(ranges, [first, last]) - 1)
+        hi = lo
+        while hi < len(ranges) and ranges[hi][0] <= last + self.step:
+            hi += 1
+        ranges[lo:hi] = self._merge(ranges[lo:hi] + [[first, last]])
+
+    def add(self, first, last=None):
+        with self._lock:
+            self._insert(self.completed, first, first if last is None else last)
+        self.checkpoint()
+
+    def skip(self, frame_idx):
+        with self._lock:
+            self._insert(self.skipped, frame_idx, frame_idx)
+            self._insert(self.completed, frame_idx, frame_idx)
+        self.checkpoint()
+
+    def done_count(self):
+        with self._lock:
+            return sum((last - first) // self.step + 1 for first, last in self.completed)
+
+    def remaining(self, start_frame, end_frame):
+        """Grid ranges of [start_frame, end_frame] not completed yet"""
+        end_frame = start_frame + (end_frame - start_frame) // self.step * self.step
+        ranges, cursor = [], start_frame
+        with self._lock:
+            for first, last in self.completed:
+                if first > cursor:
+                    ranges.append((cursor, min(first - self.step, end_frame)))
+                cursor = max(cursor, last + self.step)
+        if cursor <= end_frame:
+            ranges.append((cursor, end_frame))
+        return [(first, last) for first, last in ranges if first <= last]
+
+    def pending(self, frames):
+        """Frames of a sorted frame list not completed yet"""
+        with self._lock:
+            starts = [first for first, _ in self.completed]
+            pending = []
+            for frame_idx in frames:
+                pos = bisect.bisect_right(starts, frame_idx) - 1
+                if pos < 0 or frame_idx > self.completed[pos][1]:
+                    pending.append(frame_idx)
+            return pending
+
+    def verify(self, exists):
+        # Keep only completed frames whose outputs are still there
+        with self._lock:
+            frames = [i for first, last in self.completed for i in range(first, last + 1, self.step)]
+            skipped = {i for first, last in self.skipped for i in range(first, last + 1, self.step)}
+            kept = [i for i in frames if i in skipped or exists(i)]
+            self.completed = self._merge([i, i] for i in kept)
+        if len(kept) < len(frames):
+            logger.warning(f"{len(frames) - len(kept)} completed frames are missing, re-extracting them")
+        return len(kept)
+
+    def checkpoint(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._saved < CHECKPOINT_SECONDS:
+            return
+        with self._lock:
+            self._saved = now
+            data = dict(version=MANIFEST_VERSION, params=self.params, completed=self.completed, skipped=self.skipped)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to checkpoint job manifest '{self.path}': {e}")
@@ -0,0 +1,212 @@
+import os, heapq, itertools, threading
+from loguru import logger
+from .extract_job import run_extraction
+from .encoders import make_encoder
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class ExtractJob:
+    """One video extraction with its own range, step and ROI settings"""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self, video_path, output_dir, start_frame, end_frame, frame_step=1, roi=None,
+        workers=1, priority=0, index=None, gop_size=None, backend=None, threads=0, encoder=None, sink=None,
+        resume=True, frame_filter=None, frames=None, variants=None
+    ):
+        self.job_id = next(self._ids)
+        self.video_path = video_path
+        self.output_dir = output_dir
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.frame_step = max(1, frame_step)
+        self.roi = roi
+        self.workers = max(1, workers)
+        self.priority = priority # higher runs first
+        self.index = index
+        self.gop_size = gop_size
+        self.backend = backend # decoder backend, see core.video_source
+        self.threads = threads # decoder threads (0: backend default)
+        self.encoder = encoder or make_encoder() # output format, see core.encoders
+        self.sink = sink # output container, see core.frame_sinks (None: one file per frame)
+        self.resume = resume # skip frames completed by an earlier run (see core.job_manifest)
+        self.frame_filter = frame_filter # near-duplicate suppression, see core.frame_filter
+        self.frames = frames # frame list to extract instead of the range
+        self.variants = variants # named crops/resizes written per frame, see core.frame_variants
+        self.state = QUEUED
+        self.strategy = None
+        self.error = None
+        self.done = 0
+        self.total = len(frames) if frames is not None else 1 + (end_frame - start_frame) // self.frame_step
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._scheduler = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def is_active(self):
+        return self.state in (QUEUED, RUNNING)
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._scheduler is not None:
+            # A queued job is finalized at once, wherever it sits in the queue
+            self._scheduler._wake()
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+
+class JobScheduler:
+    """Runs queued ExtractJobs under a global budget of decode and encode workers
+
+    A job holds `workers` decode slots (capped at the budget) and a proportional
+    share of encode threads while it runs. Jobs start strictly by priority,
+    then submission order. With a cap_pool (core.capture_pool), jobs reuse
+    idle capture handles of their video instead of reopening it.
+    """
+
+    def __init__(
+        self, decode_workers=None, encode_workers=None, on_progress=None, on_state=None, on_strategy=None,
+        cap_pool=None
+    ):
+        cpu = os.cpu_count() or 1
+        self.decode_workers = decode_workers or cpu
+        self.encode_workers = encode_workers or cpu
+        self.on_progress = on_progress # on_progress(job)
+        self.on_state = on_state # on_state(job)
+        self.on_strategy = on_strategy # on_strategy(job)
+        self.cap_pool = cap_pool
+        self.jobs = []
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition(threading.RLock())
+        self._decode_free = self.decode_workers
+        self._encode_free = self.encode_workers
+        self._dispatcher = None
+        self._closed = False
+
+    def submit(self, job):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobScheduler is shut down")
+            job._scheduler = self
+            self.jobs.append(job)
+            heapq.heappush(self._heap, (-job.priority, next(self._seq), job))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="JobScheduler", daemon=True)
+                self._dispatcher.start()
+            self._cond.notify_all()
+        logger.debug(f"Job {job.job_id} queued: '{os.path.basename(job.video_path)}' (priority {job.priority})")
+        return job
+
+    def progress(self):
+        # Aggregate (done, total) frames over all non-cancelled jobs
+        jobs = [j for j in self.jobs if j.state != CANCELLED]
+        return sum(j.done for j in jobs), sum(j.total for j in jobs)
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            job.cancel()
+        self._wake()
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait_all(self):
+        for job in list(self.jobs):
+            job.wait()
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            self.cancel_all()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.wait_all()
+
+    def _dispatch(self):
+        with self._cond:
+            while True:
+                # Drop jobs cancelled while queued, not only the one at the head
+                cancelled = [job for _, _, job in self._heap if job.cancelled]
+                if cancelled:
+                    self._heap = [item for item in self._heap if not item[2].cancelled]
+                    heapq.heapify(self._heap)
+                    for job in cancelled:
+                        self._finish(job, CANCELLED)
+                if not self._heap:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    continue
+                job = self._heap[0][2]
+                decode = min(job.workers, self.decode_workers)
+                encode = max(1, self.encode_workers * decode // self.decode_workers)
+                if self._decode_free < decode or self._encode_free < encode:
+                    self._cond.wait()
+                    continue
+                heapq.heappop(self._heap)
+                self._decode_free -= decode
+                self._encode_free -= encode
+                job.state = RUNNING
+                threading.Thread(
+                    target=self._run, args=(job, decode, encode),
+                    name=f"ExtractJob-{job.job_id}", daemon=True
+                ).start()
+                self._notify(self.on_state, job)
+
+    def _run(self, job, decode, encode):
+        def on_progress(count, total):
+            job.done, job.total = count, total
+            self._notify(self.on_progress, job)
+
+        def on_strategy(strategy):
+            job.strategy = strategy
+            self._notify(self.on_strategy, job)
+
+        state = DONE
+        try:
+            run_extraction(
+                job.video_path, job.output_dir, job.start_frame, job.end_frame,
+                job.frame_step, job.roi, job.gop_size, job.index, decode,
+                progress_cb=on_progress, strategy_cb=on_strategy,
+                should_stop=lambda: job.cancelled, encode_workers=encode,
+                backend=job.backend, threads=job.threads, encoder=job.encoder, sink=job.sink,
+                resume=job.resume, frame_filter=job.frame_filter, frames=job.frames,
+                variants=job.variants, cap_pool=self.cap_pool
+            )
+            if job.cancelled:
+                state = CANCELLED
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}")
+            job.error = str(e)
+            state = FAILED
+        with self._cond:
+            self._decode_free += decode
+            self._encode_free += encode
+            self._finish(job, state)
+            self._cond.notify_all()
+
+    def _finish(self, job, state):
+        job.state = state
+        logger.debug(f"Job {job.job_id} {state}: {job.done}/{job.total} frames, encoder {job.encoder.stats()}")
+        self._notify(self.on_state, job)
+        job._finished.set()
+
+    def _notify(self, callback, job):
+        if callback:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Job callback failed: {e}")
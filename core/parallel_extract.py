@@ -0,0 +1,313 @@
+import os, queue, bisect, threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from loguru import logger
+from .encoders import make_encoder
+from .frame_sinks import DEFAULT_SINK, FileSink, merge_parts, write_index
+from .frame_variants import variant_dir
+from .stage_stats import STAGE_STATS
+
+# Segments per worker, more segments balance uneven decode cost
+SEGMENTS_PER_WORKER = 4
+# Frames saved by a segment process between progress reports
+PROGRESS_INTERVAL = 10
+
+_progress_queue = None
+_stop_event = None
+
+
+def split_segments(start_frame, end_frame, frame_step, n_segments, index=None):
+    """Split [start_frame, end_frame] into keyframe-aligned [(first, last), ...]
+
+    Every segment begins on the start_frame + k*frame_step grid, so the union of
+    kept frames equals that of a single sequential pass.
+    """
+    span = end_frame - start_frame + 1
+    n_segments = max(1, min(n_segments, span // max(frame_step, 1)))
+    keyframes = index.keyframes if index else []
+    bounds = [start_frame]
+    for i in range(1, n_segments):
+        cut = start_frame + i * span // n_segments
+        if keyframes:
+            # Snap segment start to the next keyframe: no decode before it is wasted
+            pos = bisect.bisect_left(keyframes, cut)
+            if pos >= len(keyframes):
+                break
+            cut = keyframes[pos]
+        # Round up to the next kept frame
+        cut = start_frame + -(-(cut - start_frame) // frame_step) * frame_step
+        if bounds[-1] < cut <= end_frame:
+            bounds.append(cut)
+    bounds.append(end_frame + 1)
+    return [(a, b - 1) for a, b in zip(bounds, bounds[1:])]
+
+
+def _init_worker(progress_queue, stop_event, stage_stats=False):
+    global _progress_queue, _stop_event
+    _progress_queue = progress_queue
+    _stop_event = stop_event
+    STAGE_STATS.enable(stage_stats)
+
+
+def _extract_segment(
+    video_path, output_dir, first, last, frame_step, roi, index, backend, threads, encoder, sink, frame_filter,
+    variants=None, frames=None
+):
+    from .extract_engine import ExtractEngine
+    from .frame_writer import FrameWriter
+    from .frame_variants import VariantWriter
+    from .video_source import open_source
+    stats_before = STAGE_STATS.raw()
+    lock = threading.Lock() # reports come from the writer thread and this one
+    reported = 0
+    written = 0
+    skipped = 0
+    done_until = None # last frame of the unbroken run of written frames from `first`
+    broken = False
+    decisions = [] if frame_filter is not None else None # (frame_idx, signature, kept) per checked frame
+
+    def report(force=False):
+        nonlocal reported, skipped
+        # Progress items: (frames written, frames skipped as duplicates, segment first, done_until)
+        if force or written - reported + skipped >= PROGRESS_INTERVAL:
+            _progress_queue.put((written - reported, skipped, first, done_until))
+            reported = written
+            skipped = 0
+
+    def on_written(frame_idx, count, ok):
+        nonlocal written, done_until, broken
+        with lock:
+            broken = broken or not ok
+            written = count
+            if not broken:
+                done_until = frame_idx
+            report()
+
+    cap = open_source(video_path, backend, threads)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"failed to open video '{video_path}'")
+        # One writer thread per process overlaps encoding with this segment's decoding,
+        # packed sinks write one part per segment, merged into one container by the parent
+        writer_args = dict(workers=1, on_written=on_written, encoder=encoder, sink=sink, part=first)
+        if variants:
+            writer = VariantWriter(output_dir, video_path, variants, **writer_args)
+        else:
+            writer = FrameWriter(output_dir, video_path, **writer_args)
+        engine = ExtractEngine(cap, first, last, frame_step, index=index, frames=frames)
+        with writer:
+            for current_frame, frame in engine.frames():
+                if _stop_event is not None and _stop_event.is_set():
+                    break
+                if roi:
+                    t0 = STAGE_STATS.start()
+                    x1, y1, x2, y2 = roi
+                    frame = frame[y1:y2, x1:x2]
+                    STAGE_STATS.add("crop", t0)
+                if frame_filter is not None:
+                    # The segment filters from its own first frame, the parent replays
+                    # these decisions from the reference a sequential pass would have
+                    sig = frame_filter.signature(frame)
+                    kept = frame_filter.keep_signature(sig)
+                    decisions.append((current_frame, sig, kept))
+                    if not kept:
+                        with lock:
+                            skipped += 1
+                            report()
+                        continue
+                writer.submit(current_frame, frame)
+    finally:
+        cap.release()
+    with lock:
+        report(force=True)
+    filter_stats = frame_filter.stats() if frame_filter is not None else None
+    indexes = writer.indexes if variants else {output_dir: writer.index}
+    # Stage timings of this segment only, the process may run several
+    return (
+        writer.written, writer.encoder.raw_stats(), indexes, filter_stats, STAGE_STATS.diff(stats_before), decisions
+    )
+
+
+class ParallelExtractor:
+    """Runs keyframe-aligned segments of one extraction in a process pool"""
+
+    def __init__(
+        self, video_path, output_dir, start_frame, end_frame, frame_step, roi=None, workers=None,
+        index=None, backend=None, threads=0, encoder=None, sink=None, ranges=None, merge_index=False,
+        frame_filter=None, variants=None
+    ):
+        self.video_path = video_path
+        self.output_dir = output_dir
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.frame_step = max(1, frame_step)
+        self.roi = roi
+        self.workers = workers or os.cpu_count() or 1
+        self.index = index
+        self.backend = backend
+        self.threads = threads
+        self.encoder = encoder or make_encoder()
+        self.sink = sink or DEFAULT_SINK
+        self.merge_index = merge_index
+        self.frame_filter = frame_filter
+        self.variants = variants
+        self.skipped = 0
+        if index is not None:
+            self.end_frame = min(self.end_frame, index.frame_count - 1)
+        # Frame ranges still to extract (several when resuming a job)
+        self.ranges = ranges or [(self.start_frame, self.end_frame)]
+        sizes = [1 + (last - first) // self.frame_step for first, last in self.ranges]
+        self.total_frames = sum(sizes)
+        self.segments = []
+        for (first, last), size in zip(self.ranges, sizes):
+            n_segments = max(1, round(self.workers * SEGMENTS_PER_WORKER * size / self.total_frames))
+            self.segments += split_segments(first, last, self.frame_step, n_segments, index)
+
+    def run(self, progress_cb=None, should_stop=None, on_frames=None, on_skipped=None):
+        # on_frames(first, last): frames [first, last] of a segment are done,
+        # on_skipped(frame_idx): frame dropped by the duplicate filter
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Spawn: never fork a process that runs Qt/decoder threads
+        ctx = mp.get_context("spawn")
+        progress_queue = ctx.Queue()
+        stop_event = ctx.Event()
+        count = 0
+        indexes = {}
+        errors = []
+        # Filter decisions of finished segments, replayed in frame order
+        decisions = {}
+        replayed = 0
+        reference = None
+        logger.debug(f"Parallel extraction: {len(self.segments)} segments on {self.workers} processes")
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(progress_queue, stop_event, STAGE_STATS.enabled)
+        ) as pool:
+            def submit(first, last, frame_filter=None, frames=None):
+                return pool.submit(
+                    _extract_segment, self.video_path, self.output_dir,
+                    first, last, self.frame_step, self.roi, self.index,
+                    self.backend, self.threads, self.encoder, self.sink, frame_filter, self.variants, frames
+                )
+
+            segments = {submit(first, last, self.frame_filter): first for first, last in self.segments}
+            parts = list(segments.values())
+            pending = set(segments)
+            while pending:
+                if should_stop and should_stop() and not stop_event.is_set():
+                    stop_event.set()
+                    for future in pending:
+                        future.cancel()
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in segments:
+                        # Failed and cancelled segments replay as empty
+                        decisions[segments[future]] = None
+                    if future.cancelled():
+                        continue
+                    if future.exception() is not None:
+                        # Also BrokenProcessPool when a segment process died: the job fails
+                        # once the pool exits, the other segments are stopped
+                        logger.error(f"Segment extraction failed: {future.exception()!r}")
+                        errors.append(future.exception())
+                        stop_event.set()
+                        for other in pending:
+                            other.cancel()
+                    else:
+                        # Encode throughput measured inside the segment process
+                        _, stats, part_indexes, filter_stats, stage_stats, segment_decisions = future.result()
+                        self.encoder.merge_stats(stats)
+                        if filter_stats:
+                            self.frame_filter.merge_stats(filter_stats)
+                        STAGE_STATS.merge(stage_stats)
+                        for out_dir, part_index in part_indexes.items():
+                            if part_index:
+                                indexes.setdefault(out_dir, {}).update(part_index)
+                        if future in segments:
+                            decisions[segments[future]] = segment_decisions
+                count = self._drain(progress_queue, count, progress_cb, on_frames)
+                if self.frame_filter is None:
+                    continue
+                # Segments replay in order, each one from the reference its predecessors left
+                while replayed < len(self.segments) and self.segments[replayed][0] in decisions:
+                    segment_decisions = decisions.pop(self.segments[replayed][0]) or []
+                    replayed += 1
+                    reference, dropped, missing = self._replay(segment_decisions, reference, on_skipped)
+                    self._remove_outputs(dropped, indexes)
+                    count -= len(dropped)
+                    self.skipped += len(dropped) - len(missing)
+                    if missing and not stop_event.is_set():
+                        # Kept by a sequential pass, skipped by the segment: extracted as a frame list
+                        pending.add(submit(missing[0], missing[-1], frames=missing))
+                        parts.append(missing[0])
+                    if (dropped or missing) and progress_cb:
+                        progress_cb(count + self.skipped, self.total_frames)
+        # Reports of the last segments may arrive after their futures resolved
+        count = self._drain(progress_queue, count, progress_cb, on_frames, timeout=0.2)
+        video_name = os.path.splitext(os.path.basename(self.video_path))[0]
+        if self.sink not in ("files", "memmap"):
+            # One container per output like a sequential run, a resumed run adds its own
+            part = self.ranges[0][0] if self.merge_index else None
+            for out_dir in self._out_dirs():
+                indexes[out_dir] = merge_parts(
+                    out_dir, self.video_path, self.sink, self.encoder.ext, indexes.get(out_dir, {}), parts, part
+                )
+        for out_dir, entries in indexes.items():
+            write_index(out_dir, video_name, self.sink, self.encoder.ext, entries, merge=self.merge_index)
+        if errors:
+            # Frames of the segments that completed stay indexed and checkpointed for a resume
+            raise RuntimeError(f"{len(errors)} of {len(self.segments)} segments failed: {errors[0]!r}")
+        return count
+
+    def _replay(self, decisions, reference, on_skipped=None):
+        """Re-run the filter over a segment's signatures from the reference of a sequential pass
+
+        Returns the new reference, the frames the segment wrote that a sequential
+        pass skips and the frames it skipped that a sequential pass keeps.
+        """
+        dropped, missing = [], []
+        for frame_idx, sig, kept in decisions:
+            if self.frame_filter.is_duplicate(sig, reference):
+                if kept:
+                    dropped.append(frame_idx)
+                if on_skipped:
+                    on_skipped(frame_idx)
+            else:
+                reference = sig
+                if not kept:
+                    missing.append(frame_idx)
+        self.frame_filter.skipped += len(dropped) - len(missing)
+        if dropped or missing:
+            logger.debug(f"Duplicate filter replay: {len(dropped)} frames dropped, {len(missing)} to extract")
+        return reference, dropped, missing
+
+    def _out_dirs(self):
+        return [variant_dir(self.output_dir, v) for v in self.variants] if self.variants else [self.output_dir]
+
+    def _remove_outputs(self, frames, indexes):
+        video_name = os.path.splitext(os.path.basename(self.video_path))[0]
+        for frame_idx in frames:
+            for out_dir in self._out_dirs():
+                if self.sink == "files":
+                    try:
+                        os.remove(FileSink(out_dir, video_name, self.encoder.ext).path_for(frame_idx))
+                    except OSError as e:
+                        logger.warning(f"Failed to remove duplicate frame {frame_idx}: {e}")
+                else:
+                    # Packed outputs: unreferenced, the frame is left out when the parts are merged
+                    indexes.get(out_dir, {}).pop(frame_idx, None)
+
+    def _drain(self, progress_queue, count, progress_cb, on_frames=None, timeout=0):
+        while True:
+            try:
+                written, skipped, first, done_until = progress_queue.get(timeout=timeout) if timeout else progress_queue.get_nowait()
+            except queue.Empty:
+                return count
+            count += written
+            # Provisional: replaying the filter decisions of the segment corrects it
+            self.skipped += skipped
+            if on_frames and done_until is not None:
+                on_frames(first, done_until)
+            if progress_cb:
+                # Skipped frames count as processed
+                progress_cb(count + self.skipped, self.total_frames)
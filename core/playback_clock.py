@@ -0,0 +1,51 @@
+import time
+
+
+class PlaybackClock:
+    """Presentation clock: maps wall time to stream time and counts frame timing
+
+    The clock is anchored on the first presented frame, so buffer warm-up does
+    not count as lateness. A negative rate runs it backwards (reverse playback).
+    """
+
+    def __init__(self, fps, rate=1.0, lead=0.002):
+        self.frame_period = 1.0 / fps if fps else 1.0 / 30
+        self.rate = rate
+        self.lead = lead # present frames this early to absorb timer jitter
+        self.origin = None
+        self.on_time = 0
+        self.late = 0
+        self.dropped = 0
+
+    @property
+    def started(self):
+        return self.origin is not None
+
+    def start(self, pts):
+        self.origin = (time.perf_counter(), pts)
+
+    def now(self):
+        t0, pts0 = self.origin
+        return pts0 + (time.perf_counter() - t0) * self.rate
+
+    @property
+    def direction(self):
+        return -1 if self.rate < 0 else 1
+
+    def is_due(self, pts):
+        return self.origin is None or (pts - self.now()) * self.direction <= self.lead
+
+    def record_shown(self, pts):
+        if self.origin is None:
+            self.start(pts)
+        # Shown more than a frame period after its timestamp: late
+        if (self.now() - pts) * self.direction > self.frame_period:
+            self.late += 1
+        else:
+            self.on_time += 1
+
+    def record_dropped(self):
+        self.dropped += 1
+
+    def stats(self):
+        return dict(on_time=self.on_time, late=self.late, dropped=self.dropped)
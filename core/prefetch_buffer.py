@@ -0,0 +1,114 @@
+import math, time, threading
+from collections import deque
+
+DEFAULT_PREFETCH_BYTES = 256 * 1024 * 1024
+
+
+class PrefetchBuffer:
+    """Blocking FIFO of decoded frames bounded by bytes and an adaptive depth
+
+    The producer blocks in put() instead of polling. The target depth is sized in
+    seconds of display time: shallow when decoding is well ahead of display,
+    deeper when it barely keeps up or the consumer hits underruns. The byte
+    budget is always the hard limit.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PREFETCH_BYTES, display_fps=30.0, min_seconds=0.25, max_seconds=2.0):
+        self.max_bytes = max_bytes
+        self.display_fps = display_fps or 30.0
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.nbytes = 0
+        self.peak_bytes = 0
+        self.underruns = 0
+        self.puts = 0
+        self.gets = 0
+        self.decode_fps = 0.0
+        self.target_depth = self._depth_for(self.max_seconds)
+        self._items = deque()
+        self._cond = threading.Condition(threading.RLock())
+        self._closed = False
+        self._last_put = None
+        self._underrun_boost = 0.0
+
+    def _depth_for(self, seconds):
+        return max(2, math.ceil(seconds * self.display_fps))
+
+    def _adapt(self):
+        # Decode/display speed ratio: >= 2 needs only min_seconds of buffer
+        ratio = self.decode_fps / self.display_fps if self.decode_fps else 1.0
+        slack = min(1.0, max(0.0, 2.0 - ratio)) + self._underrun_boost
+        seconds = self.min_seconds + (self.max_seconds - self.min_seconds) * min(1.0, slack)
+        self.target_depth = self._depth_for(seconds)
+
+    def put(self, item, nbytes):
+        """Block until the frame fits; returns False once closed"""
+        with self._cond:
+            now = time.perf_counter()
+            if self._last_put is not None and now > self._last_put:
+                # Exponential moving average of the decode rate
+                fps = 1.0 / (now - self._last_put)
+                self.decode_fps = fps if not self.decode_fps else 0.9 * self.decode_fps + 0.1 * fps
+                self._adapt()
+            while not self._closed and self._items and (
+                self.nbytes + nbytes > self.max_bytes or len(self._items) >= self.target_depth
+            ):
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._items.append((item, nbytes))
+            self.nbytes += nbytes
+            self.peak_bytes = max(self.peak_bytes, self.nbytes)
+            self.puts += 1
+            # Time blocked on a full buffer is not decode time
+            self._last_put = time.perf_counter()
+            self._cond.notify_all()
+            return True
+
+    def peek(self):
+        with self._cond:
+            return self._items[0][0] if self._items else None
+
+    def record_underrun(self):
+        with self._cond:
+            if self._closed or not self.puts:
+                return
+            self.underruns += 1
+            self._underrun_boost = min(1.0, self._underrun_boost + 0.1)
+            self._adapt()
+
+    def get_nowait(self):
+        with self._cond:
+            if not self._items:
+                self.record_underrun()
+                return None
+            item, nbytes = self._items.popleft()
+            self.nbytes -= nbytes
+            self.gets += 1
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self):
+        with self._cond:
+            items = [item for item, _ in self._items]
+            self._items.clear()
+            self.nbytes = 0
+            self._cond.notify_all()
+            return items
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        with self._cond:
+            return dict(
+                depth=len(self._items), target_depth=self.target_depth,
+                bytes=self.nbytes, peak_bytes=self.peak_bytes, max_bytes=self.max_bytes,
+                underruns=self.underruns, frames=self.gets,
+                decode_fps=round(self.decode_fps, 2), display_fps=round(self.display_fps, 2),
+            )
@@ -0,0 +1,146 @@
+import os, json, time, threading
+from loguru import logger
+
+# Instrumented stages in pipeline order
+STAGES = ("decode", "convert", "crop", "encode", "write", "qimage", "scale")
+# Latency histogram: bucket i counts durations in [2**(i-1), 2**i) microseconds
+BUCKETS = 32
+ENV_VAR = "FRAME_EXTRACTOR_STATS"
+
+
+def stats_path(output_dir, video_path):
+    return os.path.join(output_dir, f"{os.path.splitext(os.path.basename(video_path))[0]}_stats.json")
+
+
+def _bucket_ms(i):
+    # Upper bound of bucket i in milliseconds
+    return (1 << i) / 1000
+
+
+def _percentile(hist, count, p):
+    rank = p / 100 * count
+    seen = 0
+    for i, n in enumerate(hist):
+        seen += n
+        if seen >= rank:
+            return _bucket_ms(i)
+    return _bucket_ms(len(hist) - 1)
+
+
+class StageStats:
+    """Per-stage latency histograms and throughput counters
+
+    Disabled by default: start() and add() then return at once, so the
+    instrumented paths cost two method calls per stage. Counters are process
+    wide; raw()/diff() give the share of one job, merge() folds in the
+    counters of a worker process.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def start(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def add(self, stage, t0, nbytes=0):
+        # t0 from start(): 0.0 when the timing began while disabled
+        if self.enabled and t0:
+            self.record(stage, time.perf_counter() - t0, nbytes)
+
+    def record(self, stage, seconds, nbytes=0):
+        if not self.enabled:
+            return
+        bucket = min(BUCKETS - 1, int(seconds * 1e6).bit_length())
+        with self._lock:
+            s = self._stages.get(stage)
+            if s is None:
+                s = self._stages[stage] = dict(count=0, seconds=0.0, bytes=0, min=seconds, max=0.0, hist=[0] * BUCKETS)
+            s["count"] += 1
+            s["seconds"] += seconds
+            s["bytes"] += nbytes
+            s["min"] = min(s["min"], seconds)
+            s["max"] = max(s["max"], seconds)
+            s["hist"][bucket] += 1
+
+    def raw(self):
+        with self._lock:
+            return {stage: dict(s, hist=list(s["hist"])) for stage, s in self._stages.items()}
+
+    def diff(self, before):
+        # Counters accumulated since raw() returned `before` (min/max are not windowed)
+        result = {}
+        for stage, s in self.raw().items():
+            b = before.get(stage)
+            if b is not None:
+                s = dict(
+                    s, count=s["count"] - b["count"], seconds=s["seconds"] - b["seconds"],
+                    bytes=s["bytes"] - b["bytes"], hist=[x - y for x, y in zip(s["hist"], b["hist"])]
+                )
+            if s["count"]:
+                result[stage] = s
+        return result
+
+    def merge(self, raw):
+        # Fold counters of another process
+        with self._lock:
+            for stage, r in raw.items():
+                s = self._stages.get(stage)
+                if s is None:
+                    self._stages[stage] = dict(r, hist=list(r["hist"]))
+                    continue
+                s["count"] += r["count"]
+                s["seconds"] += r["seconds"]
+                s["bytes"] += r["bytes"]
+                s["min"] = min(s["min"], r["min"])
+                s["max"] = max(s["max"], r["max"])
+                s["hist"] = [x + y for x, y in zip(s["hist"], r["hist"])]
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+
+    def summary(self, raw=None):
+        """stage -> count, latency (ms: mean, min, p50, p95, p99, max) and throughput"""
+        raw = self.raw() if raw is None else raw
+        order = [s for s in STAGES if s in raw] + sorted(s for s in raw if s not in STAGES)
+        result = {}
+        for stage in order:
+            s = raw[stage]
+            count, seconds = s["count"], s["seconds"]
+            result[stage] = dict(
+                count=count, total_ms=round(seconds * 1000, 3),
+                mean_ms=round(seconds * 1000 / count, 4) if count else 0.0,
+                min_ms=round(s["min"] * 1000, 4), max_ms=round(s["max"] * 1000, 4),
+                # Percentiles are histogram bucket upper bounds
+                p50_ms=_percentile(s["hist"], count, 50), p95_ms=_percentile(s["hist"], count, 95),
+                p99_ms=_percentile(s["hist"], count, 99),
+                per_s=round(count / seconds, 2) if seconds else 0.0,
+                mb_per_s=round(s["bytes"] / seconds / 1e6, 2) if seconds and s["bytes"] else 0.0,
+            )
+        return result
+
+    def to_dict(self, raw=None):
+        raw = self.raw() if raw is None else raw
+        histograms = {
+            stage: {f"<{_bucket_ms(i):g}ms": n for i, n in enumerate(s["hist"]) if n}
+            for stage, s in raw.items()
+        }
+        return dict(stages=self.summary(raw), histograms=histograms)
+
+    def dump(self, path, raw=None, **extra):
+        data = dict(created=time.strftime("%Y-%m-%dT%H:%M:%S"), **extra, **self.to_dict(raw))
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            logger.debug(f"Stage stats written to '{path}'")
+        except OSError as e:
+            logger.warning(f"Failed to write stage stats '{path}': {e}")
+
+
+# Process-wide instance used by the instrumented paths
+STAGE_STATS = StageStats(enabled=os.environ.get(ENV_VAR, "") not in ("", "0"))
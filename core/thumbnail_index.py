@@ -0,0 +1,107 @@
+import os, json
+import cv2
+import numpy as np
+from loguru import logger
+from .video_index import CACHE_ROOT, file_key
+from .extract_engine import ExtractEngine
+from .video_source import open_source
+
+THUMBS_VERSION = 1
+CACHE_DIR = os.path.join(CACHE_ROOT, "thumbs")
+THUMB_WIDTH = 160
+MAX_THUMBS = 1000
+SPRITE_COLUMNS = 20
+
+
+class ThumbnailIndex:
+    """Low resolution thumbnails every `interval` frames, stored as one JPEG sprite"""
+
+    def __init__(self, interval, thumbs):
+        self.interval = interval
+        self.thumbs = thumbs # (N, h, w, 3) BGR
+
+    def nearest(self, frame_idx):
+        if not len(self.thumbs):
+            return None
+        pos = int(round(frame_idx / self.interval))
+        return self.thumbs[max(0, min(pos, len(self.thumbs) - 1))]
+
+    @staticmethod
+    def paths(video_path, cache_dir=None):
+        base = os.path.join(cache_dir or CACHE_DIR, f"{file_key(video_path)}_{THUMB_WIDTH}")
+        return f"{base}.jpg", f"{base}.json"
+
+    def save(self, video_path, cache_dir=None):
+        sprite_path, meta_path = self.paths(video_path, cache_dir)
+        os.makedirs(os.path.dirname(sprite_path), exist_ok=True)
+        n, h, w, ch = self.thumbs.shape
+        rows = -(-n // SPRITE_COLUMNS)
+        sprite = np.zeros((rows * h, SPRITE_COLUMNS * w, ch), np.uint8)
+        for i, thumb in enumerate(self.thumbs):
+            r, c = divmod(i, SPRITE_COLUMNS)
+            sprite[r*h:(r+1)*h, c*w:(c+1)*w] = thumb
+        cv2.imwrite(sprite_path, sprite, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(dict(version=THUMBS_VERSION, interval=self.interval, count=n, width=w, height=h), f)
+
+    @classmethod
+    def load(cls, video_path, cache_dir=None):
+        sprite_path, meta_path = cls.paths(video_path, cache_dir)
+        if not (os.path.exists(sprite_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            sprite = cv2.imread(sprite_path)
+            if meta.get("version") != THUMBS_VERSION or sprite is None:
+                return None
+            n, w, h = meta["count"], meta["width"], meta["height"]
+            thumbs = np.empty((n, h, w, 3), np.uint8)
+            for i in range(n):
+                r, c = divmod(i, SPRITE_COLUMNS)
+                thumbs[i] = sprite[r*h:(r+1)*h, c*w:(c+1)*w]
+            return cls(meta["interval"], thumbs)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable thumbnails '{sprite_path}': {e}")
+            return None
+
+    @classmethod
+    def build(cls, video_path, index=None, should_stop=None, backend=None):
+        cap = open_source(video_path, backend)
+        if not cap.isOpened():
+            return None
+        fps = cap.fps or 30
+        frame_count = index.frame_count if index else cap.frame_count
+        # One thumbnail per second, at most MAX_THUMBS per video
+        interval = max(1, int(round(fps)), -(-frame_count // MAX_THUMBS))
+        thumbs = []
+        size = None
+        # Same strided engine as batch extraction (grab or seek per GOP size)
+        engine = ExtractEngine(cap, 0, frame_count - 1, interval, index=index)
+        for _, frame in engine.frames():
+            if should_stop and should_stop():
+                cap.release()
+                return None
+            if size is None:
+                h, w = frame.shape[:2]
+                size = (THUMB_WIDTH, max(1, round(h * THUMB_WIDTH / w)))
+            thumbs.append(cv2.resize(frame, size, interpolation=cv2.INTER_AREA))
+        cap.release()
+        if not thumbs:
+            return None
+        return cls(interval, np.stack(thumbs))
+
+    @classmethod
+    def load_or_build(cls, video_path, index=None, cache_dir=None, should_stop=None, backend=None):
+        thumbs = cls.load(video_path, cache_dir)
+        if thumbs is not None:
+            logger.debug(f"Thumbnails loaded from cache ({len(thumbs.thumbs)})")
+            return thumbs
+        thumbs = cls.build(video_path, index, should_stop, backend)
+        if thumbs is not None:
+            try:
+                thumbs.save(video_path, cache_dir)
+                logger.debug(f"Thumbnails saved to cache ({len(thumbs.thumbs)})")
+            except OSError as e:
+                logger.warning(f"Could not save thumbnails: {e}")
+        return thumbs
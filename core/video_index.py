@@ -0,0 +1,166 @@
+import os, json, bisect, hashlib
+import cv2
+from loguru import logger
+
+INDEX_VERSION = 1
+CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "FrameExtractor")
+CACHE_DIR = os.path.join(CACHE_ROOT, "index")
+
+
+def file_key(video_path):
+    # File identity: absolute path + size + modification time
+    st = os.stat(video_path)
+    ident = f"{os.path.abspath(video_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+
+def cache_path(video_path, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, f"{file_key(video_path)}.json")
+
+
+class VideoIndex:
+    """Keyframe positions, per-frame PTS (seconds) and exact frame count of a video"""
+
+    def __init__(self, frame_count, keyframes, pts, fps):
+        self.frame_count = frame_count
+        self.keyframes = keyframes
+        self.pts = pts
+        self.fps = fps
+
+    @property
+    def gop_size(self):
+        if len(self.keyframes) < 2:
+            return None
+        return max(1, round(self.frame_count / len(self.keyframes)))
+
+    def keyframe_before(self, frame_idx):
+        # Nearest keyframe at or before frame_idx
+        if not self.keyframes:
+            return None
+        pos = bisect.bisect_right(self.keyframes, frame_idx) - 1
+        return self.keyframes[max(pos, 0)]
+
+    def frame_at_time(self, secs):
+        if not self.pts:
+            return int(secs * self.fps)
+        pos = bisect.bisect_right(self.pts, secs) - 1
+        return max(0, min(pos, self.frame_count - 1))
+
+    def time_of(self, frame_idx):
+        if 0 <= frame_idx < len(self.pts):
+            return self.pts[frame_idx]
+        return frame_idx / self.fps if self.fps else 0.0
+
+    def to_dict(self):
+        return dict(
+            version=INDEX_VERSION,
+            frame_count=self.frame_count,
+            keyframes=self.keyframes,
+            pts=[round(t, 6) for t in self.pts],
+            fps=self.fps,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["frame_count"], data["keyframes"], data["pts"], data["fps"])
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            return cls.from_dict(data)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable video index '{path}': {e}")
+            return None
+
+    @classmethod
+    def build(cls, video_path, should_stop=None):
+        try:
+            import av
+        except ImportError:
+            av = None
+        if av is not None:
+            return cls._build_pyav(av, video_path, should_stop)
+        return cls._build_opencv(video_path, should_stop)
+
+    @classmethod
+    def _build_pyav(cls, av, video_path, should_stop=None):
+        # Demux only (no decoding): packet PTS and keyframe flags
+        with av.open(video_path) as container:
+            stream = container.streams.video[0]
+            time_base = float(stream.time_base)
+            fps = float(stream.average_rate or stream.guessed_rate or 0)
+            packets = []
+            for packet in container.demux(stream):
+                if should_stop and should_stop():
+                    return None
+                if packet.pts is None or packet.size == 0:
+                    continue
+                packets.append((packet.pts, packet.is_keyframe))
+        # Decoders emit frames in presentation order
+        packets.sort()
+        start_pts = packets[0][0] if packets else 0
+        pts = [(p - start_pts) * time_base for p, _ in packets]
+        keyframes = [i for i, (_, key) in enumerate(packets) if key]
+        return cls(len(pts), keyframes, pts, fps)
+
+    @classmethod
+    def _build_opencv(cls, video_path, should_stop=None):
+        # Fallback: exact count and PTS via grab(), keyframes unknown
+        logger.debug("PyAV not available, building video index with OpenCV (no keyframes)")
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        pts = []
+        while cap.grab():
+            if should_stop and should_stop():
+                cap.release()
+                return None
+            pts.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+        cap.release()
+        return cls(len(pts), [], pts, fps)
+
+    @classmethod
+    def load_or_build(cls, video_path, cache_dir=None, should_stop=None):
+        path = cache_path(video_path, cache_dir)
+        index = cls.load(path) if os.path.exists(path) else None
+        if index is not None:
+            logger.debug(f"Video index loaded from cache: '{path}'")
+            return index
+        index = cls.build(video_path, should_stop)
+        if index is not None:
+            try:
+                index.save(path)
+                logger.debug(f"Video index saved to cache: '{path}'")
+            except OSError as e:
+                logger.warning(f"Could not save video index: {e}")
+        return index
+
+
+def seek(cap, frame_idx, index=None):
+    """Position cap so the next read() returns frame_idx"""
+    if hasattr(cap, "seek"):
+        # VideoSource: backend specific (e.g. PTS based) seek
+        cap.seek(frame_idx, index)
+        return
+    keyframe = index.keyframe_before(frame_idx) if index else None
+    if keyframe is None:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        return
+    # Already inside the target GOP and before the target: decode forward
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    if not keyframe <= position <= frame_idx:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+        position = keyframe
+    for _ in range(frame_idx - position):
+        if not cap.grab():
+            break
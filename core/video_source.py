@@ -0,0 +1,268 @@
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+from loguru import logger
+from .video_index import seek as seek_capture
+from .stage_stats import STAGE_STATS
+
+DEFAULT_BACKEND = "opencv"
+
+
+class VideoSource(ABC):
+    """Decoder-agnostic video reader
+
+    Mirrors the cv2.VideoCapture subset used across the app (read/grab/retrieve,
+    get/set of position and stream properties) and adds index-aware seek().
+    """
+
+    backend = None
+
+    def __init__(self, video_path, threads=0):
+        self.video_path = video_path
+        self.threads = threads
+        self.fps = 0.0
+        self.frame_count = 0
+        self.width = 0
+        self.height = 0
+
+    @abstractmethod
+    def isOpened(self):
+        ...
+
+    @abstractmethod
+    def grab(self):
+        ...
+
+    @abstractmethod
+    def retrieve(self, buf=None):
+        ...
+
+    def read(self, buf=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(buf)
+
+    @property
+    @abstractmethod
+    def position(self):
+        # Index of the next frame grab() returns
+        ...
+
+    @abstractmethod
+    def seek(self, frame_idx, index=None):
+        ...
+
+    def seek_time(self, secs, index=None):
+        frame_idx = index.frame_at_time(secs) if index else int(round(secs * self.fps))
+        self.seek(frame_idx, index)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.position
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return 1000 * self.position / self.fps if self.fps else 0.0
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.seek(int(value))
+            return True
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            self.seek_time(value / 1000)
+            return True
+        return False
+
+    def release(self):
+        pass
+
+
+class OpenCVSource(VideoSource):
+    backend = "opencv"
+
+    def __init__(self, video_path, threads=0):
+        super().__init__(video_path, threads)
+        if threads:
+            self.cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_N_THREADS, threads])
+        else:
+            self.cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def grab(self):
+        t0 = STAGE_STATS.start()
+        ret = self.cap.grab()
+        STAGE_STATS.add("decode", t0)
+        return ret
+
+    def retrieve(self, buf=None):
+        # Color conversion to BGR happens here
+        t0 = STAGE_STATS.start()
+        ret, frame = self.cap.retrieve(buf)
+        STAGE_STATS.add("convert", t0)
+        return ret, frame
+
+    def read(self, buf=None):
+        if STAGE_STATS.enabled:
+            # Timed as its decode and convert halves
+            return super().read(buf)
+        return self.cap.read(buf)
+
+    @property
+    def position(self):
+        return int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+
+    def seek(self, frame_idx, index=None):
+        seek_capture(self.cap, frame_idx, index)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def release(self):
+        self.cap.release()
+
+
+class PyAVSource(VideoSource):
+    """FFmpeg through PyAV: frame+slice threaded decoding and PTS-based seeking"""
+
+    backend = "pyav"
+
+    def __init__(self, video_path, threads=0):
+        super().__init__(video_path, threads)
+        import av
+        self.container = None
+        self._frame = None # grabbed, not yet retrieved
+        self._ready = None # decoded by seek(), returned by the next grab()
+        self._position = 0
+        try:
+            self.container = av.open(video_path)
+            self.stream = self.container.streams.video[0]
+        except (av.error.FFmpegError, IndexError, OSError) as e:
+            logger.error(f"PyAV failed to open '{video_path}': {e}")
+            self.container = None
+            return
+        self.stream.thread_type = "AUTO" # frame and slice threads
+        self.stream.thread_count = threads # 0: one per core
+        self.time_base = float(self.stream.time_base)
+        self.start_pts = self.stream.start_time or 0
+        self.fps = float(self.stream.average_rate or self.stream.guessed_rate or 0)
+        self.frame_count = self.stream.frames or int(
+            (self.container.duration or 0) / 1e6 * self.fps
+        )
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        self._frames = self.container.decode(self.stream)
+
+    def isOpened(self):
+        return self.container is not None
+
+    def grab(self):
+        if self.container is None:
+            return False
+        if self._ready is not None:
+            self._frame, self._ready = self._ready, None
+        else:
+            t0 = STAGE_STATS.start()
+            self._frame = next(self._frames, None)
+            STAGE_STATS.add("decode", t0)
+            if self._frame is None:
+                return False
+        self._position += 1
+        return True
+
+    def retrieve(self, buf=None):
+        if self._frame is None:
+            return False, None
+        t0 = STAGE_STATS.start()
+        frame = self._frame.to_ndarray(format="bgr24")
+        if buf is not None and buf.shape == frame.shape:
+            np.copyto(buf, frame)
+            frame = buf
+        STAGE_STATS.add("convert", t0)
+        return True, frame
+
+    @property
+    def position(self):
+        return self._position
+
+    def seek(self, frame_idx, index=None):
+        if self.container is None:
+            return
+        keyframe = index.keyframe_before(frame_idx) if index else None
+        if keyframe is not None and keyframe <= self._position <= frame_idx:
+            # Inside the target GOP already: decode forward
+            for _ in range(frame_idx - self._position):
+                if not self.grab():
+                    break
+            return
+        if index is None and not self.fps:
+            # No frame rate to map the index to a time: count frames from the start
+            self._seek_by_decoding(frame_idx)
+            return
+        secs = index.time_of(frame_idx) if index else frame_idx / self.fps
+        # Seek by PTS to the keyframe at or before the target, decode up to it
+        self.container.seek(
+            self.start_pts + int(secs / self.time_base),
+            backward=True, any_frame=False, stream=self.stream
+        )
+        self._frames = self.container.decode(self.stream)
+        self._frame = self._ready = None
+        half_period = 0.5 / self.fps if self.fps else 0.0
+        for frame in self._frames:
+            if frame.pts is None or (frame.pts - self.start_pts) * self.time_base >= secs - half_period:
+                self._ready = frame
+                break
+        self._position = frame_idx
+
+    def _seek_by_decoding(self, frame_idx):
+        if frame_idx < self._position:
+            self.container.seek(self.start_pts, backward=True, any_frame=False, stream=self.stream)
+            self._frames = self.container.decode(self.stream)
+            self._frame = self._ready = None
+            self._position = 0
+        for _ in range(frame_idx - self._position):
+            if not self.grab():
+                break
+
+    def release(self):
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+
+
+BACKENDS = {
+    OpenCVSource.backend: OpenCVSource,
+    PyAVSource.backend: PyAVSource,
+}
+
+
+def available_backends():
+    backends = [OpenCVSource.backend]
+    try:
+        import av # noqa: F401
+        backends.append(PyAVSource.backend)
+    except ImportError:
+        pass
+    return backends
+
+
+def open_source(video_path, backend=None, threads=0):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown decoder backend '{backend}' (available: {', '.join(BACKENDS)})")
+    return BACKENDS[backend](video_path, threads)
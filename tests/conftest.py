@@ -0,0 +1,37 @@
+import os, sys
+import pytest
+
+# Imported as FrameExtractor from the parent directory, like __main__ does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+
+def write_clip(path, frames, fps=25, codec="MJPG"):
+    """Write frames (BGR uint8 arrays) with cv2.VideoWriter; skips the test if the codec is unavailable"""
+    import cv2
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*codec), fps, (w, h))
+    if not writer.isOpened():
+        pytest.skip(f"no {codec} video writer in this OpenCV build")
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def clip(tmp_path):
+    # 60 numbered frames of a panned texture; MJPG: every frame is a keyframe
+    from FrameExtractor.bench import generate_video
+    path = str(tmp_path / "clip.avi")
+    if not generate_video(path, (160, 120), "MJPG", 12, 60, 25):
+        pytest.skip("no MJPG video writer in this OpenCV build")
+    return path
+
+
+@pytest.fixture
+def ramp_clip(tmp_path):
+    # 80 frames brightening by ~1% each: near-duplicates of their neighbours only
+    import numpy as np
+    gradient = np.tile(np.linspace(0, 40, 160, dtype=np.float32), (120, 1))
+    frames = [np.dstack([np.clip(gradient + 20 + 2.55 * i, 0, 255).astype(np.uint8)] * 3) for i in range(80)]
+    return write_clip(tmp_path / "ramp.avi", frames)
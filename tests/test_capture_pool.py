@@ -0,0 +1,37 @@
+import shutil
+from FrameExtractor.core.capture_pool import CapturePool
+
+
+def test_released_handles_are_reused(clip):
+    pool = CapturePool()
+    with pool.lease(clip) as cap:
+        cap.read()
+    with pool.lease(clip) as again:
+        assert again is cap
+    assert pool.stats() == dict(opened=1, reused=1, owned=0, idle=1)
+    pool.close()
+
+
+def test_idle_handles_beyond_the_limits_are_closed(clip, tmp_path):
+    pool = CapturePool(max_idle=1, max_total=2)
+    caps = [pool.acquire(clip) for _ in range(3)]
+    for cap in caps:
+        pool.release(cap)
+    # One idle handle per video: the last released one
+    assert [cap.isOpened() for cap in caps] == [False, False, True]
+    for name in ("other.avi", "third.avi"):
+        copy = shutil.copy(clip, tmp_path / name)
+        pool.release(pool.acquire(str(copy)))
+    # Two idle handles overall: the least recently released one is closed
+    assert not caps[2].isOpened()
+    assert pool.stats()["idle"] == 2
+
+
+def test_handles_owned_while_closing_are_closed_on_release(clip):
+    pool = CapturePool()
+    cap = pool.acquire(clip)
+    pool.close(clip)
+    assert cap.isOpened()
+    pool.release(cap)
+    assert not cap.isOpened()
+    assert pool.stats()["idle"] == 0
@@ -0,0 +1,32 @@
+import io
+import cv2
+import numpy as np
+import pytest
+from FrameExtractor.core.encoders import ENCODERS, LOSSLESS_FORMATS, ImageEncoder, encoder_from_spec
+
+
+def test_incomplete_encoder_fails_on_creation():
+    class NoEncode(ImageEncoder):
+        name = "none"
+        ext = ".none"
+
+    with pytest.raises(TypeError):
+        NoEncode()
+
+
+@pytest.mark.parametrize("spec", ["jpeg:quality=90,subsampling=444", "png:level=1", "webp:quality=101", "npy"])
+def test_spec_round_trip(spec):
+    assert encoder_from_spec(spec).spec() == spec
+
+
+@pytest.mark.parametrize("fmt", LOSSLESS_FORMATS)
+def test_lossless_formats_decode_to_the_frame(fmt):
+    frame = np.random.default_rng(0).integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    encoder = ENCODERS[fmt]()
+    data = bytes(encoder.encode(frame))
+    if fmt == "npy":
+        decoded = np.load(io.BytesIO(data))
+    else:
+        decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    assert np.array_equal(decoded, frame)
+    assert encoder.stats()["frames"] == 1
@@ -0,0 +1,31 @@
+import numpy as np
+from FrameExtractor.core.frame_cache import FrameCache
+
+
+def frame(value, size=100):
+    return np.full(size, value, dtype=np.uint8)
+
+
+def test_least_recently_used_frames_are_evicted():
+    cache = FrameCache(max_bytes=300)
+    for i in range(3):
+        cache.put("a.mp4", i, frame(i))
+    assert cache.get("a.mp4", 0) is not None
+    cache.put("a.mp4", 3, frame(3))
+    assert ("a.mp4", 1) not in cache
+    assert [("a.mp4", i) in cache for i in (0, 2, 3)] == [True, True, True]
+    assert cache.nbytes == 300
+    assert cache.stats()["hits"] == 1
+
+
+def test_replacing_and_clearing_keep_the_byte_count():
+    cache = FrameCache(max_bytes=1000)
+    cache.put("a.mp4", 0, frame(0))
+    cache.put("a.mp4", 0, frame(1, 200))
+    cache.put("b.mp4", 0, frame(2))
+    assert cache.nbytes == 300 and len(cache) == 2
+    cache.clear("a.mp4")
+    assert cache.nbytes == 100 and cache.get("a.mp4", 0) is None
+    # Larger than the whole budget: not cached
+    cache.put("b.mp4", 1, frame(3, 2000))
+    assert ("b.mp4", 1) not in cache and cache.nbytes == 100
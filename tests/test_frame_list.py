@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from FrameExtractor.core.extract_engine import ExtractEngine, plan_access
+from FrameExtractor.core.frame_list import read_frame_list, resolve_frames
+from FrameExtractor.core.video_index import VideoIndex
+from FrameExtractor.core.video_source import open_source
+
+
+def test_resolve_frames_skips_csv_header(tmp_path):
+    path = tmp_path / "frames.csv"
+    path.write_text("frame,label\n40,a\n12,b\n40,c\n")
+    assert resolve_frames(read_frame_list(str(path)), 25.0) == [12, 40]
+
+
+def test_resolve_frames_timestamps():
+    assert resolve_frames(read_frame_list("00:00:01.05, 10"), 25.0) == [10, 30]
+    assert resolve_frames(["0.5", "2"], 25.0, times=True) == [12, 50]
+
+
+@pytest.mark.parametrize("spec", ["12.5,40", "40,12.5", "abc1,40"])
+def test_resolve_frames_rejects_invalid_entries(spec):
+    with pytest.raises(ValueError, match="Invalid frame list entry"):
+        resolve_frames(read_frame_list(spec), 25.0)
+
+
+def test_plan_access_seeks_across_wide_gaps():
+    plan = plan_access([500, 10, 12, 10, 30, 1000, 1001], gop_size=10)
+    assert plan == [(True, [10, 12, 30]), (True, [500]), (True, [1000, 1001])]
+
+
+def test_plan_access_decodes_on_without_a_keyframe_in_between():
+    index = VideoIndex(1000, [0, 400, 800], [], 25.0)
+    plan = plan_access([10, 300, 500, 700, 900], gop_size=10, index=index)
+    assert plan == [(True, [10, 300]), (True, [500, 700]), (True, [900])]
+
+
+def test_frame_list_extraction_matches_sequential_read(clip):
+    cap = open_source(clip)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    targets = [57, 3, 4, 30, 58, 3, 90]
+    engine = ExtractEngine(cap, 0, 59, 1, gop_size=5, frames=targets)
+    got = list(engine.frames())
+    cap.release()
+    assert [i for i, _ in got] == [3, 4, 30, 57, 58]
+    assert all(np.array_equal(frame, frames[i]) for i, frame in got)
@@ -0,0 +1,61 @@
+import os
+import tarfile
+import zipfile
+import pytest
+from FrameExtractor.core.frame_sinks import FrameSink, LmdbSink, TarSink, ZipSink, read_frame_bytes
+
+
+def test_incomplete_sink_fails_on_creation(tmp_path):
+    class NoWrite(FrameSink):
+        kind = "none"
+
+    with pytest.raises(TypeError):
+        NoWrite(str(tmp_path), "clip", ".jpg")
+
+
+def test_lmdb_map_grows_when_full(tmp_path):
+    lmdb = pytest.importorskip("lmdb")
+    sink = LmdbSink(str(tmp_path), "clip", ".jpg", map_size=1024 * 1024)
+    frames = {i: os.urandom(256 * 1024) for i in range(16)}
+    for frame_idx, data in frames.items():
+        sink.write(frame_idx, data)
+    entries = sink.close()
+    env = lmdb.open(str(tmp_path / entries[0][0]), readonly=True, lock=False)
+    with env.begin() as txn:
+        for frame_idx, (_, key, size) in entries.items():
+            assert txn.get(key.encode()) == frames[frame_idx]
+            assert size == len(frames[frame_idx])
+    assert env.info()["map_size"] > 1024 * 1024
+    env.close()
+
+
+def random_frames(count):
+    # Sizes off the tar block size so padding is exercised
+    return {i * 3: os.urandom(1000 + 517 * i) for i in range(count)}
+
+
+def test_tar_index_offsets_point_at_member_data(tmp_path):
+    frames = random_frames(12)
+    sink = TarSink(str(tmp_path), "clip", ".jpg", shard_bytes=8 * 1024)
+    for frame_idx, data in frames.items():
+        sink.write(frame_idx, data)
+    entries = sink.close()
+    shards = sorted({name for name, _, _ in entries.values()})
+    assert len(shards) > 1
+    for frame_idx, entry in entries.items():
+        assert read_frame_bytes(str(tmp_path), entry) == frames[frame_idx]
+        with tarfile.open(tmp_path / entry[0]) as tar:
+            assert tar.extractfile(f"clip_frame_{frame_idx}.jpg").read() == frames[frame_idx]
+
+
+def test_zip_index_offsets_point_at_member_data(tmp_path):
+    frames = random_frames(12)
+    sink = ZipSink(str(tmp_path), "clip", ".jpg", part=30)
+    for frame_idx, data in frames.items():
+        sink.write(frame_idx, data)
+    entries = sink.close()
+    with zipfile.ZipFile(tmp_path / "clip_frames_00000030.zip") as zf:
+        assert zf.testzip() is None
+        for frame_idx, entry in entries.items():
+            assert read_frame_bytes(str(tmp_path), entry) == frames[frame_idx]
+            assert zf.read(f"clip_frame_{frame_idx}.jpg") == frames[frame_idx]
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from FrameExtractor.core.frame_variants import parse_variants
+
+
+def test_parse_variants_round_trip():
+    variants = parse_variants("full; face=100,50,300,250@128x128;thumb@0x90 ;half@0.5")
+    assert [v.spec() for v in variants] == ["full", "face=100,50,300,250@128x128", "thumb@0x90", "half@0.5"]
+
+
+@pytest.mark.parametrize("spec", ["a;a@0.5", "bad name", "x=1,2,3@64x64", "z@0x0", "h@0"])
+def test_parse_variants_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_variants(spec)
+
+
+def test_variant_output_sizes():
+    frame = np.zeros((120, 160, 3), np.uint8)
+    face, thumb, half = parse_variants(["face=10,20,110,70@50x0", "thumb@0x90", "half@0.5"])
+    assert face.apply(frame).shape == (25, 50, 3)
+    assert thumb.apply(frame).shape == (90, 120, 3)
+    assert half.output_size(160, 120) == (80, 60)
+    with pytest.raises(ValueError, match="outside"):
+        parse_variants("big=0,0,200,100")[0].validate(160, 120)
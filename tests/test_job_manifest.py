@@ -0,0 +1,78 @@
+from FrameExtractor.core.extract_job import run_extraction
+from FrameExtractor.core.job_manifest import JobManifest, manifest_path
+
+
+def make_manifest(tmp_path, step=3):
+    return JobManifest(str(tmp_path / "clip_job.json"), dict(step=step))
+
+
+def test_remaining_ranges_stay_on_the_step_grid(tmp_path):
+    manifest = make_manifest(tmp_path)
+    manifest.add(0, 9)
+    manifest.add(15)
+    manifest.add(21, 24)
+    assert manifest.remaining(0, 31) == [(12, 12), (18, 18), (27, 30)]
+    assert manifest.done_count() == 7
+
+
+def test_adjacent_ranges_merge(tmp_path):
+    manifest = make_manifest(tmp_path)
+    manifest.add(6, 9)
+    manifest.add(0, 3)
+    manifest.add(12)
+    assert manifest.completed == [[0, 12]]
+    assert manifest.remaining(0, 12) == []
+
+
+def test_pending_frames_of_a_list(tmp_path):
+    manifest = make_manifest(tmp_path, step=1)
+    manifest.add(10, 20)
+    manifest.add(40)
+    assert manifest.pending([5, 10, 15, 21, 40, 41]) == [5, 21, 41]
+
+
+def test_verify_drops_missing_outputs_but_keeps_skipped_frames(tmp_path):
+    manifest = make_manifest(tmp_path, step=1)
+    manifest.add(0, 5)
+    manifest.skip(2)
+    present = {0, 1, 4, 5}
+    assert manifest.verify(lambda i: i in present) == 5
+    assert manifest.completed == [[0, 2], [4, 5]]
+
+
+def test_checkpoint_round_trip(clip, tmp_path):
+    params = JobManifest.job_params(clip, 0, 30, 3)
+    manifest = JobManifest.load_or_create(str(tmp_path), clip, params)
+    manifest.add(0, 9)
+    manifest.skip(12)
+    manifest.checkpoint(force=True)
+    loaded = JobManifest.load_or_create(str(tmp_path), clip, params)
+    assert loaded.completed == [[0, 12]]
+    assert loaded.skipped == [[12, 12]]
+    # Other parameters: not resumed
+    changed = JobManifest.load_or_create(str(tmp_path), clip, JobManifest.job_params(clip, 0, 30, 2))
+    assert changed.completed == []
+
+
+def test_interrupted_job_resumes_remaining_frames(clip, tmp_path):
+    out = tmp_path / "out"
+    calls = []
+
+    def stop_after_some():
+        calls.append(1)
+        return len(calls) > 10
+
+    first = run_extraction(clip, str(out), 0, 59, 2, should_stop=stop_after_some)
+    assert 0 < first < 30
+    strategies = []
+    assert run_extraction(clip, str(out), 0, 59, 2, strategy_cb=strategies.append) == 30
+    assert sorted(int(p.stem.rsplit("_", 1)[1]) for p in out.glob("clip_frame_*.jpg")) == list(range(0, 60, 2))
+    # A deleted output is extracted again, nothing else
+    (out / "clip_frame_20.jpg").unlink()
+    mtime = (out / "clip_frame_22.jpg").stat().st_mtime_ns
+    assert run_extraction(clip, str(out), 0, 59, 2) == 30
+    assert (out / "clip_frame_20.jpg").exists()
+    assert (out / "clip_frame_22.jpg").stat().st_mtime_ns == mtime
+    assert run_extraction(clip, str(out), 0, 59, 2, strategy_cb=strategies.append) == 30
+    assert strategies[-1] == "already complete"
+    assert manifest_path(str(out), clip) == str(out / "clip_job.json")
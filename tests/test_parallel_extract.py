@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+import pytest
+from FrameExtractor.core.extract_job import run_extraction
+from FrameExtractor.core.frame_filter import filter_from_spec
+from FrameExtractor.core.job_queue import ExtractJob, JobScheduler, DONE, FAILED
+from FrameExtractor.core.parallel_extract import split_segments
+
+
+def run_job(job, decode_workers):
+    scheduler = JobScheduler(decode_workers=decode_workers, encode_workers=decode_workers)
+    scheduler.submit(job)
+    scheduler.shutdown(cancel=False)
+    return job
+
+
+def test_failing_segments_fail_the_job(clip, tmp_path):
+    # Every segment process fails to open the video
+    job = run_job(ExtractJob(clip, str(tmp_path / "out"), 0, 17, workers=3, backend="bogus"), 3)
+    assert job.state == FAILED
+    assert "segments failed" in job.error
+
+
+def test_parallel_job_completes(clip, tmp_path):
+    out = tmp_path / "out"
+    job = run_job(ExtractJob(clip, str(out), 0, 59, frame_step=2, workers=3), 3)
+    assert job.state == DONE
+    assert len(list(out.glob("clip_frame_*.jpg"))) == 30
+
+
+def extracted(out_dir, sink):
+    from FrameExtractor.core.frame_sinks import load_index
+    if sink is None:
+        return sorted(int(p.stem.rsplit("_", 1)[1]) for p in out_dir.glob("*_frame_*.jpg"))
+    return sorted(int(i) for i in load_index(str(out_dir), "ramp")["frames"])
+
+
+@pytest.mark.parametrize("sink", [None, "tar"])
+@pytest.mark.parametrize("method", ["pixel:0.02", "pixel:0.05"])
+def test_parallel_dedup_matches_sequential(ramp_clip, tmp_path, sink, method):
+    results = {}
+    for workers in (1, 4):
+        out = tmp_path / f"out{workers}"
+        frame_filter = filter_from_spec(method)
+        done = run_extraction(ramp_clip, str(out), 0, 79, 1, workers=workers, sink=sink, frame_filter=frame_filter)
+        assert done == 80
+        results[workers] = (extracted(out, sink), frame_filter.skipped)
+    kept, skipped = results[1]
+    assert 1 < len(kept) < 80
+    assert skipped == 80 - len(kept)
+    assert results[4] == results[1]
+
+
+@pytest.mark.parametrize("sink", ["tar", "zip", "hdf5", "lmdb"])
+def test_parallel_parts_merge_into_one_container(clip, tmp_path, sink):
+    from FrameExtractor.core.frame_sinks import SINKS, SINK_MODULES, load_index
+    if sink in SINK_MODULES:
+        pytest.importorskip(SINK_MODULES[sink])
+    outputs = {}
+    for workers in (1, 3):
+        out = tmp_path / f"out{workers}"
+        assert run_extraction(clip, str(out), 0, 59, 2, workers=workers, sink=sink) == 30
+        frames = load_index(str(out), "clip")["frames"]
+        names = {entry[0] for entry in frames.values()}
+        assert len(names) == 1
+        assert sorted(p.name for p in out.iterdir()) == sorted(names | {"clip_frames.index.json", "clip_job.json"})
+        read, close = SINKS[sink].reader(str(out), names.pop())
+        outputs[workers] = {frame_idx: read(entry) for frame_idx, entry in frames.items()}
+        close()
+    assert sorted(outputs[1]) == list(range(0, 60, 2))
+    assert outputs[3] == outputs[1]
+
+
+@pytest.mark.parametrize("start, end, step, n", [(0, 99, 1, 4), (5, 97, 3, 8), (0, 10, 4, 16), (0, 0, 1, 3)])
+@pytest.mark.parametrize("keyframes", [None, [0, 12, 24, 36, 48, 60, 72, 84, 96]])
+def test_split_segments_cover_the_range_once(start, end, step, n, keyframes):
+    index = SimpleNamespace(keyframes=keyframes) if keyframes else None
+    segments = split_segments(start, end, step, n, index)
+    assert segments[0][0] == start and segments[-1][1] == end
+    assert all(a[1] + 1 == b[0] for a, b in zip(segments, segments[1:]))
+    assert all((first - start) % step == 0 for first, _ in segments)
+    if keyframes:
+        # Cut on the first kept frame at or after a keyframe
+        assert all(any(k <= first < k + step for k in keyframes) for first, _ in segments[1:])
+    kept = [f for first, last in segments for f in range(first, last + 1, step)]
+    assert kept == list(range(start, end + 1, step))
+    assert len(segments) <= n
+
+
+def test_parallel_output_matches_sequential(clip, tmp_path):
+    outputs = {}
+    for workers in (1, 3):
+        out = tmp_path / f"out{workers}"
+        assert run_extraction(clip, str(out), 3, 58, 3, roi=(10, 20, 110, 100), workers=workers) == 19
+        outputs[workers] = {p.name: p.read_bytes() for p in out.glob("clip_frame_*.jpg")}
+    assert sorted(outputs[1]) == sorted(f"clip_frame_{i}.jpg" for i in range(3, 59, 3))
+    assert outputs[3] == outputs[1]
@@ -0,0 +1,48 @@
+import threading
+import time
+from FrameExtractor.core.prefetch_buffer import PrefetchBuffer
+
+
+def test_put_blocks_until_the_frame_fits():
+    buffer = PrefetchBuffer(max_bytes=200)
+    assert buffer.put(0, 100) and buffer.put(1, 100)
+    done = threading.Event()
+
+    def produce():
+        buffer.put(2, 100)
+        done.set()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    assert not done.wait(0.2)
+    assert buffer.get_nowait() == 0
+    assert done.wait(2.0)
+    thread.join()
+    assert [buffer.get_nowait() for _ in range(2)] == [1, 2]
+    assert buffer.stats()["peak_bytes"] == 200
+
+
+def test_close_releases_a_blocked_producer():
+    buffer = PrefetchBuffer(max_bytes=100)
+    buffer.put(0, 100)
+    result = []
+    thread = threading.Thread(target=lambda: result.append(buffer.put(1, 100)))
+    thread.start()
+    time.sleep(0.1)
+    buffer.close()
+    thread.join(2.0)
+    assert result == [False]
+
+
+def test_underruns_deepen_the_target():
+    buffer = PrefetchBuffer(display_fps=10.0, min_seconds=0.5, max_seconds=2.0)
+    # Decoding far ahead of display: shallow buffer
+    buffer.decode_fps = 100.0
+    buffer._adapt()
+    assert buffer.target_depth == 5
+    buffer.put(0, 1)
+    buffer.get_nowait()
+    for _ in range(10):
+        assert buffer.get_nowait() is None
+    assert buffer.underruns == 10
+    assert buffer.target_depth == 20
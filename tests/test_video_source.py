@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from FrameExtractor.core.video_source import VideoSource, available_backends, open_source
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoSeek(VideoSource):
+        def isOpened(self):
+            return True
+
+        def grab(self):
+            return False
+
+        def retrieve(self, buf=None):
+            return False, None
+
+        @property
+        def position(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        NoSeek("clip.avi")
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_seek_matches_sequential_read(clip, backend):
+    cap = open_source(clip, backend)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    assert len(frames) == 60
+    for frame_idx in (45, 7, 7, 30, 59):
+        cap.seek(frame_idx)
+        ret, frame = cap.read()
+        assert ret and np.array_equal(frame, frames[frame_idx])
+    cap.release()
+
+
+def test_pyav_seek_without_frame_rate(clip):
+    if "pyav" not in available_backends():
+        pytest.skip("PyAV is not installed")
+    ref = open_source(clip, "pyav")
+    cap = open_source(clip, "pyav")
+    cap.fps = 0.0
+    for frame_idx in (20, 40, 5):
+        ref.seek(frame_idx)
+        cap.seek(frame_idx)
+        assert np.array_equal(cap.read()[1], ref.read()[1])
+        assert cap.position == frame_idx + 1
+    ref.release()
+    cap.release()
@@ -1,4 +1,32 @@
-from.video_load_dialog import VideoLoadDialog
-from .frame_reader import FrameReaderThread
-from .batch_extract_dialog import BatchExtractDialog
-from .batch_extract_worker import BatchExtractWorker
\ No newline at end of file
+"""Dialogs and worker threads of the GUI, loaded on first use of their names"""
+
+import importlib
+
+# Exported name -> submodule, imported on first access
+_EXPORTS = {
+    "VideoLoadDialog": "video_load_dialog",
+    "FrameReaderThread": "frame_reader",
+    "ReverseReaderThread": "frame_reader",
+    "BatchExtractDialog": "batch_extract_dialog",
+    "VideoIndexThread": "video_index_thread",
+    "BatchJobQueue": "batch_job_queue",
+    "FramePrefetchThread": "frame_prefetcher",
+    "FrameSeekThread": "frame_seeker",
+    "ThumbnailIndexThread": "thumbnail_thread",
+    "StageStatsDialog": "stage_stats_dialog",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,10 +1,10 @@
-import re
+import os, re
 from loguru import logger
 from FrameExtractor.utils import newIcon
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QCheckBox,
     QGroupBox, QPushButton, QProgressBar, QMessageBox, QGridLayout,
-    QSpacerItem, QSizePolicy, QWidget
+    QSpacerItem, QSizePolicy, QWidget, QComboBox, QFileDialog
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
@@ -13,7 +13,8 @@ class BatchExtractDialog(QDialog):
     
     def __init__(self, parent, max_time, current_time, img_width, img_height, fps):
         super().__init__(parent)
-        self.worker = None
+        self.job = None
+        self.strategy = ""
         self.setWindowTitle("Batch Extract")
         self.setWindowIcon(newIcon("batch"))
         self.resize(250, 350)
@@ -51,6 +52,97 @@ class BatchExtractDialog(QDialog):
         self.step_edit.setFixedWidth(80)
         grid.addWidget(self.step_edit, 2, 1) # Row 3, Column 2
         
+        # Worker processes
+        grid.addWidget(QLabel("Workers: "), 3, 0) # Row 4, Column 1
+        self.workers_edit = QLineEdit("1")
+        self.workers_edit.setFixedWidth(80)
+        self.workers_edit.setToolTip(f"Parallel extraction processes (CPU cores: {os.cpu_count()})")
+        grid.addWidget(self.workers_edit, 3, 1) # Row 4, Column 2
+        
+        # Decoder backend
+        from FrameExtractor.core import available_backends
+        grid.addWidget(QLabel("Decoder: "), 4, 0) # Row 5, Column 1
+        self.backend_cb = QComboBox()
+        self.backend_cb.addItems(available_backends())
+        self.backend_cb.setFixedWidth(80)
+        grid.addWidget(self.backend_cb, 4, 1) # Row 5, Column 2
+        
+        # Decoder threads
+        grid.addWidget(QLabel("Decode threads: "), 5, 0) # Row 6, Column 1
+        self.threads_edit = QLineEdit("0")
+        self.threads_edit.setFixedWidth(80)
+        self.threads_edit.setToolTip("Decoder threads per worker (0: decoder default)")
+        grid.addWidget(self.threads_edit, 5, 1) # Row 6, Column 2
+        
+        # Output image format
+        from FrameExtractor.core.encoders import ENCODERS, JPEG_SUBSAMPLING
+        grid.addWidget(QLabel("Format: "), 6, 0) # Row 7, Column 1
+        self.format_cb = QComboBox()
+        self.format_cb.addItems(ENCODERS)
+        self.format_cb.setFixedWidth(80)
+        grid.addWidget(self.format_cb, 6, 1) # Row 7, Column 2
+        
+        # Quality (JPEG/WebP) or compression level (PNG)
+        self.quality_label = QLabel("Quality: ")
+        grid.addWidget(self.quality_label, 7, 0) # Row 8, Column 1
+        self.quality_edit = QLineEdit()
+        self.quality_edit.setFixedWidth(80)
+        grid.addWidget(self.quality_edit, 7, 1) # Row 8, Column 2
+        
+        # JPEG chroma subsampling
+        grid.addWidget(QLabel("Subsampling: "), 8, 0) # Row 9, Column 1
+        self.subsampling_cb = QComboBox()
+        self.subsampling_cb.addItems(sorted(JPEG_SUBSAMPLING, reverse=True))
+        self.subsampling_cb.setCurrentText("420")
+        self.subsampling_cb.setFixedWidth(80)
+        grid.addWidget(self.subsampling_cb, 8, 1) # Row 9, Column 2
+        self.format_cb.currentTextChanged.connect(self.on_format_changed)
+        self.on_format_changed(self.format_cb.currentText())
+        
+        # Output container
+        from FrameExtractor.core import available_sinks
+        grid.addWidget(QLabel("Output: "), 9, 0) # Row 10, Column 1
+        self.sink_cb = QComboBox()
+        self.sink_cb.addItems(available_sinks())
+        self.sink_cb.setFixedWidth(80)
+        self.sink_cb.setToolTip("files: one file per frame, memmap: raw (N, H, W, C) array, others: packed archive with a frame index")
+        grid.addWidget(self.sink_cb, 9, 1) # Row 10, Column 2
+        self.sink_cb.currentTextChanged.connect(self.on_sink_changed)
+        
+        # Near-duplicate frame suppression
+        from FrameExtractor.core.frame_filter import DEFAULT_THRESHOLDS
+        self.dedup_thresholds = DEFAULT_THRESHOLDS
+        grid.addWidget(QLabel("Skip duplicates: "), 10, 0) # Row 11, Column 1
+        self.dedup_cb = QComboBox()
+        self.dedup_cb.addItems(["off", *DEFAULT_THRESHOLDS])
+        self.dedup_cb.setFixedWidth(80)
+        self.dedup_cb.setToolTip("Skip frames nearly identical to the last saved one (dhash: perceptual hash, pixel: mean difference, hist: histogram distance)")
+        grid.addWidget(self.dedup_cb, 10, 1) # Row 11, Column 2
+        grid.addWidget(QLabel("Threshold: "), 11, 0) # Row 12, Column 1
+        self.dedup_edit = QLineEdit()
+        self.dedup_edit.setFixedWidth(80)
+        grid.addWidget(self.dedup_edit, 11, 1) # Row 12, Column 2
+        self.dedup_cb.currentTextChanged.connect(self.on_dedup_changed)
+        self.on_dedup_changed(self.dedup_cb.currentText())
+        
+        # Frame list (replaces start/end/step when given)
+        grid.addWidget(QLabel("Frame list: "), 12, 0) # Row 13, Column 1
+        self.frames_edit = QLineEdit()
+        self.frames_edit.setFixedWidth(80)
+        self.frames_edit.setToolTip("Frame numbers or HH:MM:SS.ff timestamps (comma-separated), or a CSV file (first column)")
+        grid.addWidget(self.frames_edit, 12, 1) # Row 13, Column 2
+        self.frames_btn = QPushButton("...")
+        self.frames_btn.setFixedWidth(30)
+        self.frames_btn.clicked.connect(self.on_frames_browse)
+        grid.addWidget(self.frames_btn, 12, 2) # Row 13, Column 3
+        
+        # Output variants (named crops/resizes written from each decoded frame)
+        grid.addWidget(QLabel("Variants: "), 13, 0) # Row 14, Column 1
+        self.variants_edit = QLineEdit()
+        self.variants_edit.setFixedWidth(80)
+        self.variants_edit.setToolTip("';' separated name[=x1,y1,x2,y2][@WxH|@scale], one subfolder each, e.g. full; face=100,50,300,250; thumb@320x0")
+        grid.addWidget(self.variants_edit, 13, 1) # Row 14, Column 2
+        
         # Dummy widget for 3rd column
         spacer0 = QWidget()
         spacer0.setFixedWidth(80)
@@ -93,6 +185,12 @@ class BatchExtractDialog(QDialog):
         # Checkbox connection to enable/disable ROI group
         self.crop_roi_chkbx.toggled.connect(self.roi_group.setEnabled)
         
+        # Resume an interrupted run of the same job
+        self.resume_chkbx = QCheckBox("Resume previous run")
+        self.resume_chkbx.setChecked(True)
+        self.resume_chkbx.setToolTip("Skip frames already extracted by an earlier run with the same settings")
+        layout.addWidget(self.resume_chkbx)
+        
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 100)
@@ -120,19 +218,46 @@ class BatchExtractDialog(QDialog):
         self.extract_btn.clicked.connect(self.on_extract_clicked)
         cancel_btn.clicked.connect(self.on_cancel_clicked)
         
-    def set_worker(self, worker):
-        self.worker = worker
+    def set_job(self, job):
+        self.job = job
+        self.p_status.setText("Queued...")
         
     def on_cancel_clicked(self):
-        if self.worker and self.worker.isRunning():
-            self.worker.stop()
-            self.worker.wait()
+        if self.job and self.job.is_active():
+            # Closed on the job's "cancelled" state, the GUI thread does not wait for it
+            self.p_status.setText("Cancelling...")
+            self.job.cancel()
+            return
         self.reject()
         
+    def on_job_progress(self, job, current_frame, total_frames):
+        if job is self.job:
+            self.update_progress(current_frame, total_frames)
+            
+    def on_job_strategy(self, job, strategy):
+        if job is self.job:
+            self.set_strategy(strategy)
+            
+    def on_job_state(self, job, state):
+        if job is not self.job:
+            return
+        if state == "done":
+            self.on_finished(job.frame_filter.skipped if job.frame_filter else 0)
+        elif state == "failed":
+            self.extract_btn.setEnabled(True)
+            QMessageBox.warning(self, "Batch Extract", f"Extraction failed:\n{job.error}")
+        elif state == "cancelled":
+            logger.info(f"Batch extraction cancelled after {job.done}/{job.total} frames")
+            self.reject()
+        
     def update_progress(self, current_frame, total_frames):
         percent = int(100 * current_frame / total_frames) if total_frames > 0 else 0
         self.progress_bar.setValue(percent)
-        self.p_status.setText(f"Extracting... [{current_frame}/{total_frames} frames]")
+        self.p_status.setText(f"Extracting ({self.strategy})... [{current_frame}/{total_frames} frames]")
+        
+    def set_strategy(self, strategy):
+        self.strategy = strategy
+        logger.debug(f"Batch Extraction strategy: '{strategy}'")
         
     def on_extract_clicked(self):
         try:
@@ -145,11 +270,37 @@ class BatchExtractDialog(QDialog):
             logger.error(f"{e}")
             QMessageBox.warning(self, "Error", f"{e}")
             
-    def on_finished(self):
+    def on_finished(self, skipped=0):
         self.extract_btn.setEnabled(True)
-        QMessageBox.information(self, "Batch Extract", "Extraction complete!")
+        message = "Extraction complete!"
+        if skipped:
+            message += f"\n{skipped} near-duplicate frames skipped"
+        QMessageBox.information(self, "Batch Extract", message)
         logger.debug("Batch Extraction completed")
         
+    def on_format_changed(self, fmt):
+        defaults = {"jpeg": ("Quality: ", "95", "0-100"), "webp": ("Quality: ", "90", "1-100 (101: lossless)"), "png": ("Level: ", "3", "Compression level 0-9")}
+        label, value, tip = defaults.get(fmt, ("Quality: ", "", ""))
+        self.quality_label.setText(label)
+        self.quality_edit.setText(value)
+        self.quality_edit.setToolTip(tip)
+        self.quality_edit.setEnabled(fmt in defaults)
+        self.subsampling_cb.setEnabled(fmt == "jpeg")
+    
+    def on_frames_browse(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select Frame List", "", "Frame lists (*.csv *.txt);;All files (*)")
+        if path:
+            self.frames_edit.setText(path)
+    
+    def on_dedup_changed(self, method):
+        self.dedup_edit.setText(str(self.dedup_thresholds.get(method, "")))
+        self.dedup_edit.setEnabled(method in self.dedup_thresholds)
+    
+    def on_sink_changed(self, sink):
+        # Raw frame arrays are not encoded
+        self.format_cb.setEnabled(sink != "memmap")
+        self.on_format_changed(self.format_cb.currentText() if sink != "memmap" else None)
+    
     def get_params(self):
         """Return dictionary of user-entered parameters with validation"""
         error_conditions = {}
@@ -188,6 +339,66 @@ class BatchExtractDialog(QDialog):
             if not condition:
                 frame_step = 1
             
+            # Workers validation
+            workers = self.workers_edit.text().strip()
+            error_conditions["'Workers' must be an integer"] = not self.is_int(workers)
+            workers = int(workers) if self.is_int(workers) else 1
+            condition = workers >= 1
+            error_conditions["'Workers' must be >= 1"] = not condition
+            if not condition:
+                workers = 1
+            
+            # Decode threads validation
+            threads = self.threads_edit.text().strip()
+            error_conditions["'Decode threads' must be an integer"] = not self.is_int(threads)
+            threads = int(threads) if self.is_int(threads) else 0
+            condition = threads >= 0
+            error_conditions["'Decode threads' must be >= 0"] = not condition
+            if not condition:
+                threads = 0
+            
+            # Output format validation
+            from FrameExtractor.core import make_encoder
+            fmt = self.format_cb.currentText()
+            enc_params = {}
+            if self.quality_edit.isEnabled():
+                quality = self.quality_edit.text().strip()
+                error_conditions[f"'{self.quality_label.text().strip(': ')}' must be an integer"] = not self.is_int(quality)
+                if self.is_int(quality):
+                    enc_params["level" if fmt == "png" else "quality"] = int(quality)
+            if fmt == "jpeg":
+                enc_params["subsampling"] = self.subsampling_cb.currentText()
+            encoder = None
+            try:
+                encoder = make_encoder(fmt, **enc_params)
+            except ValueError as e:
+                error_conditions[str(e)] = True
+            
+            # Duplicate filter validation
+            from FrameExtractor.core.frame_filter import DuplicateFilter
+            frame_filter = None
+            if self.dedup_cb.currentText() != "off":
+                threshold = self.dedup_edit.text().strip()
+                error_conditions["'Threshold' must be a number"] = not self.is_int_float(threshold)
+                error_conditions["'Skip duplicates' cannot be used with memmap output"] = self.sink_cb.currentText() == "memmap"
+                if self.is_int_float(threshold):
+                    try:
+                        frame_filter = DuplicateFilter(self.dedup_cb.currentText(), float(threshold))
+                    except ValueError as e:
+                        error_conditions[str(e)] = True
+            
+            # Frame list validation
+            from FrameExtractor.core.frame_list import read_frame_list, resolve_frames
+            frame_items = None
+            frames_text = self.frames_edit.text().strip()
+            if frames_text:
+                try:
+                    frame_items = read_frame_list(frames_text)
+                    error_conditions["'Frame list' has no frames"] = not resolve_frames(frame_items, self.fps)
+                except (OSError, ValueError) as e:
+                    error_conditions[f"'Frame list' is invalid: {e}"] = True
+                error_conditions["'Frame list' is extracted in a single pass, 'Workers' must be 1"] = workers > 1
+            
             # ROI coords validation
             roi = None
             if self.crop_roi_chkbx.isChecked():
@@ -216,6 +427,19 @@ class BatchExtractDialog(QDialog):
                         "x2 must be less than or equal to image width": not roi[2] <= self.img_width,
                         "y2 must be less than or equal to image height": not roi[3] <= self.img_height
                     })
+            
+            # Output variants validation
+            from FrameExtractor.core.frame_variants import parse_variants
+            variants = None
+            variants_text = self.variants_edit.text().strip()
+            if variants_text:
+                try:
+                    variants = parse_variants(variants_text)
+                    for variant in variants:
+                        variant.validate(self.img_width, self.img_height)
+                except ValueError as e:
+                    error_conditions[f"'Variants' is invalid: {e}"] = True
+                error_conditions["'Crop ROI' cannot be used with variants, give the variants ROIs instead"] = self.crop_roi_chkbx.isChecked()
                     
             # Log validation checks if errors found        
             errors = [msg for msg, con in error_conditions.items() if con]
@@ -230,7 +454,16 @@ class BatchExtractDialog(QDialog):
                 start_time=start_time,
                 end_time=end_time,
                 frame_step=frame_step,
-                roi=roi
+                roi=roi,
+                workers=workers,
+                backend=self.backend_cb.currentText(),
+                threads=threads,
+                encoder=encoder,
+                sink=self.sink_cb.currentText(),
+                resume=self.resume_chkbx.isChecked(),
+                frame_filter=frame_filter,
+                frame_items=frame_items,
+                variants=variants
             )
         except ValueError as e:
             QMessageBox.warning(self, "Invalid input", f"Invalid input:\n{e}")
@@ -0,0 +1,41 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+class BatchJobQueue(QObject):
+    # Signals are emitted from scheduler threads, delivered queued to the GUI thread
+    job_progress = pyqtSignal(object, int, int) # (job, done_frames, total_frames)
+    job_state = pyqtSignal(object, str) # (job, state)
+    job_strategy = pyqtSignal(object, str) # (job, strategy)
+    total_progress = pyqtSignal(int, int) # aggregate (done_frames, total_frames)
+
+    def __init__(self, decode_workers=None, encode_workers=None, parent=None, cap_pool=None):
+        super().__init__(parent)
+        from FrameExtractor.core import JobScheduler
+        self.scheduler = JobScheduler(
+            decode_workers, encode_workers,
+            on_progress=self._on_progress,
+            on_state=self._on_state,
+            on_strategy=lambda job: self.job_strategy.emit(job, job.strategy),
+            cap_pool=cap_pool
+        )
+
+    def submit(self, job):
+        self.scheduler.submit(job)
+        self.total_progress.emit(*self.scheduler.progress())
+        return job
+
+    def active_jobs(self):
+        return [job for job in self.scheduler.jobs if job.is_active()]
+
+    def cancel_all(self):
+        self.scheduler.cancel_all()
+
+    def shutdown(self):
+        self.scheduler.shutdown(cancel=True)
+
+    def _on_progress(self, job):
+        self.job_progress.emit(job, job.done, job.total)
+        self.total_progress.emit(*self.scheduler.progress())
+
+    def _on_state(self, job):
+        self.job_state.emit(job, job.state)
+        self.total_progress.emit(*self.scheduler.progress())
@@ -0,0 +1,60 @@
+from threading import Condition
+from PyQt6.QtCore import QThread
+from FrameExtractor.core import seek, CapturePool
+
+class FramePrefetchThread(QThread):
+    # Decodes frames around the paused position into the shared FrameCache
+    def __init__(self, video_path, cache, index=None, radius=8, backend=None, threads=0, cap_pool=None):
+        super().__init__()
+        self.video_path = video_path
+        self.cache = cache
+        self.index = index
+        self.radius = radius
+        self.backend = backend
+        self.threads = threads
+        self.cap_pool = cap_pool or CapturePool(max_idle=0)
+        self.running = False
+        self.request = None
+        self.cond = Condition()
+
+    def prefetch(self, center, step=1, frame_count=None):
+        # Latest request wins, pending ones are dropped
+        with self.cond:
+            self.request = (center, max(1, step), frame_count)
+            self.cond.notify()
+
+    def cancel(self):
+        with self.cond:
+            self.request = None
+
+    def run(self):
+        self.running = True
+        cap = self.cap_pool.acquire(self.video_path, self.backend, self.threads)
+        while self.running:
+            with self.cond:
+                while self.running and self.request is None:
+                    self.cond.wait()
+                request, self.request = self.request, None
+            if request is None:
+                continue
+            center, step, frame_count = request
+            targets = [center + k * step for k in range(-self.radius, self.radius + 1) if k]
+            last = (frame_count or (1 << 62)) - 1
+            # Ascending order so nearby targets decode forward within a GOP
+            for frame_idx in sorted(t for t in targets if 0 <= t <= last):
+                if not self.running or self.request is not None:
+                    break # stopped or superseded by a newer position
+                if (self.video_path, frame_idx) in self.cache:
+                    continue
+                seek(cap, frame_idx, self.index)
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self.cache.put(self.video_path, frame_idx, frame)
+        self.cap_pool.release(cap)
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.wait()
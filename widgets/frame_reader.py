@@ -1,48 +1,134 @@
-import cv2, queue
 from threading import Event
+from loguru import logger
 from PyQt6.QtGui import QImage
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread
+from FrameExtractor.core import seek, FramePool, PrefetchBuffer, GopRingBuffer, STAGE_STATS
+from FrameExtractor.core.prefetch_buffer import DEFAULT_PREFETCH_BYTES
+
+class PooledImage:
+    # BGR QImage viewing a pooled buffer (no copy); buffer returns to the pool on release()
+    __slots__ = ("pool", "buf", "qimg")
+
+    def __init__(self, pool, buf):
+        t0 = STAGE_STATS.start()
+        h, w, ch = buf.shape
+        self.pool = pool
+        self.buf = buf
+        self.qimg = QImage(buf.data, w, h, buf.strides[0], QImage.Format.Format_BGR888)
+        STAGE_STATS.add("qimage", t0)
+
+    def release(self):
+        if self.buf is not None:
+            self.qimg = None
+            self.pool.release(self.buf)
+            self.buf = None
+
+class FrameImage:
+    # BGR QImage viewing a decoded frame that is kept elsewhere (no copy, nothing to recycle)
+    __slots__ = ("buf", "qimg")
+
+    def __init__(self, buf):
+        t0 = STAGE_STATS.start()
+        h, w, ch = buf.shape
+        self.buf = buf
+        self.qimg = QImage(buf.data, w, h, buf.strides[0], QImage.Format.Format_BGR888)
+        STAGE_STATS.add("qimage", t0)
+
+    def release(self):
+        self.qimg = None
+        self.buf = None
 
 class FrameReaderThread(QThread):
-    frame_ready = pyqtSignal(QImage, int)  # signal emits QImage and frame index
+    direction = 1 # frame index step between buffered frames
 
-    def __init__(self, cap, start_frame=0, max_queue_size=30):
+    def __init__(self, cap, start_frame=0, max_bytes=None, display_fps=30.0, index=None, pool=None, cap_pool=None):
         super().__init__()
         self.cap = cap
+        self.cap_pool = cap_pool # owner of cap (core.capture_pool), it goes back there on stop()
+        self.index = index
+        self.pool = pool if pool is not None else FramePool()
         self.running = False
         self.start_frame = start_frame
         self.current_frame = start_frame
-        self.frame_queue = queue.Queue(maxsize=max_queue_size)
+        # Prefetch sized in bytes with adaptive depth (replaces a fixed 30-frame queue)
+        self.frame_buffer = PrefetchBuffer(max_bytes or DEFAULT_PREFETCH_BYTES, display_fps)
         self.stopped = Event()
         
     def run(self):
         self.running = True
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+        seek(self.cap, self.start_frame, self.index)
         self.current_frame = self.start_frame
+        shape = None
         while self.running and not self.stopped.is_set():
-            if self.frame_queue.full():
-                self.msleep(5) # wait to reduce CPU load when queue full
-                continue
-            ret, frame = self.cap.read()
+            if not self.cap.grab():
+                break
+            # Decode straight into a recycled buffer, BGR is displayed as-is
+            buf = self.pool.acquire(shape) if shape else None
+            ret, frame = self.cap.retrieve(buf)
             if not ret:
+                if buf is not None:
+                    self.pool.release(buf)
+                break
+            if frame is not buf:
+                # First frame (or size change): adopt decoder's buffer into the pool
+                if buf is not None:
+                    self.pool.release(buf)
+                shape = frame.shape
+                self.pool.adopt(frame)
+            # Blocks while the buffer is full (no polling)
+            if not self.frame_buffer.put((PooledImage(self.pool, frame), self.current_frame), frame.nbytes):
+                self.pool.release(frame)
                 break
-            # Convert to RGB and QImage
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            bytes_per_line = ch * w
-            # Create QImage directly from RGB data (avoid copies if possible)
-            qimg = QImage(rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy()
-            self.frame_queue.put((qimg, self.current_frame))
             self.current_frame += 1
         self.running = False
 
     def stop(self):
         self.running = False
         self.stopped.set()
+        self.frame_buffer.close()
         self.wait()
+        if self.cap_pool is not None:
+            self.cap_pool.release(self.cap)
+        # Return undisplayed frames to the pool
+        for pooled, _ in self.frame_buffer.drain():
+            pooled.release()
+        logger.info(f"Playback buffer: {self.frame_buffer.stats()}")
+        logger.debug(f"Frame pool: {self.pool.stats()}")
         
     def get_frame(self):
-        try:
-            return self.frame_queue.get_nowait()
-        except queue.Empty:
-            return None
\ No newline at end of file
+        return self.frame_buffer.get_nowait()
+        
+    def peek_frame(self):
+        return self.frame_buffer.peek()
+        
+    def record_underrun(self):
+        self.frame_buffer.record_underrun()
+        
+    def buffer_stats(self):
+        return self.frame_buffer.stats()
+
+class ReverseReaderThread(FrameReaderThread):
+    # Reverse playback: decodes span by span through the GOP ring buffer, buffers frames newest first
+    direction = -1
+
+    def __init__(self, cap, start_frame=0, max_bytes=None, display_fps=30.0, index=None, gop_buffer=None, cap_pool=None):
+        super().__init__(cap, start_frame, max_bytes, display_fps, index, cap_pool=cap_pool)
+        self.gop_buffer = gop_buffer if gop_buffer is not None else GopRingBuffer()
+
+    def run(self):
+        self.running = True
+        end = self.start_frame
+        while self.running and not self.stopped.is_set() and end >= 0:
+            frame = self.gop_buffer.get(end)
+            if frame is not None:
+                frames = [(end, frame)]
+            else:
+                frames = self.gop_buffer.fill(self.cap, end, self.index)
+                if not frames:
+                    break
+            for frame_idx, frame in reversed(frames):
+                self.current_frame = frame_idx
+                if not self.frame_buffer.put((FrameImage(frame), frame_idx), frame.nbytes):
+                    break
+            end = frames[0][0] - 1
+        self.running = False
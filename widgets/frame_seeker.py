@@ -0,0 +1,74 @@
+from threading import Condition
+from loguru import logger
+from PyQt6.QtCore import QThread, pyqtSignal
+from FrameExtractor.core import seek, CapturePool
+
+class FrameSeekThread(QThread):
+    # Decodes seek targets off the GUI thread; only the latest request is served
+    frame_ready = pyqtSignal(object, int)
+
+    def __init__(self, video_path, cache, index=None, backend=None, threads=0, gop_buffer=None, cap_pool=None):
+        super().__init__()
+        self.video_path = video_path
+        self.cache = cache
+        self.gop_buffer = gop_buffer
+        self.cap_pool = cap_pool or CapturePool(max_idle=0)
+        self.index = index
+        self.backend = backend
+        self.threads = threads
+        self.running = False
+        self.target = None
+        self.requested = 0
+        self.decoded = 0
+        self.cond = Condition()
+
+    def seek(self, frame_idx, backward=False):
+        # Replaces a pending target that has not been picked up yet;
+        # backward targets decode their whole span into the GOP ring buffer
+        with self.cond:
+            self.target = (frame_idx, backward)
+            self.requested += 1
+            self.cond.notify()
+
+    def cancel(self):
+        with self.cond:
+            self.target = None
+
+    def run(self):
+        self.running = True
+        cap = self.cap_pool.acquire(self.video_path, self.backend, self.threads)
+        while self.running:
+            with self.cond:
+                while self.running and self.target is None:
+                    self.cond.wait()
+                target, self.target = self.target, None
+            if target is None:
+                continue
+            frame_idx, backward = target
+            frame = self.cache.get(self.video_path, frame_idx)
+            if frame is None and backward and self.gop_buffer is not None:
+                frame = self.gop_buffer.get(frame_idx)
+                if frame is None:
+                    frames = self.gop_buffer.fill(cap, frame_idx, self.index)
+                    self.decoded += len(frames)
+                    if not frames or frames[-1][0] != frame_idx:
+                        continue
+                    frame = frames[-1][1]
+            if frame is None:
+                seek(cap, frame_idx, self.index)
+                ret, frame = cap.read()
+                if not ret:
+                    continue
+                self.decoded += 1
+                self.cache.put(self.video_path, frame_idx, frame)
+            # Superseded while decoding: the frame stays cached, the newer target goes next
+            if self.target is None and self.running:
+                self.frame_ready.emit(frame, frame_idx)
+        self.cap_pool.release(cap)
+        logger.debug(f"Seek worker: {self.requested} requests, {self.decoded} decoded")
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.wait()
@@ -0,0 +1,88 @@
+from loguru import logger
+from FrameExtractor.utils import newIcon
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QFileDialog
+)
+from PyQt6.QtCore import Qt, QTimer
+
+# Table columns: (header, summary key)
+COLUMNS = (
+    ("Count", "count"), ("Mean ms", "mean_ms"), ("p50 ms", "p50_ms"), ("p95 ms", "p95_ms"),
+    ("Max ms", "max_ms"), ("Per s", "per_s"), ("MB/s", "mb_per_s"),
+)
+
+class StageStatsDialog(QDialog):
+    """Live per-stage timings of decode, convert, crop, encode, write and display"""
+
+    def __init__(self, parent, stats, refresh_ms=500):
+        super().__init__(parent)
+        self.stats = stats
+        self.setWindowTitle("Stage Stats")
+        self.setWindowIcon(newIcon("icon"))
+        self.resize(620, 300)
+
+        layout = QVBoxLayout(self)
+
+        self.enable_chkbx = QCheckBox("Collect stage timings")
+        self.enable_chkbx.setChecked(stats.enabled)
+        self.enable_chkbx.setToolTip("Off: the instrumented paths skip timing entirely")
+        self.enable_chkbx.toggled.connect(self.on_enable_toggled)
+        layout.addWidget(self.enable_chkbx)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for header, _ in COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        # Buttons
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch(1)
+        reset_btn = QPushButton("Reset")
+        save_btn = QPushButton("Save JSON...")
+        close_btn = QPushButton("Close")
+        btn_layout.addWidget(reset_btn)
+        btn_layout.addWidget(save_btn)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+        reset_btn.clicked.connect(self.on_reset_clicked)
+        save_btn.clicked.connect(self.on_save_clicked)
+        close_btn.clicked.connect(self.close)
+
+        # Refresh only while shown
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, ev):
+        self.timer.start()
+        super().showEvent(ev)
+
+    def hideEvent(self, ev):
+        self.timer.stop()
+        super().hideEvent(ev)
+
+    def refresh(self):
+        summary = self.stats.summary()
+        self.table.setRowCount(len(summary))
+        self.table.setVerticalHeaderLabels(list(summary))
+        for row, values in enumerate(summary.values()):
+            for col, (_, key) in enumerate(COLUMNS):
+                item = QTableWidgetItem(f"{values[key]:g}")
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def on_enable_toggled(self, checked):
+        self.stats.enable(checked)
+        logger.info(f"Stage stats {'enabled' if checked else 'disabled'}")
+
+    def on_reset_clicked(self):
+        self.stats.reset()
+        self.refresh()
+
+    def on_save_clicked(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Stage Stats", "stage_stats.json", "JSON (*.json)")
+        if path:
+            self.stats.dump(path)
@@ -0,0 +1,28 @@
+from loguru import logger
+from PyQt6.QtCore import QThread, pyqtSignal
+
+class ThumbnailIndexThread(QThread):
+    thumbnails_ready = pyqtSignal(object) # signal emits ThumbnailIndex
+
+    def __init__(self, video_path, index=None, backend=None):
+        super().__init__()
+        self.video_path = video_path
+        self.index = index
+        self.backend = backend
+        self.running = False
+
+    def run(self):
+        from FrameExtractor.core import ThumbnailIndex
+        self.running = True
+        try:
+            thumbs = ThumbnailIndex.load_or_build(self.video_path, self.index, should_stop=lambda: not self.running, backend=self.backend)
+        except Exception as e:
+            logger.error(f"Failed to build thumbnails: {e}")
+            thumbs = None
+        if thumbs is not None and self.running:
+            self.thumbnails_ready.emit(thumbs)
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        self.wait()
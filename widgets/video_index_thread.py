@@ -0,0 +1,26 @@
+from loguru import logger
+from PyQt6.QtCore import QThread, pyqtSignal
+
+class VideoIndexThread(QThread):
+    index_ready = pyqtSignal(object) # signal emits VideoIndex
+
+    def __init__(self, video_path):
+        super().__init__()
+        self.video_path = video_path
+        self.running = False
+
+    def run(self):
+        from FrameExtractor.core import VideoIndex
+        self.running = True
+        try:
+            index = VideoIndex.load_or_build(self.video_path, should_stop=lambda: not self.running)
+        except Exception as e:
+            logger.error(f"Failed to index video: {e}")
+            index = None
+        if index is not None and self.running:
+            self.index_ready.emit(index)
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        self.wait()